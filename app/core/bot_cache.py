@@ -1,25 +1,61 @@
-from cachetools import TTLCache
+from dataclasses import dataclass
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import Cache, bot_tag, cache_registry, organization_tag
+from app.core.crypto import crypto
+from app.core.enums import CryptoInfo
+from app.core.settings import settings
 from app.db.models.telegram_bot import TelegramBot
+from app.db.snapshots import TelegramBotSnapshot
 
-telegram_bot_cache: TTLCache[int, TelegramBot] = TTLCache(maxsize=100, ttl=300)
 
+@dataclass(frozen=True, slots=True)
+class BotCredentials:
+    id: int
+    organization_id: int
+    token: str
+    secret: str
 
-async def get_telegram_bot(bot_id: int, db: AsyncSession) -> TelegramBot | None:
-    bot = telegram_bot_cache.get(bot_id)
-    if bot is not None:
-        return bot
+    @classmethod
+    def from_model(cls, bot: TelegramBot | TelegramBotSnapshot) -> "BotCredentials":
+        token_stripped = crypto.decrypt_data(bot.token, CryptoInfo.BOT_TOKEN)
+
+        return cls(
+            id=bot.id,
+            organization_id=bot.organization_id,
+            token=f"{bot.id}:{token_stripped}",
+            secret=crypto.decrypt_data(bot.secret, CryptoInfo.WEBHOOK_SECRET),
+        )
+
+
+telegram_bot_cache: Cache[int, BotCredentials] = cache_registry.create(
+    "telegram_bots",
+    settings.TELEGRAM_BOT_CACHE_SIZE,
+    settings.TELEGRAM_BOT_CACHE_TTL,
+)
 
-    q = await db.execute(select(TelegramBot).where(TelegramBot.id == bot_id))
-    bot = q.scalar_one_or_none()
 
-    if bot:
-        telegram_bot_cache[bot_id] = bot
+def cache_bot_credentials(bot: TelegramBot | TelegramBotSnapshot) -> BotCredentials:
+    credentials = BotCredentials.from_model(bot)
+    telegram_bot_cache.set(
+        bot.id,
+        credentials,
+        tags=(bot_tag(bot.id), organization_tag(bot.organization_id)),
+    )
 
-    return bot
+    return credentials
+
+
+async def get_bot_credentials(bot_id: int, db: AsyncSession) -> BotCredentials | None:
+    credentials = telegram_bot_cache.get(bot_id)
+    if credentials is not None:
+        return credentials
+
+    q = await db.execute(select(TelegramBot).where(TelegramBot.id == bot_id))
+    bot = q.scalar_one_or_none()
 
+    if bot is None:
+        return None
 
-def remove_telegram_bot(bot_id: int) -> None:
-    telegram_bot_cache.pop(bot_id)
+    return cache_bot_credentials(bot)
@@ -0,0 +1,160 @@
+from typing import Any, Generic, Hashable, Iterable, TypeVar
+from cachetools import TTLCache
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+ROUTING_TAG = "routing"
+CAPTAINS_TAG = "captains"
+REPLY_ROUTES_TAG = "reply_routes"
+
+
+def organization_tag(organization_id: int) -> str:
+    return f"organization:{organization_id}"
+
+
+def bot_tag(bot_id: int) -> str:
+    return f"bot:{bot_id}"
+
+
+def chat_tag(chat_id: int) -> str:
+    return f"chat:{chat_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def bans_tag(organization_id: int) -> str:
+    return f"bans:{organization_id}"
+
+
+class _EvictionCountingCache(TTLCache[K, V]):
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evictions = 0
+
+    def popitem(self) -> tuple[K, V]:
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time: Any = None) -> list[tuple[K, V]]:
+        expired = super().expire(time)
+        self.evictions += len(expired)
+        return expired
+
+
+class Cache(Generic[K, V]):
+    def __init__(self, name: str, maxsize: int, ttl: float) -> None:
+        self.name = name
+        self._data: _EvictionCountingCache[K, V] = _EvictionCountingCache(
+            maxsize=maxsize, ttl=ttl
+        )
+        self._tags: dict[str, set[K]] = {}
+        self._tagged_writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.generation = 0
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return value
+
+    def peek(self, key: K) -> V | None:
+        return self._data.get(key)
+
+    def set(self, key: K, value: V, tags: Iterable[str] = ()) -> None:
+        self._data[key] = value
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+            self._tagged_writes += 1
+
+        if self._tagged_writes > self._data.maxsize:
+            self._prune_tags()
+
+    def _prune_tags(self) -> None:
+        for tag, keys in list(self._tags.items()):
+            keys.intersection_update(self._data.keys())
+            if not keys:
+                del self._tags[tag]
+
+        self._tagged_writes = 0
+
+    def pop(self, key: K) -> V | None:
+        return self._data.pop(key, None)
+
+    def invalidate(self, tag: str) -> int:
+        self.generation += 1
+        keys = self._tags.pop(tag, set())
+        removed = 0
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                removed += 1
+
+        self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._data.clear()
+        self._tags.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "maxsize": int(self._data.maxsize),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self._data.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class CacheRegistry:
+    def __init__(self) -> None:
+        self._caches: dict[str, Cache[Any, Any]] = {}
+
+    def create(self, name: str, maxsize: int, ttl: float) -> Cache[Any, Any]:
+        if name in self._caches:
+            raise ValueError(f"Cache {name} is already registered")
+
+        cache: Cache[Any, Any] = Cache(name, maxsize, ttl)
+        self._caches[name] = cache
+
+        return cache
+
+    def get(self, name: str) -> Cache[Any, Any]:
+        return self._caches[name]
+
+    def invalidate(self, *tags: str) -> int:
+        removed = 0
+        for cache in self._caches.values():
+            for tag in tags:
+                removed += cache.invalidate(tag)
+
+        return removed
+
+    def clear(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {name: cache.stats for name, cache in self._caches.items()}
+
+
+cache_registry = CacheRegistry()
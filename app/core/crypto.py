@@ -11,16 +11,23 @@ class Crypto:
     def __init__(self, token: str, salt: str | None) -> None:
         self._token = token.encode()
         self._salt = salt.encode() if salt else None
+        self._keys: dict[bytes, bytes] = {}
 
     def get_aes_master_key(self, info: bytes) -> bytes:
+        key = self._keys.get(info)
+        if key is not None:
+            return key
+
         hkdf = HKDF(
             algorithm=hashes.SHA256(),
             length=32,
             salt=self._salt,
             info=info,
         )
+        key = hkdf.derive(self._token)
+        self._keys[info] = key
 
-        return hkdf.derive(self._token)
+        return key
 
     def encrypt_data(self, data: str, info: bytes) -> bytes:
         key = self.get_aes_master_key(info)
@@ -37,3 +37,14 @@ class SpamType(str, Enum):
     CAPTAINS = "captains"
     ALL_GROUPS = "all_groups"
     ALL_CAPTAINS = "all_captains"
+
+
+class JobRunStatus(str, Enum):
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class MissedRunPolicy(str, Enum):
+    SKIP = "skip"
+    RUN_ONCE = "run_once"
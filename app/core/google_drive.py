@@ -1,28 +1,90 @@
-from typing import BinaryIO
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
 
+import httplib2  # type: ignore[import-untyped]
 from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp  # type: ignore[import-untyped]
 from googleapiclient.discovery import build  # type: ignore[import-untyped]
 
 from app.core.constants import GOOGLE_AUTH_SCOPES
 from app.core.settings import settings
 
+T = TypeVar("T")
+
 credentials = Credentials.from_service_account_file(  # type: ignore[no-untyped-call]
     settings.SERVICE_ACCOUNT_FILE, scopes=GOOGLE_AUTH_SCOPES
 )
-drive_client = build("drive", "v3", credentials=credentials)
 
 
-def download_file(
-    file_id: str,
-    out: BinaryIO,
-    export_mime_type: str | None = None,
-) -> None:
-    if export_mime_type:
-        request = drive_client.files().export_media(
-            fileId=file_id, mimeType=export_mime_type
+class DriveClient:
+    def __init__(self, workers: int, timeout: float) -> None:
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="google-drive"
         )
-    else:
-        request = drive_client.files().get_media(fileId=file_id)
+        self._local = threading.local()
+        # Queued downloads wait here rather than in the executor, so the
+        # timeout only covers the download itself
+        self._slots = asyncio.Semaphore(workers)
+
+    def _client(self) -> Any:
+        # httplib2 connections are not thread safe, so every worker thread
+        # builds its own client. The socket timeout stops a stalled download
+        # from holding a worker after the caller has given up on it.
+        client = getattr(self._local, "client", None)
+        if client is None:
+            http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=self.timeout))
+            client = build("drive", "v3", http=http, cache_discovery=False)
+            self._local.client = client
+
+        return client
+
+    def _download(self, file_id: str, export_mime_type: str | None) -> bytes:
+        files = self._client().files()
+
+        if export_mime_type:
+            request = files.export_media(fileId=file_id, mimeType=export_mime_type)
+        else:
+            request = files.get_media(fileId=file_id)
+
+        file_content: bytes = request.execute()
+        return file_content
+
+    def _get_metadata(self, file_id: str, fields: str) -> dict[str, Any]:
+        metadata: dict[str, Any] = (
+            self._client().files().get(fileId=file_id, fields=fields).execute()
+        )
+        return metadata
+
+    async def _run(self, description: str, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+
+        async with self._slots:
+            future = loop.run_in_executor(self._executor, func, *args)
+
+            try:
+                return await asyncio.wait_for(future, self.timeout)
+            except TimeoutError:
+                raise TimeoutError(
+                    f"Google Drive {description} timed out after {self.timeout:g}s"
+                ) from None
+
+    async def download(
+        self, file_id: str, export_mime_type: str | None = None
+    ) -> bytes:
+        return await self._run(
+            f"download of {file_id}", self._download, file_id, export_mime_type
+        )
+
+    async def get_metadata(self, file_id: str, fields: str) -> dict[str, Any]:
+        return await self._run(
+            f"metadata request for {file_id}", self._get_metadata, file_id, fields
+        )
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
 
-    file_content: bytes = request.execute()
-    out.write(file_content)
+drive_client = DriveClient(settings.GOOGLE_DRIVE_WORKERS, settings.GOOGLE_DRIVE_TIMEOUT)
@@ -0,0 +1,322 @@
+import asyncio
+import fcntl
+import glob
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator
+from uuid import uuid4
+
+import asyncpg  # type: ignore[import-untyped]
+
+from app.core.cache import cache_registry
+from app.core.logger import logger
+from app.core.settings import settings
+
+
+InvalidationListener = Callable[[list[str]], Awaitable[None]]
+ResetListener = Callable[[], Awaitable[None]]
+
+CHANNEL = "cache_invalidation"
+RECONNECT_MIN_DELAY = 1.0
+FILE_READER_TIMEOUT = 60.0
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class InvalidationBus:
+    def __init__(self) -> None:
+        self._origin = uuid4().hex
+        self._listeners: list[InvalidationListener] = []
+        self._reset_listeners: list[ResetListener] = []
+        self._dsn = ""
+        self._connection: Any = None
+        self._connection_lock = asyncio.Lock()
+        self._connection_lost = asyncio.Event()
+        self._watch_task: asyncio.Task[None] | None = None
+        self._poll_task: asyncio.Task[None] | None = None
+        self._file_inode = 0
+        self._file_offset = 0
+        self._pending: set[asyncio.Task[None]] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._watch_task is not None or self._poll_task is not None
+
+    def add_listener(self, listener: InvalidationListener) -> None:
+        self._listeners.append(listener)
+
+    def add_reset_listener(self, listener: ResetListener) -> None:
+        self._reset_listeners.append(listener)
+
+    async def start(self) -> None:
+        if not settings.CACHE_INVALIDATION_BUS:
+            return
+
+        database_url = settings.DATABASE_URL.get_secret_value()
+
+        if database_url.startswith("postgresql"):
+            self._dsn = database_url.replace(
+                "postgresql+asyncpg://", "postgresql://", 1
+            )
+            await self._connect()
+            self._watch_task = asyncio.create_task(self._watch_connection())
+            logger.info("Cache invalidation bus listening on Postgres")
+            return
+
+        # File work runs in threads since the lock can be held by another process
+        path = settings.CACHE_INVALIDATION_FILE
+        await asyncio.to_thread(self._open_file, path)
+        self._poll_task = asyncio.create_task(self._poll_file(path))
+        logger.info(f"Cache invalidation bus polling {path}")
+
+    async def stop(self) -> None:
+        if self._watch_task:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+
+        if self._poll_task:
+            self._poll_task.cancel()
+            await asyncio.gather(self._poll_task, return_exceptions=True)
+            self._poll_task = None
+
+            await asyncio.to_thread(
+                self._remove_file_offset, settings.CACHE_INVALIDATION_FILE
+            )
+
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await connection.close()
+
+    async def publish(self, *tags: str) -> None:
+        cache_registry.invalidate(*tags)
+
+        if not self.is_running:
+            return
+
+        payload = json.dumps({"origin": self._origin, "tags": list(tags)})
+
+        try:
+            if self._watch_task:
+                connection = self._connection
+                if connection is None:
+                    raise ConnectionError("Postgres connection is down")
+
+                async with self._connection_lock:
+                    await connection.execute(
+                        "SELECT pg_notify($1, $2)", CHANNEL, payload
+                    )
+            else:
+                await asyncio.to_thread(
+                    self._append_file, settings.CACHE_INVALIDATION_FILE, payload
+                )
+        except Exception as e:
+            logger.error(f"Failed to publish cache invalidation {tags}: {e}")
+
+    async def _apply(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+
+        if event.get("origin") == self._origin:
+            return
+
+        tags: list[str] = event.get("tags", [])
+        cache_registry.invalidate(*tags)
+
+        for listener in self._listeners:
+            try:
+                await listener(tags)
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed for {tags}: {e}")
+
+    async def _reset(self) -> None:
+        cache_registry.clear()
+
+        for listener in self._reset_listeners:
+            try:
+                await listener()
+            except Exception as e:
+                logger.error(f"Cache invalidation reset listener failed: {e}")
+
+    def _on_notification(
+        self, connection: Any, pid: int, channel: str, payload: str
+    ) -> None:
+        task = asyncio.create_task(self._apply(payload))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _on_termination(self, connection: Any) -> None:
+        if connection is self._connection:
+            self._connection_lost.set()
+
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(self._dsn)
+
+        try:
+            await connection.add_listener(CHANNEL, self._on_notification)
+        except Exception:
+            connection.terminate()
+            raise
+
+        connection.add_termination_listener(self._on_termination)
+        self._connection_lost.clear()
+        self._connection = connection
+
+    async def _is_healthy(self) -> bool:
+        try:
+            async with self._connection_lock:
+                await self._connection.fetchval(
+                    "SELECT 1",
+                    timeout=settings.CACHE_INVALIDATION_HEALTH_CHECK_INTERVAL,
+                )
+        except Exception as e:
+            logger.error(f"Cache invalidation bus health check failed: {e}")
+            return False
+
+        return True
+
+    async def _watch_connection(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._connection_lost.wait(),
+                    settings.CACHE_INVALIDATION_HEALTH_CHECK_INTERVAL,
+                )
+            except TimeoutError:
+                if await self._is_healthy():
+                    continue
+
+            logger.warning("Cache invalidation bus lost its Postgres connection")
+            await self._reconnect()
+
+    async def _reconnect(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.terminate()
+
+        delay = RECONNECT_MIN_DELAY
+        while True:
+            try:
+                await self._connect()
+                break
+            except Exception as e:
+                logger.error(
+                    f"Failed to reconnect cache invalidation bus, "
+                    f"retrying in {delay:.0f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.CACHE_INVALIDATION_RECONNECT_MAX_DELAY)
+
+        logger.info("Cache invalidation bus reconnected")
+
+        # Notifications sent while the connection was down are lost, so nothing
+        # cached before the reconnect can be trusted
+        await self._reset()
+
+    def _file_offset_path(self, path: str) -> str:
+        return f"{path}.{self._origin}.offset"
+
+    def _open_file(self, path: str) -> None:
+        with open(path, "a", encoding="utf-8"):
+            pass
+
+        stat = os.stat(path)
+        self._file_inode = stat.st_ino
+        self._file_offset = stat.st_size
+        self._save_file_offset(path)
+
+    def _append_file(self, path: str, payload: str) -> None:
+        with file_lock(path), open(path, "a", encoding="utf-8") as f:
+            f.write(payload + "\n")
+
+    def _save_file_offset(self, path: str) -> None:
+        with open(self._file_offset_path(path), "w", encoding="utf-8") as f:
+            f.write(f"{self._file_inode} {self._file_offset}")
+
+    def _remove_file_offset(self, path: str) -> None:
+        try:
+            os.remove(self._file_offset_path(path))
+        except OSError:
+            pass
+
+    def _read_file(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+
+            # The file was rotated or truncated, so it is read from the start
+            if stat.st_ino != self._file_inode or stat.st_size < self._file_offset:
+                self._file_inode = stat.st_ino
+                self._file_offset = 0
+
+            f.seek(self._file_offset)
+            data = f.read()
+
+        complete = data[: data.rfind(b"\n") + 1]
+        self._file_offset += len(complete)
+
+        return complete
+
+    def _rotate_file(self, path: str) -> None:
+        # Every reader records how far it got, and once all of them have reached
+        # the end the file is replaced with an empty one. Readers that stopped
+        # refreshing their offset are treated as gone
+        stale = time.time() - max(
+            FILE_READER_TIMEOUT, 3 * settings.CACHE_INVALIDATION_POLL_INTERVAL
+        )
+
+        with file_lock(path):
+            stat = os.stat(path)
+            if stat.st_size == 0:
+                return
+
+            for offset_path in glob.glob(f"{glob.escape(path)}.*.offset"):
+                try:
+                    if os.path.getmtime(offset_path) < stale:
+                        os.remove(offset_path)
+                        continue
+
+                    with open(offset_path, encoding="utf-8") as f:
+                        inode, offset = map(int, f.read().split())
+                except (OSError, ValueError):
+                    return
+
+                if inode != stat.st_ino or offset < stat.st_size:
+                    return
+
+            empty = f"{path}.{self._origin}.tmp"
+            open(empty, "w").close()
+            os.replace(empty, path)
+
+    async def _poll_file(self, path: str) -> None:
+        while True:
+            await asyncio.sleep(settings.CACHE_INVALIDATION_POLL_INTERVAL)
+
+            try:
+                data = await asyncio.to_thread(self._read_file, path)
+            except OSError as e:
+                logger.error(f"Failed to read cache invalidation file: {e}")
+                continue
+
+            for line in data.decode("utf-8").splitlines():
+                await self._apply(line)
+
+            try:
+                await asyncio.to_thread(self._save_file_offset, path)
+                await asyncio.to_thread(self._rotate_file, path)
+            except OSError as e:
+                logger.error(f"Failed to rotate cache invalidation file: {e}")
+
+
+invalidation_bus = InvalidationBus()
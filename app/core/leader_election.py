@@ -0,0 +1,118 @@
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import asyncpg  # type: ignore[import-untyped]
+from sqlalchemy import delete, or_, select
+
+from app.core.logger import logger
+from app.core.settings import settings
+from app.db.models.scheduler_lease import SchedulerLease
+from app.db.session import async_session, engine
+from app.db.upsert import dialect_insert
+
+
+class LeaderElection:
+    def __init__(self, name: str, instance: str) -> None:
+        self.name = name
+        self.instance = instance
+        self._lock_key = zlib.crc32(name.encode())
+        self._connection: Any = None
+        self._is_leader = False
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    async def acquire(self) -> bool:
+        if not settings.SCHEDULER_LEADER_ELECTION:
+            self._is_leader = True
+        elif engine.dialect.name == "postgresql":
+            await self._acquire_advisory_lock()
+        else:
+            await self._acquire_lease()
+
+        return self._is_leader
+
+    async def release(self) -> None:
+        try:
+            if self._connection is not None:
+                await self._close_connection()
+            elif self._is_leader and settings.SCHEDULER_LEADER_ELECTION:
+                async with async_session() as db:
+                    async with db.begin():
+                        await db.execute(
+                            delete(SchedulerLease).where(
+                                SchedulerLease.name == self.name,
+                                SchedulerLease.holder == self.instance,
+                            )
+                        )
+        except Exception as e:
+            logger.error(f"Failed to release {self.name} leadership: {e}")
+
+        self._is_leader = False
+
+    async def _acquire_advisory_lock(self) -> None:
+        # The lock belongs to the session of a dedicated connection, so it is
+        # released by Postgres as soon as this instance dies or disconnects
+        try:
+            if self._connection is None:
+                dsn = settings.DATABASE_URL.get_secret_value().replace(
+                    "postgresql+asyncpg://", "postgresql://", 1
+                )
+                self._connection = await asyncpg.connect(dsn)
+
+            if self._is_leader:
+                await self._connection.fetchval("SELECT 1")
+            else:
+                self._is_leader = await self._connection.fetchval(
+                    "SELECT pg_try_advisory_lock($1)", self._lock_key
+                )
+        except Exception as e:
+            logger.error(f"Failed to check {self.name} advisory lock: {e}")
+            await self._close_connection()
+
+    async def _close_connection(self) -> None:
+        connection, self._connection = self._connection, None
+        self._is_leader = False
+
+        if connection is not None:
+            try:
+                await connection.close()
+            except Exception:
+                pass
+
+    async def _acquire_lease(self) -> None:
+        now = datetime.now(timezone.utc)
+        stmt = dialect_insert(SchedulerLease).values(
+            name=self.name,
+            holder=self.instance,
+            expires_at=now + timedelta(seconds=settings.SCHEDULER_LEASE_TTL),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SchedulerLease.name],
+            set_={
+                "holder": stmt.excluded.holder,
+                "expires_at": stmt.excluded.expires_at,
+            },
+            where=or_(
+                SchedulerLease.holder == self.instance,
+                SchedulerLease.expires_at < now,
+            ),
+        )
+
+        try:
+            async with async_session() as db:
+                async with db.begin():
+                    await db.execute(stmt)
+                    holder = await db.scalar(
+                        select(SchedulerLease.holder).where(
+                            SchedulerLease.name == self.name
+                        )
+                    )
+        except Exception as e:
+            logger.error(f"Failed to renew {self.name} lease: {e}")
+            self._is_leader = False
+            return
+
+        self._is_leader = holder == self.instance
@@ -0,0 +1,359 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Awaitable, Callable, Protocol
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, func, select, update
+
+from app.core.enums import JobRunStatus, MissedRunPolicy
+from app.core.leader_election import LeaderElection
+from app.core.logger import logger
+from app.core.settings import settings
+from app.core.shutdown import shutdown_manager
+from app.db.models.job_run import JobRun
+from app.db.session import async_session
+
+
+JobFunction = Callable[[], Awaitable[Any]]
+
+
+class Trigger(Protocol):
+    def next_after(self, moment: datetime) -> datetime: ...
+
+
+class IntervalTrigger:
+    def __init__(self, seconds: float) -> None:
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+
+        self.interval = timedelta(seconds=seconds)
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + self.interval
+
+
+def parse_cron_field(field: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+
+    for part in field.split(","):
+        expression, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+
+        if expression == "*":
+            start, end = low, high
+        elif "-" in expression:
+            start_text, end_text = expression.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(expression)
+            end = high if step_text else start
+
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"Invalid cron field: {field}")
+
+        values.update(range(start, end + 1, step))
+
+    return frozenset(values)
+
+
+class CronTrigger:
+    def __init__(
+        self, expression: str, zone: str = settings.SCHEDULER_TIMEZONE
+    ) -> None:
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression}")
+
+        self.expression = expression
+        self.zone = ZoneInfo(zone)
+        self.minutes = sorted(parse_cron_field(fields[0], 0, 59))
+        self.hours = sorted(parse_cron_field(fields[1], 0, 23))
+        self.days = parse_cron_field(fields[2], 1, 31)
+        self.months = parse_cron_field(fields[3], 1, 12)
+        # Both 0 and 7 mean Sunday
+        self.weekdays = frozenset(day % 7 for day in parse_cron_field(fields[4], 0, 7))
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+
+        weekday = day.isoweekday() % 7
+        if self._any_day or self._any_weekday:
+            return day.day in self.days and weekday in self.weekdays
+
+        # Like cron, a restricted day of month and day of week match either one
+        return day.day in self.days or weekday in self.weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        local = moment.astimezone(self.zone).replace(tzinfo=None)
+        start = local.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.date()
+
+        # Eight years covers every valid combination, including February 29
+        for _ in range(366 * 8):
+            if self._day_matches(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = datetime.combine(day, time(hour, minute))
+                        if candidate < start:
+                            continue
+
+                        run = candidate.replace(tzinfo=self.zone)
+                        if run > moment:
+                            return run.astimezone(timezone.utc)
+
+            day += timedelta(days=1)
+
+        raise ValueError(f"Cron expression never fires: {self.expression}")
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    name: str
+    func: JobFunction
+    trigger: Trigger
+    jitter: float = 0
+    missed_run_policy: MissedRunPolicy = MissedRunPolicy.SKIP
+    max_instances: int = 1
+    # Jobs that touch shared state run on the elected leader only, while
+    # per-process jobs such as buffer flushes run on every instance
+    leader_only: bool = True
+    history: bool = True
+    on_start: Callable[[], None] | None = None
+
+
+class JobScheduler:
+    def __init__(self) -> None:
+        self.instance = uuid4().hex
+        self._jobs: dict[str, Job] = {}
+        self._next_runs: dict[str, datetime] = {}
+        self._running: dict[str, set[asyncio.Task[None]]] = {}
+        self._election = LeaderElection("scheduler", self.instance)
+
+    @property
+    def is_leader(self) -> bool:
+        return self._election.is_leader
+
+    @property
+    def jobs(self) -> list[Job]:
+        return list(self._jobs.values())
+
+    def add_job(self, job: Job) -> None:
+        if job.name in self._jobs:
+            raise ValueError(f"Job {job.name} is already registered")
+
+        self._jobs[job.name] = job
+
+    def next_run(self, name: str) -> datetime | None:
+        return self._next_runs.get(name)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        leader_jobs = [job for job in self._jobs.values() if job.leader_only]
+        renew_at = loop.time()
+
+        await self._start_jobs(
+            [job for job in self._jobs.values() if not job.leader_only]
+        )
+
+        try:
+            while shutdown_manager.is_accepting:
+                if leader_jobs and loop.time() >= renew_at:
+                    await self._update_leadership(leader_jobs)
+                    renew_at = loop.time() + settings.SCHEDULER_LEASE_TTL / 3
+
+                now = datetime.now(timezone.utc)
+                for name, run in list(self._next_runs.items()):
+                    if run <= now:
+                        self._dispatch(self._jobs[name], run, now)
+
+                delays = [
+                    (run - datetime.now(timezone.utc)).total_seconds()
+                    for run in self._next_runs.values()
+                ]
+                if leader_jobs:
+                    delays.append(renew_at - loop.time())
+
+                delay = min(delays, default=settings.SCHEDULER_LEASE_TTL)
+                if not await shutdown_manager.sleep(max(delay, 0)):
+                    break
+        finally:
+            tasks = [task for running in self._running.values() for task in running]
+            try:
+                if tasks:
+                    await asyncio.wait(tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+                await self._election.release()
+
+    async def _update_leadership(self, leader_jobs: list[Job]) -> None:
+        was_leader = self._election.is_leader
+        is_leader = await self._election.acquire()
+
+        if is_leader and not was_leader:
+            logger.info(f"Scheduler instance {self.instance} is now the leader")
+            await self._start_jobs(leader_jobs)
+        elif was_leader and not is_leader:
+            logger.warning(f"Scheduler instance {self.instance} lost leadership")
+            for job in leader_jobs:
+                self._next_runs.pop(job.name, None)
+
+    async def _start_jobs(self, jobs: list[Job]) -> None:
+        last_runs = await self._load_last_runs(
+            [job.name for job in jobs if job.history]
+        )
+        now = datetime.now(timezone.utc)
+
+        for job in jobs:
+            if job.on_start:
+                job.on_start()
+
+            self._next_runs[job.name] = self._first_run(
+                job, last_runs.get(job.name), now
+            )
+            logger.info(f"Job {job.name} scheduled at {self._next_runs[job.name]}")
+
+    def _first_run(
+        self, job: Job, last_run: datetime | None, now: datetime
+    ) -> datetime:
+        # History carries the schedule across restarts and leader changes, so a
+        # restart does not rerun a job that another instance has just run
+        if last_run is not None:
+            due = self._next_after(job, last_run)
+            if due > now:
+                return due
+
+        if job.missed_run_policy == MissedRunPolicy.RUN_ONCE:
+            return now
+
+        return self._next_after(job, now)
+
+    def _next_after(self, job: Job, moment: datetime) -> datetime:
+        run = job.trigger.next_after(moment)
+        if job.jitter:
+            run += timedelta(seconds=random.uniform(0, job.jitter))
+
+        return run
+
+    def _dispatch(self, job: Job, run: datetime, now: datetime) -> None:
+        # Runs missed while the process was stalled are collapsed into this one
+        next_run = self._next_after(job, run)
+        if next_run <= now:
+            next_run = self._next_after(job, now)
+
+        self._next_runs[job.name] = next_run
+
+        running = self._running.setdefault(job.name, set())
+        if len(running) >= job.max_instances:
+            logger.info(
+                f"Skipping job {job.name}: {len(running)} runs still in progress"
+            )
+            return
+
+        task = asyncio.create_task(self._execute(job, run))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+    async def _execute(self, job: Job, scheduled_at: datetime) -> None:
+        async with shutdown_manager.track():
+            run_id = await self._record_start(job, scheduled_at)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+
+            try:
+                await job.func()
+            except asyncio.CancelledError:
+                await self._record_finish(run_id, JobRunStatus.FAILED, "Cancelled")
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.name} failed: {e}")
+                await self._record_finish(run_id, JobRunStatus.FAILED, str(e))
+                return
+
+            await self._record_finish(run_id, JobRunStatus.SUCCEEDED, None)
+
+            if job.history:
+                logger.info(f"Job {job.name} finished in {loop.time() - started:.1f}s")
+
+    async def _load_last_runs(self, names: list[str]) -> dict[str, datetime]:
+        if not names:
+            return {}
+
+        try:
+            async with async_session() as db:
+                result = await db.execute(
+                    select(JobRun.job, func.max(JobRun.started_at))
+                    .where(JobRun.job.in_(names))
+                    .group_by(JobRun.job)
+                )
+        except Exception as e:
+            logger.error(f"Failed to load job history: {e}")
+            return {}
+
+        return {
+            name: started_at.replace(tzinfo=started_at.tzinfo or timezone.utc)
+            for name, started_at in result.tuples()
+        }
+
+    async def _record_start(self, job: Job, scheduled_at: datetime) -> int | None:
+        if not job.history:
+            return None
+
+        run = JobRun(
+            job=job.name,
+            instance=self.instance,
+            status=JobRunStatus.RUNNING,
+            scheduled_at=scheduled_at,
+            started_at=datetime.now(timezone.utc),
+        )
+
+        try:
+            async with async_session() as db:
+                async with db.begin():
+                    db.add(run)
+        except Exception as e:
+            logger.error(f"Failed to record start of job {job.name}: {e}")
+            return None
+
+        return run.id
+
+    async def _record_finish(
+        self, run_id: int | None, status: JobRunStatus, error: str | None
+    ) -> None:
+        if run_id is None:
+            return
+
+        try:
+            async with async_session() as db:
+                async with db.begin():
+                    await db.execute(
+                        update(JobRun)
+                        .where(JobRun.id == run_id)
+                        .values(
+                            status=status,
+                            finished_at=datetime.now(timezone.utc),
+                            error=error,
+                        )
+                    )
+        except Exception as e:
+            logger.error(f"Failed to record result of job run {run_id}: {e}")
+
+
+async def prune_job_history() -> None:
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        days=settings.SCHEDULER_HISTORY_DAYS
+    )
+
+    async with async_session() as db:
+        async with db.begin():
+            await db.execute(delete(JobRun).where(JobRun.started_at < cutoff))
+
+
+job_scheduler = JobScheduler()
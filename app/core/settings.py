@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     ROOT_ORGANIZATION_PRIVATE: bool = True
 
     SERVICE_ACCOUNT_FILE: str
+    GOOGLE_DRIVE_WORKERS: int = 4
+    GOOGLE_DRIVE_TIMEOUT: float = 60.0
     DATABASE_URL: SecretStr
 
     API_URL: HttpUrl
@@ -30,6 +32,63 @@ class Settings(BaseSettings):
     AES_TOKEN_SALT: SecretStr | None = None
 
     DAILY_PENDING_NOTIFICATION_HOUR: int = 12
+    DAILY_PENDING_NOTIFICATION_TIMEZONE: str = "UTC"
+    DAILY_NOTIFICATION_SPREAD: int = 600
+    DAILY_NOTIFICATION_SCHEDULE_REFRESH: int = 300
+    DAILY_NOTIFICATION_CHECK_INTERVAL: int = 30
+    DAILY_NOTIFICATION_WORKERS: int = 4
+    DAILY_NOTIFICATION_SLOW_SECONDS: float = 10.0
+
+    SHUTDOWN_DRAIN_TIMEOUT: int = 25
+
+    SCHEDULER_LEADER_ELECTION: bool = True
+    SCHEDULER_LEASE_TTL: int = 30
+    SCHEDULER_TIMEZONE: str = "UTC"
+    SCHEDULER_HISTORY_DAYS: int = 30
+    SCHEDULER_HISTORY_CLEANUP_CRON: str = "30 3 * * *"
+
+    CAPTAINS_UPDATE_INTERVAL: int = 1800
+    CAPTAINS_UPDATE_JITTER: int = 300
+
+    USER_BUFFER_FLUSH_INTERVAL: int = 5
+    BAN_RECONCILE_INTERVAL: int = 300
+
+    ORGANIZATION_CACHE_SIZE: int = 100
+    ORGANIZATION_CACHE_TTL: int = 3600
+    TELEGRAM_BOT_CACHE_SIZE: int = 100
+    TELEGRAM_BOT_CACHE_TTL: int = 300
+    USER_CACHE_SIZE: int = 5000
+    USER_CACHE_TTL: int = 600
+    CALLBACK_IDEMPOTENCY_CACHE_SIZE: int = 1000
+    CALLBACK_IDEMPOTENCY_CACHE_TTL: int = 60
+    ROUTING_DIRECTORY_TTL: int = 3600
+    KEYBOARD_CACHE_SIZE: int = 5000
+    KEYBOARD_CACHE_TTL: int = 3600
+    REACHABILITY_CACHE_SIZE: int = 1000
+    REPLY_ROUTE_CACHE_SIZE: int = 10000
+    REPLY_ROUTE_CACHE_TTL: int = 86400
+    REQUESTER_CONTEXT_CACHE_SIZE: int = 5000
+    REQUESTER_CONTEXT_CACHE_TTL: int = 3600
+
+    MESSAGE_RETENTION_INTERVAL: int = 3600
+    MESSAGE_RETENTION_BATCH_SIZE: int = 1000
+    MESSAGE_RETENTION_SERVICE_DAYS: int = 180
+    MESSAGE_RETENTION_REQUEST_DAYS: int = 180
+    MESSAGE_RETENTION_TASK_DAYS: int = 180
+    MESSAGE_RETENTION_INFO_DAYS: int = 90
+    MESSAGE_RETENTION_INFO_REPLY_DAYS: int = 90
+    MESSAGE_RETENTION_SPAM_DAYS: int = 30
+
+    PENDING_COUNTERS_RECONCILE_INTERVAL: int = 3600
+    PENDING_STREAM_BATCH_SIZE: int = 500
+    PENDING_PAGE_SIZE: int = 25
+
+    CACHE_WARMUP: bool = True
+    CACHE_INVALIDATION_BUS: bool = False
+    CACHE_INVALIDATION_FILE: str = "cache_invalidation.log"
+    CACHE_INVALIDATION_POLL_INTERVAL: float = 1.0
+    CACHE_INVALIDATION_HEALTH_CHECK_INTERVAL: float = 30.0
+    CACHE_INVALIDATION_RECONNECT_MAX_DELAY: float = 60.0
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -0,0 +1,114 @@
+import asyncio
+import signal
+from contextlib import asynccontextmanager
+from types import FrameType
+from typing import Any, AsyncGenerator, Awaitable, Callable
+
+from app.core.logger import logger
+
+
+ShutdownHook = Callable[[], Awaitable[Any]]
+
+
+class ShutdownManager:
+    def __init__(self) -> None:
+        self._accepting = True
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._stopping = asyncio.Event()
+        self._hooks: list[tuple[str, ShutdownHook]] = []
+
+    @property
+    def is_accepting(self) -> bool:
+        return self._accepting
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def track(self) -> AsyncGenerator[None, None]:
+        self._in_flight += 1
+        self._idle.clear()
+
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    async def sleep(self, seconds: float) -> bool:
+        if self._stopping.is_set():
+            return False
+
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except TimeoutError:
+            return True
+
+        return False
+
+    def stop_accepting(self) -> None:
+        self._accepting = False
+        self._stopping.set()
+
+    def install_signal_handlers(self) -> None:
+        # Uvicorn stops listening and waits for in-flight requests before the
+        # lifespan shutdown runs, so intake has to be closed as soon as the
+        # signal arrives for readiness and webhook rejection to take effect
+        loop = asyncio.get_running_loop()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            previous = signal.getsignal(sig)
+
+            def handler(
+                signum: int, frame: FrameType | None, previous: Any = previous
+            ) -> None:
+                self._accepting = False
+                loop.call_soon_threadsafe(self._stopping.set)
+
+                if callable(previous):
+                    previous(signum, frame)
+
+            signal.signal(sig, handler)
+
+    def add_hook(self, name: str, hook: ShutdownHook) -> None:
+        self._hooks.append((name, hook))
+
+    async def drain(
+        self, timeout: float, tasks: list[asyncio.Task[None]] | None = None
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        self.stop_accepting()
+
+        logger.info(f"Draining {self._in_flight} in-flight jobs ({timeout:.0f}s limit)")
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except TimeoutError:
+            logger.warning(
+                f"Drain deadline reached with {self._in_flight} jobs still running"
+            )
+
+        pending = [task for task in tasks or [] if not task.done()]
+        if pending:
+            remaining = max(deadline - loop.time(), 0)
+            _, not_done = await asyncio.wait(pending, timeout=remaining)
+
+            for task in not_done:
+                task.cancel()
+
+            await asyncio.gather(*not_done, return_exceptions=True)
+
+        for name, hook in self._hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Shutdown hook {name} failed: {e}")
+
+
+shutdown_manager = ShutdownManager()
@@ -0,0 +1,81 @@
+import asyncio
+from itertools import chain
+from typing import Any
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.cache import cache_registry
+from app.core.invalidation import invalidation_bus
+
+
+_tracked_models: dict[type[Any], set[str]] = {}
+_pending: set[asyncio.Task[None]] = set()
+
+
+def track_model_changes(tag: str, *models: type[Any]) -> None:
+    for model in models:
+        _tracked_models.setdefault(model, set()).add(tag)
+
+
+def mark_changed(db: AsyncSession | Session, *tags: str) -> None:
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    session.info.setdefault("changed_tags", set()).update(tags)
+
+
+def _model_tags(model: type[Any]) -> set[str]:
+    tags: set[str] = set()
+    for tracked, tracked_tags in _tracked_models.items():
+        if issubclass(model, tracked):
+            tags |= tracked_tags
+
+    return tags
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context: Any) -> None:
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tags = _model_tags(type(obj))
+        if tags:
+            mark_changed(session, *tags)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statement(orm_execute_state: ORMExecuteState) -> None:
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+
+    tags = _model_tags(mapper.class_)
+    if tags:
+        mark_changed(orm_execute_state.session, *tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    tags: set[str] | None = session.info.pop("changed_tags", None)
+    if not tags:
+        return
+
+    cache_registry.invalidate(*tags)
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    task = loop.create_task(invalidation_bus.publish(*tags))
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop("changed_tags", None)
@@ -8,6 +8,11 @@ from app.db.models import chat
 from app.db.models import chat_user
 from app.db.models import chat_thread
 from app.db.models import message
+from app.db.models import message_archive
+from app.db.models import request_state
+from app.db.models import pending_counter
+from app.db.models import job_run
+from app.db.models import scheduler_lease
 
 __all__ = [
     "organization",
@@ -20,4 +25,9 @@ __all__ = [
     "chat_user",
     "chat_thread",
     "message",
+    "message_archive",
+    "request_state",
+    "pending_counter",
+    "job_run",
+    "scheduler_lease",
 ]
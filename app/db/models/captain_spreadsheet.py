@@ -23,6 +23,10 @@ class CaptainSpreadsheet(Base, TimestampMixin):
     rows_range_min: Mapped[int | None] = mapped_column(nullable=True)
     rows_range_max: Mapped[int | None] = mapped_column(nullable=True)
 
+    # Drive version seen on the last sync and a hash of the rows it produced
+    revision: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
     organization: Mapped["Organization"] = relationship(
         back_populates="captain_spreadsheet", uselist=False
     )
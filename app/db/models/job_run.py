@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Enum, Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.enums import JobRunStatus
+from app.db.base import Base
+
+
+class JobRun(Base):
+    __tablename__ = "job_runs"
+    __table_args__ = (Index("ix_job_runs_job_started_at", "job", "started_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    job: Mapped[str] = mapped_column(String(64), nullable=False)
+    instance: Mapped[str] = mapped_column(String(32), nullable=False)
+    status: Mapped[JobRunStatus] = mapped_column(
+        Enum(JobRunStatus, native_enum=False, length=16), nullable=False
+    )
+
+    scheduled_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, Enum, Index
+from sqlalchemy import BigInteger, Enum, Index, and_, bindparam, literal
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.enums import MessageStatus, MessageType
 from app.db.base import Base
@@ -15,6 +15,7 @@ class Message(Base, TimestampMixin):
             "destination_message_id",
         ),
         Index("ix_messages_chat_destination_chat", "chat_id", "destination_chat_id"),
+        Index("ix_messages_type_created_at", "type", "created_at"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -43,3 +44,37 @@ class Message(Base, TimestampMixin):
         BigInteger, nullable=True
     )
     is_status_reference: Mapped[bool | None] = mapped_column(nullable=True)
+
+
+OPEN_REQUEST_STATUSES = (MessageStatus.NEW, MessageStatus.IN_PROCESS)
+
+# Rendered as literals so the planner can match queries against the partial
+# index predicate even when the statement is prepared
+is_open_request = and_(
+    Message.type
+    == literal(MessageType.SERVICE, Message.type.type, literal_execute=True),
+    Message.status.in_(
+        bindparam(
+            "open_request_statuses",
+            list(OPEN_REQUEST_STATUSES),
+            type_=Message.status.type,
+            expanding=True,
+            literal_execute=True,
+        )
+    ),
+)
+
+Index(
+    "ix_messages_open_requests",
+    Message.destination_chat_id,
+    Message.id,
+    postgresql_include=[
+        "destination_thread_id",
+        "destination_message_id",
+        "status",
+        "is_status_reference",
+        "created_at",
+    ],
+    postgresql_where=is_open_request,
+    sqlite_where=is_open_request,
+)
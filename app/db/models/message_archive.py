@@ -0,0 +1,36 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Enum, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.enums import MessageStatus, MessageType
+from app.db.base import Base
+
+
+class MessageArchive(Base):
+    __tablename__ = "messages_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    thread_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    destination_chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    destination_thread_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    destination_message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    type: Mapped[MessageType] = mapped_column(
+        Enum(MessageType, native_enum=False, length=16),
+        nullable=False,
+    )
+    status: Mapped[MessageStatus | None] = mapped_column(
+        Enum(MessageStatus, native_enum=False, length=16),
+        nullable=True,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
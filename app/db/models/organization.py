@@ -1,5 +1,6 @@
+from datetime import time
 from typing import TYPE_CHECKING
-from sqlalchemy import BigInteger, String
+from sqlalchemy import BigInteger, String, Time
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 from app.db.timestamps import TimestampMixin
@@ -28,6 +29,10 @@ class Organization(Base, TimestampMixin):
     daily_pending_notifications: Mapped[bool] = mapped_column(
         default=False, nullable=False
     )
+    daily_notification_time: Mapped[time | None] = mapped_column(Time, nullable=True)
+    daily_notification_timezone: Mapped[str | None] = mapped_column(
+        String(64), nullable=True
+    )
     owner: Mapped[int] = mapped_column(
         BigInteger, unique=True, index=True, nullable=False
     )
@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Enum
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.enums import MessageStatus
+from app.db.base import Base
+
+
+class PendingCounter(Base):
+    __tablename__ = "pending_counters"
+
+    destination_chat_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    # Requests sent outside of any thread are counted under thread 0
+    destination_thread_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    status: Mapped[MessageStatus] = mapped_column(
+        Enum(MessageStatus, native_enum=False, length=16), primary_key=True
+    )
+    is_outgoing: Mapped[bool] = mapped_column(primary_key=True)
+
+    count: Mapped[int] = mapped_column(nullable=False, default=0)
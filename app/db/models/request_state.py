@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+from app.db.timestamps import TimestampMixin
+
+
+class RequestState(Base, TimestampMixin):
+    __tablename__ = "request_states"
+
+    chat_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    destination_chat_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    last_message_id: Mapped[int | None] = mapped_column(
+        ForeignKey("messages.id", ondelete="SET NULL"), nullable=True, index=True
+    )
@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from datetime import time
+
+from app.core.enums import ChatType, VisibilityLevel
+from app.db.models.captain_spreadsheet import CaptainSpreadsheet
+from app.db.models.chat import Chat
+from app.db.models.chat_thread import ChatThread
+from app.db.models.organization import Organization
+from app.db.models.telegram_bot import TelegramBot
+
+
+@dataclass(frozen=True, slots=True)
+class TelegramBotSnapshot:
+    id: int
+    token: bytes
+    username: str
+    secret: bytes
+    owner: int
+    organization_id: int
+
+    @classmethod
+    def from_model(cls, bot: TelegramBot) -> "TelegramBotSnapshot":
+        return cls(
+            id=bot.id,
+            token=bot.token,
+            username=bot.username,
+            secret=bot.secret,
+            owner=bot.owner,
+            organization_id=bot.organization_id,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class OrganizationSnapshot:
+    id: int
+    title: str
+    admin_chat_id: int | None
+    admin_chat_thread_id: int | None
+    is_admins_accept_messages: bool
+    greeting_message: str | None
+    is_private: bool
+    is_verified: bool
+    daily_pending_notifications: bool
+    daily_notification_time: time | None
+    daily_notification_timezone: str | None
+    owner: int
+    created_from_bot_id: int
+    bot: TelegramBotSnapshot | None
+
+    @classmethod
+    def from_model(cls, organization: Organization) -> "OrganizationSnapshot":
+        return cls(
+            id=organization.id,
+            title=organization.title,
+            admin_chat_id=organization.admin_chat_id,
+            admin_chat_thread_id=organization.admin_chat_thread_id,
+            is_admins_accept_messages=organization.is_admins_accept_messages,
+            greeting_message=organization.greeting_message,
+            is_private=organization.is_private,
+            is_verified=organization.is_verified,
+            daily_pending_notifications=organization.daily_pending_notifications,
+            daily_notification_time=organization.daily_notification_time,
+            daily_notification_timezone=organization.daily_notification_timezone,
+            owner=organization.owner,
+            created_from_bot_id=organization.created_from_bot_id,
+            bot=(
+                TelegramBotSnapshot.from_model(organization.bot)
+                if organization.bot
+                else None
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ChatSnapshot:
+    id: int
+    organization_id: int
+    title: str
+    type: ChatType
+    visibility_level: VisibilityLevel
+    captain_connected_thread: int | None
+    pin_requests: bool
+    tag_on_requests: str | None
+
+    @classmethod
+    def from_model(cls, chat: Chat) -> "ChatSnapshot":
+        return cls(
+            id=chat.id,
+            organization_id=chat.organization_id,
+            title=chat.title,
+            type=chat.type,
+            visibility_level=chat.visibility_level,
+            captain_connected_thread=chat.captain_connected_thread,
+            pin_requests=chat.pin_requests,
+            tag_on_requests=chat.tag_on_requests,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ChatThreadSnapshot:
+    id: int
+    chat_id: int
+    title: str
+    visibility_level: VisibilityLevel
+    pin_requests: bool
+    tag_on_requests: str | None
+
+    @classmethod
+    def from_model(cls, thread: ChatThread) -> "ChatThreadSnapshot":
+        return cls(
+            id=thread.id,
+            chat_id=thread.chat_id,
+            title=thread.title,
+            visibility_level=thread.visibility_level,
+            pin_requests=thread.pin_requests,
+            tag_on_requests=thread.tag_on_requests,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CaptainSpreadsheetSnapshot:
+    organization_id: int
+    spreadsheet_id: str
+    chat_title_column: str
+    username_column: str
+    sheet_name: str | None
+    rows_range_min: int | None
+    rows_range_max: int | None
+    revision: str | None
+    content_hash: str | None
+
+    @classmethod
+    def from_model(
+        cls, spreadsheet: CaptainSpreadsheet
+    ) -> "CaptainSpreadsheetSnapshot":
+        return cls(
+            organization_id=spreadsheet.organization_id,
+            spreadsheet_id=spreadsheet.spreadsheet_id,
+            chat_title_column=spreadsheet.chat_title_column,
+            username_column=spreadsheet.username_column,
+            sheet_name=spreadsheet.sheet_name,
+            rows_range_min=spreadsheet.rows_range_min,
+            rows_range_max=spreadsheet.rows_range_max,
+            revision=spreadsheet.revision,
+            content_hash=spreadsheet.content_hash,
+        )
@@ -0,0 +1,11 @@
+from typing import Any
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db.session import engine
+
+
+def dialect_insert(table: Any) -> postgresql.Insert | sqlite.Insert:
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+
+    return sqlite.insert(table)
@@ -6,46 +6,58 @@ from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
+from app.core.google_drive import drive_client
+from app.core.invalidation import invalidation_bus
 from app.core.limiter import limiter
 from app.core.logger import logger
-from app.db.session import setup_db
+from app.db.session import engine, setup_db
 from app.routes import api
 from app.core.settings import settings
+from app.core.scheduler import job_scheduler
+from app.core.shutdown import shutdown_manager
+from bot.middlewares.ban_middleware import ban_controller
 from bot.root_bot import ROOT_BOT
-from bot.utils.periodic_tasks import (
-    periodic_data_update,
-    daily_pending_notifications_task,
-)
+from bot.utils.periodic_tasks import register_periodic_jobs
 from bot.utils.setup import setup_root_organization, startup_bots_setup
+from bot.utils.user_buffer import user_buffer
+from bot.utils.warmup import warm_up_caches
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    app.state.ready = False
+
     await setup_db()
     await setup_root_organization()
     await startup_bots_setup()
+    await ban_controller.load()
+
+    if settings.CACHE_WARMUP:
+        await warm_up_caches()
 
-    captains_update_task = asyncio.create_task(periodic_data_update())
-    daily_notifications_task = asyncio.create_task(daily_pending_notifications_task())
+    invalidation_bus.add_listener(ban_controller.apply_invalidation)
+    invalidation_bus.add_reset_listener(ban_controller.load)
+    await invalidation_bus.start()
 
+    register_periodic_jobs(job_scheduler)
+    scheduler_task = asyncio.create_task(job_scheduler.run())
+
+    shutdown_manager.add_hook("user_buffer", user_buffer.flush)
+    shutdown_manager.add_hook("google_drive", drive_client.close)
+
+    shutdown_manager.install_signal_handlers()
+    app.state.ready = True
     logger.info("App started successfully")
 
     yield
 
-    captains_update_task.cancel()
-    daily_notifications_task.cancel()
-
-    try:
-        await captains_update_task
-    except asyncio.CancelledError:
-        pass
+    app.state.ready = False
 
-    try:
-        await daily_notifications_task
-    except asyncio.CancelledError:
-        pass
+    await shutdown_manager.drain(settings.SHUTDOWN_DRAIN_TIMEOUT, [scheduler_task])
 
+    await invalidation_bus.stop()
     await ROOT_BOT.session.close()
+    await engine.dispose()
 
     logger.info("App shutdown")
 
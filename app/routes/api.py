@@ -3,6 +3,7 @@ from fastapi import APIRouter, Request, Response
 
 from app.core.settings import settings
 from app.core.limiter import limiter
+from app.core.shutdown import shutdown_manager
 from app.routes import webhook
 
 
@@ -25,4 +26,19 @@ def health_check(request: Request, response: Response) -> dict[str, str]:
     return {"status": "ok"}
 
 
+@router.get(
+    "/ready",
+    tags=["root"],
+    responses={503: {"description": "App is starting up or shutting down"}},
+)
+def readiness_check(request: Request, response: Response) -> dict[str, str]:
+    # Not rate limited, orchestrators probe it every few seconds
+    ready = getattr(request.app.state, "ready", False)
+    if not ready or not shutdown_manager.is_accepting:
+        response.status_code = 503
+        return {"status": "not ready"}
+
+    return {"status": "ready"}
+
+
 router.include_router(webhook.router)
@@ -12,11 +12,10 @@ from fastapi import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.bot_cache import get_telegram_bot
-from app.core.crypto import crypto
-from app.core.enums import CryptoInfo
+from app.core.bot_cache import get_bot_credentials
 from app.core.exceptions import exception_handler
 from app.core.limiter import limiter
+from app.core.shutdown import shutdown_manager
 from app.db.session import get_db
 
 from bot.dispatcher import dp
@@ -40,6 +39,7 @@ router = APIRouter(prefix="/webhook", tags=["telegram"])
                 "application/json": {"example": {"detail": "Invalid Telegram token"}}
             },
         },
+        503: {"description": "Server is shutting down, Telegram will retry"},
     },
 )
 @limiter.limit("60/minute")
@@ -50,12 +50,24 @@ async def handle_update(
     x_telegram_token: str = Header(..., alias="X-Telegram-Bot-Api-Secret-Token"),
     db: AsyncSession = Depends(get_db),
 ) -> Response:
-    bot = await get_telegram_bot(bot_id, db)
-    if bot is None:
+    if not shutdown_manager.is_accepting:
+        return Response(status_code=503, headers={"Retry-After": "5"})
+
+    async with shutdown_manager.track():
+        return await process_update(bot_id, request, x_telegram_token, db)
+
+
+async def process_update(
+    bot_id: int,
+    request: Request,
+    x_telegram_token: str,
+    db: AsyncSession,
+) -> Response:
+    credentials = await get_bot_credentials(bot_id, db)
+    if credentials is None:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    secret = crypto.decrypt_data(bot.secret, CryptoInfo.WEBHOOK_SECRET)
-    if x_telegram_token != secret:
+    if x_telegram_token != credentials.secret:
         raise HTTPException(status_code=401, detail="Invalid token")
 
     try:
@@ -64,9 +76,7 @@ async def handle_update(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    token_stripped = crypto.decrypt_data(bot.token, CryptoInfo.BOT_TOKEN)
-    token = f"{bot_id}:{token_stripped}"
-    telegram_bot = Bot(token)
+    telegram_bot = Bot(credentials.token)
 
     try:
         message = update.message
@@ -0,0 +1,140 @@
+import asyncio
+import random
+import time
+from io import BytesIO
+from typing import Any
+
+import pandas as pd
+
+import bot.utils.spreadsheet as spreadsheet_module
+from app.core.google_drive import DriveClient
+from app.db.models.captain_spreadsheet import CaptainSpreadsheet
+from app.db.snapshots import CaptainSpreadsheetSnapshot
+from bot.utils.captains import CaptainRows, load_captain_rows
+
+
+ORGANIZATIONS = 50
+CAPTAINS = 300
+CHANGED = 5
+METADATA_LATENCY = 0.02
+EXPORT_LATENCY = 0.3
+
+
+def make_sheet(rng: random.Random, org: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "chat": [f"ІП-{org:02}{i:03}" for i in range(CAPTAINS)],
+            "username": [f"@captain_{org}_{i}" for i in range(CAPTAINS)],
+            "note": [rng.choice(["", "ok", "?"]) for _ in range(CAPTAINS)],
+        }
+    )
+
+
+def to_xlsx(df: pd.DataFrame) -> bytes:
+    buf = BytesIO()
+    df.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+class LocalDrive(DriveClient):
+    # Stand-in for Drive that serves in-memory files with simulated latency
+    def __init__(self) -> None:
+        super().__init__(workers=4, timeout=30)
+        self.files: dict[str, tuple[int, bytes]] = {}
+        self.exports = 0
+        self.metadata_calls = 0
+
+    def put(self, file_id: str, df: pd.DataFrame) -> None:
+        version = self.files[file_id][0] + 1 if file_id in self.files else 1
+        self.files[file_id] = (version, to_xlsx(df))
+
+    def _download(self, file_id: str, export_mime_type: str | None) -> bytes:
+        time.sleep(EXPORT_LATENCY)
+        self.exports += 1
+        return self.files[file_id][1]
+
+    def _get_metadata(self, file_id: str, fields: str) -> dict[str, Any]:
+        time.sleep(METADATA_LATENCY)
+        self.metadata_calls += 1
+        return {"version": str(self.files[file_id][0])}
+
+
+def make_spreadsheet(org: int) -> CaptainSpreadsheet:
+    return CaptainSpreadsheet(
+        organization_id=org,
+        spreadsheet_id=f"sheet-{org}",
+        chat_title_column="A",
+        username_column="B",
+    )
+
+
+async def sync_round(
+    drive: LocalDrive, spreadsheets: list[CaptainSpreadsheet], force: bool
+) -> tuple[float, int]:
+    drive.exports = drive.metadata_calls = 0
+    start = time.perf_counter()
+    results: list[CaptainRows | None] = await asyncio.gather(
+        *(
+            load_captain_rows(CaptainSpreadsheetSnapshot.from_model(spreadsheet), force)
+            for spreadsheet in spreadsheets
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    applied = 0
+    for spreadsheet, loaded in zip(spreadsheets, results):
+        if loaded is None:
+            continue
+
+        spreadsheet.revision = loaded.revision
+        if force or loaded.content_hash != spreadsheet.content_hash:
+            spreadsheet.content_hash = loaded.content_hash
+            applied += 1
+
+    return elapsed, applied
+
+
+def edit_sheets(
+    rng: random.Random, drive: LocalDrive, sheets: dict[int, pd.DataFrame]
+) -> None:
+    # Some sheets get a new captain, others only an edit outside the columns
+    for index, org in enumerate(rng.sample(range(ORGANIZATIONS), CHANGED)):
+        df = sheets[org].copy()
+        if index % 2:
+            df.loc[0, "username"] = f"@new_captain_{org}"
+        else:
+            df.loc[0, "note"] = "edited"
+
+        drive.put(f"sheet-{org}", df)
+
+
+async def main() -> None:
+    rng = random.Random(0)
+    drive = LocalDrive()
+    # load_spreadsheet and get_spreadsheet_revision resolve the client at call time
+    setattr(spreadsheet_module, "drive_client", drive)
+
+    sheets = {org: make_sheet(rng, org) for org in range(ORGANIZATIONS)}
+    for org, df in sheets.items():
+        drive.put(f"sheet-{org}", df)
+
+    spreadsheets = [make_spreadsheet(org) for org in range(ORGANIZATIONS)]
+    await sync_round(drive, spreadsheets, force=True)
+    edit_sheets(rng, drive, sheets)
+
+    incremental, applied = await sync_round(drive, spreadsheets, force=False)
+    exports, metadata_calls = drive.exports, drive.metadata_calls
+    full, full_applied = await sync_round(drive, spreadsheets, force=True)
+
+    print(f"{ORGANIZATIONS} spreadsheets, {CAPTAINS} captains each, {CHANGED} edited")
+    print(f"Full:        {full:6.2f}s, {drive.exports} exports, {full_applied} applied")
+    print(
+        f"Incremental: {incremental:6.2f}s, {exports} exports, {applied} applied, "
+        f"{metadata_calls} metadata calls"
+    )
+
+    await drive.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
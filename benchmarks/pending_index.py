@@ -0,0 +1,109 @@
+import random
+import tempfile
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from sqlalchemy import ClauseElement, Connection, create_engine, insert, text
+
+from app.core.enums import MessageStatus, MessageType
+from app.db.base import Base
+import app.db.models  # noqa: F401
+from app.db.models.message import Message
+from bot.utils.pending_requests import select_open_requests
+
+
+ROWS = 1_000_000
+CHATS = 1_000
+THREADS = 5
+BATCH = 50_000
+INDEX = "ix_messages_open_requests"
+
+
+def make_row(i: int, rng: random.Random) -> dict[str, object]:
+    is_service = rng.random() < 0.5
+    status: MessageStatus | None = None
+    if is_service:
+        # Only a small share of historical requests is still open
+        status = rng.choices(
+            (MessageStatus.NEW, MessageStatus.IN_PROCESS, MessageStatus.COMPLETED),
+            weights=(1, 1, 98),
+        )[0]
+
+    return {
+        "id": i,
+        "user_id": rng.randrange(10_000),
+        "chat_id": -rng.randrange(1, CHATS + 1),
+        "thread_id": None,
+        "message_id": i,
+        "destination_chat_id": -rng.randrange(1, CHATS + 1),
+        "destination_thread_id": rng.choice([None, *range(1, THREADS + 1)]),
+        "destination_message_id": i,
+        "is_within_organization": True,
+        "text": None,
+        "type": MessageType.SERVICE if is_service else MessageType.TASK,
+        "status": status,
+        "status_changed_by_user": None,
+        "is_status_reference": rng.random() < 0.5 if is_service else None,
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+
+def seed(conn: Connection) -> None:
+    rng = random.Random(0)
+    for start in range(1, ROWS + 1, BATCH):
+        conn.execute(
+            insert(Message),
+            [make_row(i, rng) for i in range(start, min(start + BATCH, ROWS + 1))],
+        )
+
+    conn.exec_driver_sql("ANALYZE")
+
+
+def explain(conn: Connection, stmt: ClauseElement) -> list[str]:
+    sql = str(stmt.compile(conn, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'pending.db'}")
+        Base.metadata.create_all(engine)
+
+        with engine.begin() as conn:
+            seed(conn)
+
+        queries = {
+            "chat": select_open_requests(-1),
+            "thread": select_open_requests(-2, 3),
+            "general thread": select_open_requests(-3, 1, include_unthreaded=True),
+            "section": select_open_requests(
+                -4, status=MessageStatus.NEW, is_outgoing=False
+            ),
+        }
+
+        print(f"{ROWS} messages, {CHATS} destination chats")
+
+        with engine.connect() as conn:
+            failed = False
+            for name, stmt in queries.items():
+                plan = explain(conn, stmt)
+                indexed = timeit.timeit(lambda: conn.execute(stmt).all(), number=20)
+                uses_index = any(INDEX in step for step in plan)
+                failed |= not uses_index
+
+                print(f"{name:>15}: {indexed / 20 * 1e3:8.2f} ms  {' | '.join(plan)}")
+
+            conn.execute(text(f"DROP INDEX {INDEX}"))
+            for name, stmt in queries.items():
+                scanned = timeit.timeit(lambda: conn.execute(stmt).all(), number=20)
+                print(f"{name:>15}: {scanned / 20 * 1e3:8.2f} ms  without {INDEX}")
+
+        engine.dispose()
+
+    if failed:
+        raise SystemExit(f"Pending queries do not use {INDEX}")
+
+
+if __name__ == "__main__":
+    main()
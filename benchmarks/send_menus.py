@@ -0,0 +1,127 @@
+import random
+import timeit
+
+from app.core.enums import ChatType, MessageType, VisibilityLevel
+from app.db.snapshots import ChatSnapshot, OrganizationSnapshot
+from bot.utils.routing_directory import RoutingDirectory, routing_directory
+from bot.utils.send_menus import (
+    build_org_chats_menu,
+    build_organizations_menu,
+    get_org_chats_menu,
+    get_organizations_menu,
+    keyboard_cache,
+)
+
+
+ORGANIZATIONS = 200
+CHATS = 2_000
+RENDERS = 2_000
+
+
+def make_organization(i: int) -> OrganizationSnapshot:
+    return OrganizationSnapshot(
+        id=i,
+        title="Root" if i == 0 else f"Organization {i:03}",
+        admin_chat_id=-1000000000000 - i,
+        admin_chat_thread_id=None,
+        is_admins_accept_messages=i % 3 != 0,
+        greeting_message=None,
+        is_private=i % 10 == 0,
+        is_verified=True,
+        daily_pending_notifications=True,
+        daily_notification_time=None,
+        daily_notification_timezone=None,
+        owner=i,
+        created_from_bot_id=i,
+        bot=None,
+    )
+
+
+def make_chat(i: int, rng: random.Random) -> ChatSnapshot:
+    return ChatSnapshot(
+        id=-2000000000000 - i,
+        organization_id=i % ORGANIZATIONS,
+        title=f"Chat {i}",
+        type=ChatType.INTERNAL if i % 4 else ChatType.EXTERNAL,
+        visibility_level=rng.choice(list(VisibilityLevel)),
+        captain_connected_thread=None,
+        pin_requests=False,
+        tag_on_requests=None,
+    )
+
+
+def make_directory() -> RoutingDirectory:
+    rng = random.Random(0)
+    organizations = [make_organization(i) for i in range(ORGANIZATIONS)]
+    chats = [make_chat(i, rng) for i in range(CHATS)]
+
+    internal_chats: dict[int, list[ChatSnapshot]] = {}
+    for chat in chats:
+        if chat.type == ChatType.INTERNAL:
+            internal_chats.setdefault(chat.organization_id, []).append(chat)
+
+    return RoutingDirectory(
+        organizations={
+            org.id: org for org in sorted(organizations, key=lambda o: o.title)
+        },
+        chats={chat.id: chat for chat in chats},
+        internal_chats={k: tuple(v) for k, v in internal_chats.items()},
+        threads={},
+        public_chat_organizations=frozenset(
+            chat.organization_id
+            for chat in chats
+            if chat.type == ChatType.INTERNAL
+            and chat.visibility_level == VisibilityLevel.PUBLIC
+        ),
+        admin_chats={
+            org.admin_chat_id: org.id
+            for org in organizations
+            if org.admin_chat_id is not None
+        },
+    )
+
+
+def main() -> None:
+    directory = make_directory()
+    routing_directory.set(directory)
+
+    rng = random.Random(1)
+    viewers = [
+        (org, chat.id)
+        for org in directory.organizations.values()
+        for chat in directory.get_internal_chats(org.id)[:1]
+    ]
+    root = directory.organizations[0]
+    requests = [
+        (*rng.choice(viewers), rng.randrange(1, ORGANIZATIONS)) for _ in range(RENDERS)
+    ]
+
+    def render_built() -> None:
+        build_org_chats_menu(
+            directory, root, root.admin_chat_id or 0, 0, MessageType.TASK
+        )
+        for org, chat_id, target in requests:
+            build_organizations_menu(directory, org, chat_id, MessageType.TASK)
+            build_org_chats_menu(directory, org, chat_id, target, MessageType.TASK)
+
+    def render_cached() -> None:
+        get_org_chats_menu(
+            directory, root, root.admin_chat_id or 0, 0, MessageType.TASK
+        )
+        for org, chat_id, target in requests:
+            get_organizations_menu(directory, org, chat_id, MessageType.TASK)
+            get_org_chats_menu(directory, org, chat_id, target, MessageType.TASK)
+
+    renders = 1 + 2 * RENDERS
+    built = timeit.timeit(render_built, number=1)
+    render_cached()
+    cached = timeit.timeit(render_cached, number=1)
+
+    print(f"{ORGANIZATIONS} organizations, {CHATS} chats, {renders} menu renders")
+    print(f"Built:   {built / renders * 1e6:8.1f} us/render")
+    print(f"Cached:  {cached / renders * 1e6:8.1f} us/render")
+    print(f"Cache:   {keyboard_cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
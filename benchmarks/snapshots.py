@@ -0,0 +1,74 @@
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from app.db.models.organization import Organization
+from app.db.models.telegram_bot import TelegramBot
+from app.db.snapshots import OrganizationSnapshot
+
+
+COUNT = 10_000
+
+
+def make_organization(i: int) -> Organization:
+    organization = Organization(
+        id=i,
+        title=f"Organization {i}",
+        admin_chat_id=-1000000000000 - i,
+        admin_chat_thread_id=None,
+        is_admins_accept_messages=True,
+        greeting_message=None,
+        is_private=False,
+        is_verified=True,
+        daily_pending_notifications=True,
+        owner=i,
+        created_from_bot_id=i,
+    )
+    organization.bot = TelegramBot(
+        id=i,
+        token=b"token",
+        username=f"bot_{i}",
+        secret=b"secret",
+        owner=i,
+        organization_id=i,
+    )
+
+    return organization
+
+
+def measure_memory(factory: Callable[[], list[Any]]) -> tuple[list[Any], int]:
+    tracemalloc.start()
+    items = factory()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return items, size
+
+
+def main() -> None:
+    organizations, orm_size = measure_memory(
+        lambda: [make_organization(i) for i in range(COUNT)]
+    )
+    snapshots, snapshot_size = measure_memory(
+        lambda: [OrganizationSnapshot.from_model(o) for o in organizations]
+    )
+
+    orm = organizations[0]
+    snapshot = snapshots[0]
+    orm_access = timeit.timeit(
+        lambda: (orm.admin_chat_id, orm.title, orm.bot), number=1_000_000
+    )
+    snapshot_access = timeit.timeit(
+        lambda: (snapshot.admin_chat_id, snapshot.title, snapshot.bot),
+        number=1_000_000,
+    )
+
+    print(f"{COUNT} organizations with bots")
+    print(f"ORM memory:       {orm_size / COUNT:8.0f} B/object")
+    print(f"Snapshot memory:  {snapshot_size / COUNT:8.0f} B/object")
+    print(f"ORM access:       {orm_access * 1000:8.1f} ns/3 attrs")
+    print(f"Snapshot access:  {snapshot_access * 1000:8.1f} ns/3 attrs")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,13 @@ class ThreadCallback(CallbackData, prefix="thread"):
     thread_id: int = 0
 
 
+class PendingCallback(CallbackData, prefix="pending"):
+    action: str
+    thread_id: int = 0
+    section: int = 0
+    id: int = 0
+
+
 class MessageCallback(CallbackData, prefix="msg"):
     action: str
     data: str | None = None
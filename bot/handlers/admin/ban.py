@@ -2,18 +2,19 @@ import html
 from aiogram.types import Message
 from sqlalchemy import select
 
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from app.db.models.user import User
 from app.db.models.banned_user import BannedUser
 from bot.middlewares.ban_middleware import BanController
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.format_user import format_user_info_html
 from bot.utils.message_splitter import TelegramHTMLSplitter
+from bot.utils.user_buffer import user_buffer
 
 
 async def ban_user_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     ban_controller: BanController,
     lazy_db: LazyDbSession,
 ) -> None:
@@ -49,6 +50,7 @@ async def ban_user_handler(
 
     if user_identifier.startswith("@"):
         username = user_identifier[1:]
+        await user_buffer.flush_if_pending(username=username)
         query = select(User).where(User.username == username)
         result = await db.execute(query)
         target_user = result.scalar_one_or_none()
@@ -69,6 +71,7 @@ async def ban_user_handler(
             )
             return
 
+        await user_buffer.flush_if_pending(user_id=user_id)
         query = select(User).where(User.id == user_id)
         result = await db.execute(query)
         target_user = result.scalar_one_or_none()
@@ -107,7 +110,7 @@ async def ban_user_handler(
 
 async def unban_user_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     ban_controller: BanController,
     lazy_db: LazyDbSession,
 ) -> None:
@@ -143,6 +146,7 @@ async def unban_user_handler(
 
     if user_identifier.startswith("@"):
         username = user_identifier[1:]
+        await user_buffer.flush_if_pending(username=username)
         query = select(User).where(User.username == username)
         result = await db.execute(query)
         target_user = result.scalar_one_or_none()
@@ -164,6 +168,7 @@ async def unban_user_handler(
             )
             return
 
+        await user_buffer.flush_if_pending(user_id=target_user_id)
         query = select(User).where(User.id == target_user_id)
         result = await db.execute(query)
         target_user = result.scalar_one_or_none()
@@ -203,7 +208,7 @@ async def unban_user_handler(
 
 async def ban_list_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     if not message.from_user:
@@ -4,14 +4,14 @@ from aiogram.types import Message
 from sqlalchemy import select, delete
 import secrets
 
-from app.core.bot_cache import remove_telegram_bot
+from app.core.invalidation import invalidation_bus
+from app.core.cache import bot_tag
 from app.core.settings import settings
 from app.core.crypto import crypto
 from app.core.enums import CryptoInfo
 from app.core.logger import logger
 from app.db.models.telegram_bot import TelegramBot
 from bot.middlewares.db_session import LazyDbSession
-from bot.middlewares.organization import OrganizationCache
 from bot.root_bot import ROOT_BOT
 from bot.utils.format_user import format_user_info
 from bot.utils.get_organization import get_organization_from_message
@@ -22,7 +22,6 @@ from bot.utils.set_webhook import init_webhook
 async def set_bot_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization_cache: OrganizationCache,
 ) -> None:
     if not message.text or not message.from_user:
         return
@@ -111,7 +110,10 @@ async def set_bot_handler(
 
     await db.commit()
 
-    organization_cache.update(organization)
+    if organization.bot:
+        await invalidation_bus.publish(bot_tag(organization.bot.id))
+
+    await invalidation_bus.publish(bot_tag(bot_id))
 
     try:
         await init_webhook(temp_bot, secret_token)
@@ -145,7 +147,6 @@ async def set_bot_handler(
 async def delete_bot_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization_cache: OrganizationCache,
 ) -> None:
     if not message.from_user:
         return
@@ -192,8 +193,7 @@ async def delete_bot_handler(
     await db.delete(organization.bot)
     await db.commit()
 
-    organization_cache.update(organization)
-    remove_telegram_bot(organization.bot.id)
+    await invalidation_bus.publish(bot_tag(bot_id))
 
     admin_message = (
         f"<b>Бот видалено з організації</b>\n\n"
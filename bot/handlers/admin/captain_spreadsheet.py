@@ -9,14 +9,14 @@ from app.core.logger import logger
 from app.db.models.captain_spreadsheet import CaptainSpreadsheet
 from app.db.models.chat import Chat
 from app.db.models.chat_captain import ChatCaptain
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.captains import update_captains_single_spreadhseet
 
 
 async def set_captains_spreadsheet_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     if not message.text or not message.from_user:
@@ -140,9 +140,12 @@ async def set_captains_spreadsheet_handler(
         existing.sheet_name = sheet_name
         existing.rows_range_min = rows_range_min
         existing.rows_range_max = rows_range_max
+        existing.revision = None
+        existing.content_hash = None
+        spreadsheet = existing
         action = "оновлено"
     else:
-        new_spreadsheet = CaptainSpreadsheet(
+        spreadsheet = CaptainSpreadsheet(
             organization_id=organization.id,
             spreadsheet_id=spreadsheet_id,
             chat_title_column=chat_column,
@@ -151,7 +154,7 @@ async def set_captains_spreadsheet_handler(
             rows_range_min=rows_range_min,
             rows_range_max=rows_range_max,
         )
-        db.add(new_spreadsheet)
+        db.add(spreadsheet)
         action = "встановлено"
 
     await db.commit()
@@ -185,7 +188,7 @@ async def set_captains_spreadsheet_handler(
 
         await update_captains_single_spreadhseet(
             db,
-            new_spreadsheet,
+            spreadsheet,
             organization_captains,
             organization,
         )
@@ -200,7 +203,7 @@ async def set_captains_spreadsheet_handler(
 
 async def delete_captains_spreadsheet_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     if not message.from_user:
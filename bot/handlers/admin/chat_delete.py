@@ -4,7 +4,7 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy import select
 
 from app.db.models.chat import Chat
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.callback import ChatCallback, MainCallback
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.chat_permissions import check_org_admin_chat
@@ -14,7 +14,7 @@ from bot.utils.edit_callback_message import edit_callback_message
 
 async def delete_seleted_chat_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     if not await check_org_admin_chat(message, organization):
@@ -51,7 +51,7 @@ async def delete_seleted_chat_handler(
 async def select_chat_delete_handler(
     callback: CallbackQuery,
     callback_data: ChatCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     db = await lazy_db.get()
@@ -79,7 +79,7 @@ async def select_chat_delete_handler(
 async def confirm_selected_chat_delete_handler(
     callback: CallbackQuery,
     callback_data: ChatCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     if not callback.message:
@@ -1,13 +1,13 @@
 from aiogram.types import Message
 
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.organization import OrganizationCache
 from bot.middlewares.db_session import LazyDbSession
 
 
 async def set_greeting_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     organization_cache: OrganizationCache,
     lazy_db: LazyDbSession,
 ) -> None:
@@ -43,13 +43,9 @@ async def set_greeting_handler(
         return
 
     old_greeintg = organization.greeting_message
-    organization.greeting_message = new_greeting
 
     db = await lazy_db.get()
-    await db.merge(organization)
-    await db.commit()
-
-    organization_cache.update(organization)
+    await organization_cache.save(db, organization, greeting_message=new_greeting)
 
     if old_greeintg:
         await message.answer(
@@ -64,7 +60,7 @@ async def set_greeting_handler(
 
 async def delete_greeting_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     organization_cache: OrganizationCache,
     lazy_db: LazyDbSession,
 ) -> None:
@@ -81,12 +77,7 @@ async def delete_greeting_handler(
         await message.answer("❌ Організація не має власного вітального повідомлення")
         return
 
-    organization.greeting_message = None
-
     db = await lazy_db.get()
-    await db.merge(organization)
-    await db.commit()
-
-    organization_cache.update(organization)
+    await organization_cache.save(db, organization, greeting_message=None)
 
     await message.answer("✅ Власне вітальне повідомлення видалено")
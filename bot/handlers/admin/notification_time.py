@@ -0,0 +1,100 @@
+from datetime import datetime
+from aiogram.types import Message
+
+from app.db.snapshots import OrganizationSnapshot
+from bot.middlewares.organization import OrganizationCache
+from bot.middlewares.db_session import LazyDbSession
+from bot.utils.notification_schedule import format_notification_time, get_timezone
+
+
+async def set_notification_time_handler(
+    message: Message,
+    organization: OrganizationSnapshot,
+    organization_cache: OrganizationCache,
+    lazy_db: LazyDbSession,
+) -> None:
+    if not message.text or not message.from_user:
+        return
+
+    if message.chat.id != organization.admin_chat_id:
+        await message.answer(
+            "❌ Команда доступна для виконання лише з чату адміністраторів організації"
+        )
+        return
+
+    command_parts = message.text.split()
+
+    if len(command_parts) < 2 or len(command_parts) > 3:
+        await message.answer(
+            "❌ Використання: /set_notification_time ГГ:ХХ [часовий пояс]\n"
+            "Наприклад: /set_notification_time 09:30 Europe/Kyiv\n\n"
+            f"Поточний час нагадувань: {format_notification_time(organization)}"
+        )
+        return
+
+    try:
+        notification_time = datetime.strptime(command_parts[1], "%H:%M").time()
+    except ValueError:
+        await message.answer(
+            "❌ Невірний формат часу. Використовуйте ГГ:ХХ, наприклад 09:30"
+        )
+        return
+
+    timezone_name = (
+        command_parts[2]
+        if len(command_parts) == 3
+        else organization.daily_notification_timezone
+    )
+
+    if timezone_name and get_timezone(timezone_name) is None:
+        await message.answer(
+            "❌ Невідомий часовий пояс. Використовуйте назву з бази IANA, "
+            "наприклад Europe/Kyiv"
+        )
+        return
+
+    db = await lazy_db.get()
+    organization = await organization_cache.save(
+        db,
+        organization,
+        daily_notification_time=notification_time,
+        daily_notification_timezone=timezone_name,
+    )
+
+    await message.answer(
+        f"✅ Час щоденних нагадувань: {format_notification_time(organization)}"
+    )
+
+
+async def reset_notification_time_handler(
+    message: Message,
+    organization: OrganizationSnapshot,
+    organization_cache: OrganizationCache,
+    lazy_db: LazyDbSession,
+) -> None:
+    if not message.text or not message.from_user:
+        return
+
+    if message.chat.id != organization.admin_chat_id:
+        await message.answer(
+            "❌ Команда доступна для виконання лише з чату адміністраторів організації"
+        )
+        return
+
+    if organization.daily_notification_time is None:
+        await message.answer(
+            "❌ Організація використовує час нагадувань за замовчуванням"
+        )
+        return
+
+    db = await lazy_db.get()
+    organization = await organization_cache.save(
+        db,
+        organization,
+        daily_notification_time=None,
+        daily_notification_timezone=None,
+    )
+
+    await message.answer(
+        f"✅ Час щоденних нагадувань скинуто: {format_notification_time(organization)}"
+    )
@@ -3,7 +3,7 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from app.core.settings import settings
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.callback import MainCallback, OrganizationCallback
 from bot.middlewares.db_session import LazyDbSession
 from bot.middlewares.organization import OrganizationCache
@@ -11,11 +11,12 @@ from bot.root_bot import ROOT_BOT
 from bot.utils.confirm_action import confirm_action
 from bot.utils.edit_callback_message import edit_callback_message
 from bot.utils.format_user import format_user_info
+from bot.utils.notification_schedule import format_notification_time
 
 
 async def settings_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     if not message.from_user:
         return
@@ -31,7 +32,7 @@ async def settings_handler(
 
 async def show_settings(
     msg_or_callback: Message | CallbackQuery,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     privacy_status = "🔒 Приватна" if organization.is_private else "🌐 Публічна"
     messages_status = (
@@ -49,6 +50,9 @@ async def show_settings(
         f"<b>Щоденні нагадування про запити:</b> {daily_notifications_status}\n"
     )
 
+    if organization.daily_pending_notifications:
+        text += f"<b>Час нагадувань:</b> {format_notification_time(organization)}\n"
+
     kb = InlineKeyboardBuilder()
 
     if organization.is_private:
@@ -122,7 +126,7 @@ async def show_settings(
 async def toggle_privacy_handler(
     callback: CallbackQuery,
     callback_data: OrganizationCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     organization_cache: OrganizationCache,
     lazy_db: LazyDbSession,
 ) -> None:
@@ -131,11 +135,9 @@ async def toggle_privacy_handler(
         return
 
     db = await lazy_db.get()
-    organization.is_private = not organization.is_private
-    await db.merge(organization)
-    await db.commit()
-
-    organization_cache.update(organization)
+    organization = await organization_cache.save(
+        db, organization, is_private=not organization.is_private
+    )
 
     await show_settings(callback, organization)
     await callback.answer()
@@ -144,7 +146,7 @@ async def toggle_privacy_handler(
 async def toggle_messages_handler(
     callback: CallbackQuery,
     callback_data: OrganizationCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     organization_cache: OrganizationCache,
     lazy_db: LazyDbSession,
 ) -> None:
@@ -153,11 +155,11 @@ async def toggle_messages_handler(
         return
 
     db = await lazy_db.get()
-    organization.is_admins_accept_messages = not organization.is_admins_accept_messages
-    await db.merge(organization)
-    await db.commit()
-
-    organization_cache.update(organization)
+    organization = await organization_cache.save(
+        db,
+        organization,
+        is_admins_accept_messages=not organization.is_admins_accept_messages,
+    )
 
     await show_settings(callback, organization)
     await callback.answer()
@@ -166,7 +168,7 @@ async def toggle_messages_handler(
 async def toggle_daily_notifications_handler(
     callback: CallbackQuery,
     callback_data: OrganizationCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     organization_cache: OrganizationCache,
     lazy_db: LazyDbSession,
 ) -> None:
@@ -175,13 +177,11 @@ async def toggle_daily_notifications_handler(
         return
 
     db = await lazy_db.get()
-    organization.daily_pending_notifications = (
-        not organization.daily_pending_notifications
+    organization = await organization_cache.save(
+        db,
+        organization,
+        daily_pending_notifications=not organization.daily_pending_notifications,
     )
-    await db.merge(organization)
-    await db.commit()
-
-    organization_cache.update(organization)
 
     await show_settings(callback, organization)
     await callback.answer()
@@ -190,7 +190,7 @@ async def toggle_daily_notifications_handler(
 async def request_delete_handler(
     callback: CallbackQuery,
     callback_data: OrganizationCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     if callback_data.id != organization.id:
         await callback.answer("❌ Кнопка призначена для іншої організації!")
@@ -211,7 +211,7 @@ async def request_delete_handler(
 async def confirm_delete_handler(
     callback: CallbackQuery,
     callback_data: OrganizationCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     if callback_data.id != organization.id:
         await callback.answer("❌ Кнопка призначена для іншої організації!")
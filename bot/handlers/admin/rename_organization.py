@@ -4,8 +4,11 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
+from app.core.cache import organization_tag
+from app.core.invalidation import invalidation_bus
 from app.core.settings import settings
 from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.organization import OrganizationCache
 from bot.root_bot import ROOT_BOT
 from bot.callback import OrganizationCallback
@@ -17,7 +20,7 @@ from bot.utils.notify_organization import notify_organization
 
 async def rename_organization_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     organization_cache: OrganizationCache,
     lazy_db: LazyDbSession,
 ) -> None:
@@ -52,13 +55,9 @@ async def rename_organization_handler(
 
     if organization.id == 0:
         old_title = organization.title
-        organization.title = new_title
 
         db = await lazy_db.get()
-        await db.merge(organization)
-        await db.commit()
-
-        organization_cache.update(organization)
+        await organization_cache.save(db, organization, title=new_title)
 
         await message.answer(
             f"✅ Організацію перейменовано\n"
@@ -105,7 +104,6 @@ async def rename_organization_handler(
 async def approve_rename_organization(
     callback: CallbackQuery,
     callback_data: OrganizationCallback,
-    organization_cache: OrganizationCache,
     lazy_db: LazyDbSession,
 ) -> None:
     if not isinstance(callback.message, Message) or not callback.message.text:
@@ -140,7 +138,7 @@ async def approve_rename_organization(
     organization.title = new_title
     await db.commit()
 
-    organization_cache.update(organization)
+    await invalidation_bus.publish(organization_tag(organization.id))
 
     await edit_callback_message(
         callback,
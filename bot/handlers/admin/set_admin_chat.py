@@ -6,6 +6,7 @@ from sqlalchemy import exists, select
 from app.core.settings import settings
 from app.core.logger import logger
 from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.db_session import LazyDbSession
 from bot.middlewares.organization import OrganizationCache
 from bot.root_bot import ROOT_BOT
@@ -15,7 +16,7 @@ from bot.utils.set_bot_commands import set_bot_commands_for_admin_chat
 
 async def set_admin_chat_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     organization_cache: OrganizationCache,
     lazy_db: LazyDbSession,
 ) -> None:
@@ -59,13 +60,12 @@ async def set_admin_chat_handler(
         await message.answer("❌ Вже існує організація, яка підв'язана до цього чату")
         return
 
-    organization.admin_chat_id = message.chat.id
-    organization.admin_chat_thread_id = message.message_thread_id
-    db.add(organization)
-
-    await db.commit()
-
-    organization_cache.update(organization)
+    organization = await organization_cache.save(
+        db,
+        organization,
+        admin_chat_id=message.chat.id,
+        admin_chat_thread_id=message.message_thread_id,
+    )
 
     chat_info = f"<b>Chat ID</b>: <code>{organization.admin_chat_id}</code>"
     if message.message_thread_id:
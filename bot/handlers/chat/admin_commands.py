@@ -9,7 +9,7 @@ from sqlalchemy.orm import joinedload
 from app.core.enums import VisibilityLevel
 from app.db.models.chat import Chat
 from app.db.models.chat_thread import ChatThread
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.callback import ChatCallback, ThreadCallback, MainCallback
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.chat_permissions import get_chat_if_admin
@@ -23,7 +23,7 @@ from bot.utils.usernames import extract_usernames, validate_usernames
 
 async def rename_chat_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -81,7 +81,7 @@ async def rename_chat_handler(
 
 async def chat_visibility_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -132,7 +132,7 @@ async def show_visibility_settings(
 async def change_chat_visibility_handler(
     callback: CallbackQuery,
     callback_data: ChatCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -168,7 +168,7 @@ async def change_chat_visibility_handler(
 
 async def set_thread_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -242,7 +242,7 @@ async def set_thread_handler(
 
 async def delete_thread_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -290,7 +290,7 @@ async def delete_thread_handler(
 
 async def rename_thread_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -360,7 +360,7 @@ async def rename_thread_handler(
 
 async def thread_visibility_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -428,7 +428,7 @@ async def show_thread_visibility_settings(
 async def change_thread_visibility_handler(
     callback: CallbackQuery,
     callback_data: ThreadCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     if (
@@ -483,7 +483,7 @@ async def change_thread_visibility_handler(
 
 async def delete_chat_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -517,7 +517,7 @@ async def delete_chat_handler(
 async def confirm_chat_delete_handler(
     callback: CallbackQuery,
     callback_data: ChatCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     if (
@@ -553,7 +553,7 @@ async def confirm_chat_delete_handler(
 async def pin_chat_requests_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     bot: Bot,
 ) -> None:
     if message.chat.type == TelegramChatType.PRIVATE:
@@ -578,7 +578,7 @@ async def pin_chat_requests_handler(
 async def disable_pin_chat_requests_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     bot: Bot,
 ) -> None:
     if message.chat.type == TelegramChatType.PRIVATE:
@@ -603,7 +603,7 @@ async def disable_pin_chat_requests_handler(
 async def pin_thread_requests_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     bot: Bot,
 ) -> None:
     if message.chat.type == TelegramChatType.PRIVATE:
@@ -645,7 +645,7 @@ async def pin_thread_requests_handler(
 async def disable_pin_thread_requests_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     bot: Bot,
 ) -> None:
     if message.chat.type == TelegramChatType.PRIVATE:
@@ -687,7 +687,7 @@ async def disable_pin_thread_requests_handler(
 async def set_chat_tags_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     bot: Bot,
 ) -> None:
     if not message.text:
@@ -747,7 +747,7 @@ async def set_chat_tags_handler(
 async def delete_chat_tags_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     bot: Bot,
 ) -> None:
     if message.chat.type == TelegramChatType.PRIVATE:
@@ -778,7 +778,7 @@ async def delete_chat_tags_handler(
 async def set_thread_tags_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     bot: Bot,
 ) -> None:
     if not message.text:
@@ -855,7 +855,7 @@ async def set_thread_tags_handler(
 async def delete_thread_tags_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     bot: Bot,
 ) -> None:
     if message.chat.type == TelegramChatType.PRIVATE:
@@ -12,7 +12,7 @@ from app.core.logger import logger
 from app.db.models.captain_spreadsheet import CaptainSpreadsheet
 from app.db.models.chat import Chat
 from app.db.models.chat_captain import ChatCaptain
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.callback import MainCallback, SpamCallback
 from bot.handlers.request.message_handler import send_message
 from bot.middlewares.db_session import LazyDbSession
@@ -24,7 +24,7 @@ from bot.utils.message_splitter import TelegramHTMLSplitter
 
 async def spam_groups_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -33,7 +33,7 @@ async def spam_groups_handler(
 
 async def spam_captains_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -42,7 +42,7 @@ async def spam_captains_handler(
 
 async def spam_all_groups_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -51,7 +51,7 @@ async def spam_all_groups_handler(
 
 async def spam_all_captains_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -62,7 +62,7 @@ async def spam_all_captains_handler(
 
 async def handle_spam_command(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     spam_type: SpamType,
     bot: Bot,
@@ -220,7 +220,7 @@ async def handle_spam_command(
 async def confirm_spam_handler(
     callback: CallbackQuery,
     callback_data: SpamCallback,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     if (
@@ -378,7 +378,7 @@ async def confirm_spam_handler(
 
 async def captains_list_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
@@ -448,7 +448,7 @@ async def captains_list_handler(
 
 async def update_captains_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
     bot: Bot,
 ) -> None:
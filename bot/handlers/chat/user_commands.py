@@ -8,16 +8,17 @@ from app.core.enums import ChatType
 from app.db.models.chat import Chat
 from app.db.models.chat_thread import ChatThread
 from app.db.models.chat_user import ChatUser
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.chat_permissions import check_internal_chat
 from bot.utils.get_visibility import get_visibility_emoji
 from bot.utils.message_splitter import TelegramHTMLSplitter
+from bot.utils.user_buffer import user_buffer
 
 
 async def members_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
     if message.chat.type == TelegramChatType.PRIVATE:
@@ -35,6 +36,7 @@ async def members_handler(
     if chat is None or not await check_internal_chat(message, chat):
         return
 
+    await user_buffer.flush()
     result_users = await db.execute(
         select(ChatUser)
         .options(joinedload(ChatUser.user))
@@ -66,11 +68,12 @@ async def members_handler(
 
 async def groups_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
-    db = await lazy_db.get()
+    await user_buffer.flush()
 
+    db = await lazy_db.get()
     result = await db.execute(
         select(Chat)
         .where(Chat.organization_id == organization.id, Chat.type == ChatType.INTERNAL)
@@ -95,11 +98,12 @@ async def groups_handler(
 
 async def group_members_handler(
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     lazy_db: LazyDbSession,
 ) -> None:
-    db = await lazy_db.get()
+    await user_buffer.flush()
 
+    db = await lazy_db.get()
     result = await db.execute(
         select(Chat)
         .where(Chat.organization_id == organization.id, Chat.type == ChatType.INTERNAL)
@@ -143,7 +147,7 @@ async def group_members_handler(
 
 
 async def chat_handler(
-    message: Message, organization: Organization, lazy_db: LazyDbSession
+    message: Message, organization: OrganizationSnapshot, lazy_db: LazyDbSession
 ) -> None:
     db = await lazy_db.get()
 
@@ -3,24 +3,29 @@ from typing import Any
 from aiogram import Bot
 from aiogram.types import Message, ReactionTypeEmoji, User, BufferedInputFile, MessageId
 from aiogram.enums import ChatType as TelegramChatType
-from sqlalchemy import and_, literal, or_, select
+from sqlalchemy import or_, select
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.crypto import crypto
+from app.core.bot_cache import get_bot_credentials
 from app.core.logger import logger
-from app.core.enums import CryptoInfo, MessageType, MessageStatus, ChatType
-from app.db.models.banned_user import BannedUser
+from app.core.enums import MessageType, MessageStatus, ChatType
 from app.db.models.chat import Chat
-from app.db.models.chat_captain import ChatCaptain
-from app.db.models.chat_user import ChatUser
 from app.db.models.message import Message as MessageDB
 from app.db.models.organization import Organization
-from app.db.models.telegram_bot import TelegramBot
+from app.db.snapshots import OrganizationSnapshot
+from bot.middlewares.ban_middleware import BanController
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.format_user import format_user_info_html
-from bot.utils.is_no_status_request import is_no_status_request
+from bot.utils.is_no_status_request import (
+    backfill_request_state,
+    is_no_status_request,
+    record_request_states,
+)
+from bot.utils.requester_context import get_requester_context
+from bot.utils.reply_routing import find_reply_route, remember_sent_message
 from bot.utils.request_statuses import get_request_status_keyboard, get_status_label
+from bot.utils.routing_directory import routing_directory
 
 
 async def resend_message(
@@ -299,6 +304,7 @@ async def send_message(
         else None
     )
     corrected_to_send_thread_id = to_send_thread_id if to_send_thread_id != 1 else None
+    status_messages: list[MessageDB] = []
 
     if message_type in (MessageType.REQUEST, MessageType.TASK):
         if message_type == MessageType.REQUEST:
@@ -352,22 +358,24 @@ async def send_message(
             else:
                 raise
 
-        db.add(
-            MessageDB(
-                user_id=user.id,
-                chat_id=message.chat.id,
-                thread_id=corrected_thread_id,
-                message_id=message.message_id,
-                destination_chat_id=to_send_chat_id,
-                destination_thread_id=to_send_thread_id,
-                destination_message_id=service_msg.message_id,
-                is_within_organization=is_within_organization,
-                type=MessageType.SERVICE,
-                status=status,
-                is_status_reference=is_status_reference,
-                text=service_text,
-            )
+        service_message = MessageDB(
+            user_id=user.id,
+            chat_id=message.chat.id,
+            thread_id=corrected_thread_id,
+            message_id=message.message_id,
+            destination_chat_id=to_send_chat_id,
+            destination_thread_id=to_send_thread_id,
+            destination_message_id=service_msg.message_id,
+            is_within_organization=is_within_organization,
+            type=MessageType.SERVICE,
+            status=status,
+            is_status_reference=is_status_reference,
+            text=service_text,
         )
+        db.add(service_message)
+
+        if status is not None:
+            status_messages.append(service_message)
 
         if message_type == MessageType.TASK:
             if is_no_status_request:
@@ -385,22 +393,22 @@ async def send_message(
             )
 
             if not is_no_status_request:
-                db.add(
-                    MessageDB(
-                        user_id=user.id,
-                        chat_id=to_send_chat_id,
-                        thread_id=to_send_thread_id,
-                        message_id=service_msg.message_id,
-                        destination_chat_id=message.chat.id,
-                        destination_thread_id=corrected_thread_id,
-                        destination_message_id=feedback_message.message_id,
-                        is_within_organization=is_within_organization,
-                        type=MessageType.SERVICE,
-                        status=MessageStatus.NEW,
-                        is_status_reference=True,
-                        text=text,
-                    )
+                feedback_service_message = MessageDB(
+                    user_id=user.id,
+                    chat_id=to_send_chat_id,
+                    thread_id=to_send_thread_id,
+                    message_id=service_msg.message_id,
+                    destination_chat_id=message.chat.id,
+                    destination_thread_id=corrected_thread_id,
+                    destination_message_id=feedback_message.message_id,
+                    is_within_organization=is_within_organization,
+                    type=MessageType.SERVICE,
+                    status=MessageStatus.NEW,
+                    is_status_reference=True,
+                    text=text,
                 )
+                db.add(feedback_service_message)
+                status_messages.append(feedback_service_message)
         elif feedback_send_destination:
             await message.answer(
                 f"Надіслано {feedback_send_destination}", parse_mode="HTML"
@@ -581,59 +589,31 @@ async def send_message(
         bot=bot,
     )
 
-    db.add(
-        MessageDB(
-            user_id=user.id,
-            chat_id=message.chat.id,
-            thread_id=corrected_thread_id,
-            message_id=message.message_id,
-            destination_chat_id=to_send_chat_id,
-            destination_thread_id=to_send_thread_id,
-            destination_message_id=sent_msg_id,
-            is_within_organization=is_within_organization,
-            type=message_type,
-            text=message.text or message.caption,
-        )
+    sent_message = MessageDB(
+        user_id=user.id,
+        chat_id=message.chat.id,
+        thread_id=corrected_thread_id,
+        message_id=message.message_id,
+        destination_chat_id=to_send_chat_id,
+        destination_thread_id=to_send_thread_id,
+        destination_message_id=sent_msg_id,
+        is_within_organization=is_within_organization,
+        type=message_type,
+        text=message.text or message.caption,
     )
+    db.add(sent_message)
+
+    if status_messages:
+        await record_request_states(db, status_messages)
+    elif is_no_status_request:
+        await backfill_request_state(db, message.chat.id, to_send_chat_id)
 
     await db.commit()
+    remember_sent_message(sent_message)
 
     return sent_msg_id
 
 
-async def get_captain_or_chat_info(db: AsyncSession, user_id: int) -> str | None:
-    captain_query = select(
-        literal(1).label("p"),
-        ChatCaptain.chat_title.label("r"),
-    ).where(ChatCaptain.connected_user_id == user_id)
-
-    external_chat_query = (
-        select(
-            literal(2).label("p"),
-            Chat.title.label("r"),
-        )
-        .join(ChatUser, ChatUser.chat_id == Chat.id)
-        .where(
-            ChatUser.user_id == user_id,
-            Chat.type == ChatType.EXTERNAL,
-        )
-    )
-
-    union_q = captain_query.union_all(external_chat_query).subquery()
-    stmt = select(union_q.c.p, union_q.c.r).order_by(union_q.c.p).limit(1)
-    result_db = await db.execute(stmt)
-    result: tuple[int, str] | None = result_db.tuples().one_or_none()
-
-    if result is None:
-        return None
-
-    priority, value = result
-    if priority == 1:
-        return f"Староста {html.escape(value)}"
-
-    return f"Студент {html.escape(value)}"
-
-
 async def put_reaction(message: Message) -> None:
     try:
         await message.react([ReactionTypeEmoji(emoji="❤")])
@@ -643,36 +623,21 @@ async def put_reaction(message: Message) -> None:
 
 
 async def process_reply_request(
-    db: AsyncSession, message: Message, organization: Organization
+    db: AsyncSession,
+    message: Message,
+    organization: OrganizationSnapshot,
+    ban_controller: BanController,
 ) -> bool:
     if not message.from_user or not message.bot or not message.reply_to_message:
         return False
 
-    stmt = (
-        select(MessageDB)
-        .where(
-            or_(
-                and_(
-                    MessageDB.destination_chat_id == message.chat.id,
-                    MessageDB.destination_message_id
-                    == message.reply_to_message.message_id,
-                ),
-                and_(
-                    MessageDB.chat_id == message.chat.id,
-                    MessageDB.message_id == message.reply_to_message.message_id,
-                    MessageDB.user_id == message.from_user.id,
-                    MessageDB.type != MessageType.SPAM,
-                ),
-            ),
-            MessageDB.type != MessageType.SERVICE,
-        )
-        .order_by(MessageDB.id)
-        .limit(1)
+    request_msg = await find_reply_route(
+        db,
+        message.chat.id,
+        message.reply_to_message.message_id,
+        message.from_user.id,
     )
 
-    result = await db.execute(stmt)
-    request_msg = result.scalar_one_or_none()
-
     if request_msg is None:
         return False
 
@@ -693,43 +658,25 @@ async def process_reply_request(
             if request_msg.chat_id == message.chat.id
             else request_msg.chat_id
         )
-        banned_exists = (
-            select(1)
-            .select_from(BannedUser)
-            .where(
-                BannedUser.organization_id == Organization.id,
-                BannedUser.user_id == message.from_user.id,
-            )
-            .exists()
-        )
-        query = (
-            select(
-                TelegramBot.id,
-                TelegramBot.token,
-                banned_exists.label("is_banned"),
-            )
-            .join(Organization)
-            .outerjoin(Chat)
-            .where(or_(Chat.id == where_chat, Organization.admin_chat_id == where_chat))
-            .limit(1)
+        directory = await routing_directory.get()
+        bot_organization = directory.organization_for_chat(where_chat)
+        credentials = (
+            await get_bot_credentials(bot_organization.bot.id, db)
+            if bot_organization and bot_organization.bot
+            else None
         )
-        bot_result_db = await db.execute(query)
-        bot_result = bot_result_db.tuples().one_or_none()
 
-        if bot_result is None:
+        if credentials is None:
             await message.reply(
                 "❌ Не вдалось знайти бота або чат через якого було надіслано повідомлення"
             )
             return True
 
-        bot_id, bot_token_encrypted, is_banned = bot_result
-        if is_banned:
+        if ban_controller.is_banned(message.from_user.id, credentials.organization_id):
             await message.reply("❌ Вас було заблоковано")
             return True
 
-        token_stripped = crypto.decrypt_data(bot_token_encrypted, CryptoInfo.BOT_TOKEN)
-        token = f"{bot_id}:{token_stripped}"
-        bot = Bot(token)
+        bot = Bot(credentials.token)
 
     service_message: MessageDB | None = None
 
@@ -839,7 +786,7 @@ async def process_reply_request(
 
     additional_info: str | None = None
     if message.chat.type == TelegramChatType.PRIVATE:
-        additional_info = await get_captain_or_chat_info(db, message.from_user.id)
+        additional_info = await get_requester_context(db, message.from_user.id)
 
     try:
         try:
@@ -899,12 +846,12 @@ async def process_reply_request(
 
 
 async def send_admin_request(
-    db: AsyncSession, message: Message, organization: Organization
+    db: AsyncSession, message: Message, organization: OrganizationSnapshot
 ) -> None:
     if not message.from_user or not message.bot or not organization.admin_chat_id:
         return
 
-    additional_info = await get_captain_or_chat_info(db, message.from_user.id)
+    additional_info = await get_requester_context(db, message.from_user.id)
     is_no_status = await is_no_status_request(db, message, organization.admin_chat_id)
 
     await send_message(
@@ -923,14 +870,15 @@ async def send_admin_request(
 async def message_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
+    ban_controller: BanController,
 ) -> None:
     if not message.from_user or not message.bot:
         return
 
     if message.reply_to_message:
         db = await lazy_db.get()
-        if await process_reply_request(db, message, organization):
+        if await process_reply_request(db, message, organization, ban_controller):
             return
 
     if message.chat.type == TelegramChatType.PRIVATE:
@@ -1,19 +1,44 @@
-from collections import defaultdict
+import asyncio
+import time
 from datetime import timezone
+from itertools import groupby
+from operator import itemgetter
+from typing import AsyncIterator, Collection
 from aiogram.enums import ChatType
-from aiogram.types import Message
-from sqlalchemy import or_, select
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logger import logger
-from app.core.enums import MessageType, MessageStatus
-from app.db.models.message import Message as MessageDB
+from app.core.settings import settings
+from app.core.enums import MessageStatus
 from app.db.models.organization import Organization
+from app.db.session import async_session
+from app.db.snapshots import OrganizationSnapshot
+from bot.callback import PendingCallback
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.format_message_url import format_message_url
 from bot.utils.get_bot import get_organization_bot
 from bot.utils.message_splitter import TelegramHTMLSplitter
+from bot.utils.pending_requests import (
+    PendingCounts,
+    PendingPage,
+    PendingRow,
+    PendingScope,
+    PendingSection,
+    count_open_requests,
+    count_open_requests_by_thread,
+    fetch_pending_page,
+    scope_total,
+    select_open_requests,
+)
 
 
 INCOMING_SECTIONS = [
@@ -38,117 +63,243 @@ OUTGOING_SECTIONS = [
     ),
 ]
 
+PENDING_SECTIONS = INCOMING_SECTIONS + OUTGOING_SECTIONS
 
-async def render_section(
-    splitter: TelegramHTMLSplitter,
-    header: str,
-    messages: list[MessageDB],
-    *,
-    newline_before: bool = False,
-) -> None:
-    if not messages:
-        return
+DAILY_SEND_ATTEMPTS = 3
 
-    if newline_before:
-        await splitter.add("\n")
 
-    await splitter.add(f"{header}\n")
+def format_pending_summary(counts: PendingCounts) -> str:
+    incoming = sum(
+        count for (_, is_outgoing), count in counts.items() if not is_outgoing
+    )
+    outgoing = sum(count for (_, is_outgoing), count in counts.items() if is_outgoing)
 
-    for idx, msg in enumerate(messages, 1):
-        url = format_message_url(
-            msg.destination_chat_id,
-            msg.destination_thread_id,
-            msg.destination_message_id,
-        )
-        date_utc = msg.created_at.astimezone(timezone.utc).strftime("%d.%m")
+    return f"📊 Вхідних: {incoming}, вихідних: {outgoing}"
 
-        await splitter.add(f"{idx}) {url} {date_utc}\n")
 
+def pending_title(thread_id: int | None) -> str:
+    return "<b>Запити гілки</b>" if thread_id else "<b>Запити чату</b>"
 
-async def show_pending(
-    db: AsyncSession,
-    message: Message,
-    message_thread_id: int | None,
-    title: str,
-) -> None:
-    conditions = [
-        MessageDB.destination_chat_id == message.chat.id,
-        MessageDB.type == MessageType.SERVICE,
-        MessageDB.status.in_([MessageStatus.IN_PROCESS, MessageStatus.NEW]),
-    ]
 
-    if message_thread_id:
-        if message_thread_id == 1:
-            conditions.append(
-                or_(
-                    MessageDB.destination_thread_id == 1,
-                    MessageDB.destination_thread_id.is_(None),
-                ),
-            )
-        else:
-            conditions.append(
-                MessageDB.destination_thread_id == message_thread_id,
-            )
+def pending_scope(chat_id: int, thread_id: int | None) -> PendingScope:
+    return PendingScope(chat_id, thread_id, include_unthreaded=thread_id == 1)
 
-    stmt = select(MessageDB).where(*conditions).order_by(MessageDB.id)
 
-    result = await db.execute(stmt)
-    msgs = result.scalars().all()
+async def render_section(
+    splitter: TelegramHTMLSplitter,
+    lead: str,
+    rows: AsyncIterator[PendingRow],
+) -> bool:
+    idx = 0
 
-    groups: dict[tuple[MessageStatus | None, bool | None], list[MessageDB]] = (
-        defaultdict(list)
-    )
+    async for _, destination_chat_id, thread_id, message_id, created_at in rows:
+        if not idx:
+            await splitter.add(lead)
 
-    for msg in msgs:
-        groups[(msg.status, msg.is_status_reference)].append(msg)
+        idx += 1
+        url = format_message_url(destination_chat_id, thread_id, message_id)
+        date_utc = created_at.astimezone(timezone.utc).strftime("%d.%m")
 
-    splitter = TelegramHTMLSplitter(send_func=message.answer)
+        await splitter.add(f"{idx}) {url} {date_utc}\n")
 
-    await splitter.add(f"{title}\n\n")
+    return idx > 0
 
-    incoming_has_messages = False
-    for i, (key, header) in enumerate(INCOMING_SECTIONS):
-        msgs_list = groups.get(key)
-        if not msgs_list:
-            continue
-
-        await render_section(
-            splitter,
-            header,
-            msgs_list,
-            newline_before=incoming_has_messages and i != 0,
+
+async def render_pending(
+    db: AsyncSession, splitter: TelegramHTMLSplitter, scope: PendingScope
+) -> None:
+    async def stream_section(key: PendingSection) -> AsyncIterator[PendingRow]:
+        status, is_outgoing = key
+        stmt = select_open_requests(
+            scope.destination_chat_id,
+            scope.destination_thread_id,
+            include_unthreaded=scope.include_unthreaded,
+            status=status,
+            is_outgoing=is_outgoing,
+        )
+        result = await db.stream(
+            stmt.execution_options(yield_per=settings.PENDING_STREAM_BATCH_SIZE)
         )
-        incoming_has_messages = True
+
+        async for row in result:
+            yield row
+
+    incoming_has_messages = False
+    for key, header in INCOMING_SECTIONS:
+        lead = f"\n{header}\n" if incoming_has_messages else f"{header}\n"
+        if await render_section(splitter, lead, stream_section(key)):
+            incoming_has_messages = True
 
     if incoming_has_messages:
         await splitter.add("\n")
-    else:
-        await splitter.add("✅ Вхідні запити оброблено!\n")
 
     outgoing_has_messages = False
     for key, header in OUTGOING_SECTIONS:
-        msgs_list = groups.get(key)
-        if not msgs_list:
-            continue
-
+        lead = f"\n{header}\n"
         if not outgoing_has_messages:
+            lead = "<b>--- Вихідні запити ---</b>\n" + lead
             if not incoming_has_messages:
-                await splitter.add("\n")
+                lead = "\n" + lead
+
+        if await render_section(splitter, lead, stream_section(key)):
+            outgoing_has_messages = True
+
+
+def render_pending_page(title: str, counts: PendingCounts, page: PendingPage) -> str:
+    first_section = page.rows[0][0] if page.rows else None
+
+    def render_rows(section: int, rows: list[tuple[int, PendingRow]]) -> str:
+        start = page.first_number if section == first_section else 1
+        lines = []
+
+        for idx, (_, row) in enumerate(rows, start):
+            url = format_message_url(
+                row.destination_chat_id,
+                row.destination_thread_id,
+                row.destination_message_id,
+            )
+            date_utc = row.created_at.astimezone(timezone.utc).strftime("%d.%m")
+            lines.append(f"{idx}) {url} {date_utc}\n")
+
+        return "".join(lines)
+
+    incoming: list[str] = []
+    outgoing: list[str] = []
+
+    for section, group in groupby(page.rows, key=itemgetter(0)):
+        (_, is_outgoing), header = PENDING_SECTIONS[section]
+        block = f"{header}\n{render_rows(section, list(group))}"
+        (outgoing if is_outgoing else incoming).append(block)
+
+    text = f"{title}\n{format_pending_summary(counts)}\n\n"
+    is_incoming_processed = not any(not is_outgoing for _, is_outgoing in counts)
+
+    if incoming:
+        text += "\n".join(incoming) + "\n"
+    elif is_incoming_processed:
+        text += "✅ Вхідні запити оброблено!\n"
+
+    if outgoing:
+        if is_incoming_processed:
+            text += "\n"
+
+        text += "<b>--- Вихідні запити ---</b>\n"
+        text += "".join(f"\n{block}" for block in outgoing)
+    elif not any(is_outgoing for _, is_outgoing in counts):
+        text += "✅ Вихідні запити оброблено!"
+
+    return text
+
+
+def get_pending_keyboard(
+    page: PendingPage, thread_id: int | None
+) -> InlineKeyboardMarkup | None:
+    buttons = []
+
+    if page.has_prev:
+        first_section, first_row = page.rows[0]
+        buttons.append(
+            InlineKeyboardButton(
+                text="⬅️",
+                callback_data=PendingCallback(
+                    action="prev",
+                    thread_id=thread_id or 0,
+                    section=first_section,
+                    id=first_row.id,
+                ).pack(),
+            )
+        )
+
+    if page.has_next:
+        last_section, last_row = page.rows[-1]
+        buttons.append(
+            InlineKeyboardButton(
+                text="➡️",
+                callback_data=PendingCallback(
+                    action="next",
+                    thread_id=thread_id or 0,
+                    section=last_section,
+                    id=last_row.id,
+                ).pack(),
+            )
+        )
+
+    if not buttons:
+        return None
 
-            await splitter.add("<b>--- Вихідні запити ---</b>\n")
+    return InlineKeyboardMarkup(inline_keyboard=[buttons])
 
-        await render_section(
-            splitter,
-            header,
-            msgs_list,
-            newline_before=True,
+
+async def build_pending_view(
+    db: AsyncSession,
+    chat_id: int,
+    thread_id: int | None,
+    section: int = 0,
+    bound_id: int | None = None,
+    forward: bool = True,
+) -> tuple[str, InlineKeyboardMarkup | None]:
+    title = pending_title(thread_id)
+    scope = pending_scope(chat_id, thread_id)
+    counts = await count_open_requests(
+        db,
+        scope.destination_chat_id,
+        scope.destination_thread_id,
+        include_unthreaded=scope.include_unthreaded,
+    )
+
+    if not counts:
+        return (
+            f"{title}\n\n✅ Вхідні запити оброблено!\n✅ Вихідні запити оброблено!",
+            None,
         )
-        outgoing_has_messages = True
 
-    if not outgoing_has_messages:
-        await splitter.add("✅ Вихідні запити оброблено!")
+    page = await fetch_pending_page(
+        db,
+        scope,
+        [key for key, _ in PENDING_SECTIONS],
+        section,
+        bound_id,
+        forward,
+    )
+
+    return render_pending_page(title, counts, page), get_pending_keyboard(
+        page, thread_id
+    )
+
+
+async def show_pending(
+    db: AsyncSession, message: Message, message_thread_id: int | None
+) -> None:
+    text, keyboard = await build_pending_view(db, message.chat.id, message_thread_id)
+    await message.answer(text, parse_mode="HTML", reply_markup=keyboard)
+
+
+async def pending_page_handler(
+    callback: CallbackQuery,
+    callback_data: PendingCallback,
+    lazy_db: LazyDbSession,
+) -> None:
+    if not callback.message or not isinstance(callback.message, Message):
+        return
+
+    db = await lazy_db.get()
+    text, keyboard = await build_pending_view(
+        db,
+        callback.message.chat.id,
+        callback_data.thread_id or None,
+        callback_data.section,
+        callback_data.id,
+        callback_data.action == "next",
+    )
+
+    try:
+        await callback.message.edit_text(text, parse_mode="HTML", reply_markup=keyboard)
+    except TelegramBadRequest as e:
+        # Navigating to an unchanged page is not an error for the user
+        if "message is not modified" not in str(e):
+            raise
 
-    await splitter.flush()
+    await callback.answer()
 
 
 async def pending_handler(
@@ -171,9 +322,7 @@ async def pending_handler(
     if message.chat.is_forum and thread_id is None:
         thread_id = 1
 
-    title = "<b>Запити гілки</b>" if thread_id else "<b>Запити чату</b>"
-
-    await show_pending(db, message, thread_id, title)
+    await show_pending(db, message, thread_id)
 
 
 async def pending_chat_handler(
@@ -192,98 +341,53 @@ async def pending_chat_handler(
 
     db = await lazy_db.get()
 
-    await show_pending(db, message, None, "<b>Запити чату</b>")
+    await show_pending(db, message, None)
 
 
-async def send_daily_pending_notification(
-    db: AsyncSession, organization: Organization
-) -> None:
-    if not organization.admin_chat_id or not organization.bot:
-        return
+def daily_pending_scope(organization: OrganizationSnapshot) -> PendingScope:
+    if not organization.admin_chat_id:
+        raise ValueError("Organization without admin chat")
 
-    conditions = [
-        MessageDB.destination_chat_id == organization.admin_chat_id,
-        MessageDB.type == MessageType.SERVICE,
-        MessageDB.status.in_([MessageStatus.IN_PROCESS, MessageStatus.NEW]),
-    ]
-
-    if organization.admin_chat_thread_id:
-        conditions.append(
-            or_(
-                MessageDB.destination_thread_id == organization.admin_chat_thread_id,
-                MessageDB.destination_thread_id.is_(None),
-            )
-        )
-
-    stmt = select(MessageDB).where(*conditions).order_by(MessageDB.id)
+    return PendingScope(
+        organization.admin_chat_id,
+        organization.admin_chat_thread_id,
+        include_unthreaded=True,
+    )
 
-    result = await db.execute(stmt)
-    msgs = result.scalars().all()
 
-    if not msgs:
+async def send_daily_pending_notification(organization: OrganizationSnapshot) -> None:
+    if not organization.admin_chat_id or not organization.bot:
         return
 
-    groups: dict[tuple[MessageStatus | None, bool | None], list[MessageDB]] = (
-        defaultdict(list)
-    )
-
-    for msg in msgs:
-        groups[(msg.status, msg.is_status_reference)].append(msg)
-
+    admin_chat_id = organization.admin_chat_id
     bot = get_organization_bot(organization)
 
     async def send_func(text: str, parse_mode: str | None = None) -> None:
-        if organization.admin_chat_id:
-            await bot.send_message(
-                organization.admin_chat_id,
-                text,
-                message_thread_id=organization.admin_chat_thread_id,
-                parse_mode=parse_mode,
-            )
+        for attempt in range(DAILY_SEND_ATTEMPTS):
+            try:
+                await bot.send_message(
+                    admin_chat_id,
+                    text,
+                    message_thread_id=organization.admin_chat_thread_id,
+                    parse_mode=parse_mode,
+                )
+                return
+            except TelegramRetryAfter as e:
+                # Long reports can outrun the per-chat limit of the group
+                if attempt == DAILY_SEND_ATTEMPTS - 1:
+                    raise
+
+                await asyncio.sleep(e.retry_after)
 
     try:
-        splitter = TelegramHTMLSplitter(send_func=send_func)
-
-        await splitter.add("📅 <b>Щоденне нагадування про необроблені запити</b>\n\n")
+        async with async_session() as db:
+            splitter = TelegramHTMLSplitter(send_func=send_func)
 
-        incoming_has_messages = False
-        for i, (key, header) in enumerate(INCOMING_SECTIONS):
-            msgs_list = groups.get(key)
-            if not msgs_list:
-                continue
-
-            await render_section(
-                splitter,
-                header,
-                msgs_list,
-                newline_before=incoming_has_messages and i != 0,
+            await splitter.add(
+                "📅 <b>Щоденне нагадування про необроблені запити</b>\n\n"
             )
-            incoming_has_messages = True
-
-        if incoming_has_messages:
-            await splitter.add("\n")
-
-        outgoing_has_messages = False
-        for key, header in OUTGOING_SECTIONS:
-            msgs_list = groups.get(key)
-            if not msgs_list:
-                continue
-
-            if not outgoing_has_messages:
-                if not incoming_has_messages:
-                    await splitter.add("\n")
-
-                await splitter.add("<b>--- Вихідні запити ---</b>\n")
-
-            await render_section(
-                splitter,
-                header,
-                msgs_list,
-                newline_before=True,
-            )
-            outgoing_has_messages = True
-
-        await splitter.flush()
+            await render_pending(db, splitter, daily_pending_scope(organization))
+            await splitter.flush()
     except Exception as e:
         logger.error(
             f"Failed to send daily pending notification for org {organization.id}: {e}"
@@ -292,7 +396,9 @@ async def send_daily_pending_notification(
         await bot.session.close()
 
 
-async def send_all_daily_pending_notifications(db: AsyncSession) -> None:
+async def load_daily_notification_organizations(
+    db: AsyncSession, organization_ids: Collection[int] | None = None
+) -> list[OrganizationSnapshot]:
     stmt = (
         select(Organization)
         .options(joinedload(Organization.bot))
@@ -303,17 +409,63 @@ async def send_all_daily_pending_notifications(db: AsyncSession) -> None:
         )
     )
 
+    if organization_ids is not None:
+        stmt = stmt.where(Organization.id.in_(organization_ids))
+
     result = await db.execute(stmt)
-    organizations = result.scalars().all()
+
+    return [
+        OrganizationSnapshot.from_model(organization)
+        for organization in result.scalars().all()
+    ]
+
+
+async def send_daily_pending_notifications(
+    db: AsyncSession, organizations: list[OrganizationSnapshot]
+) -> None:
+    # One grouped counter query decides which admin chats have anything open
+    totals = await count_open_requests_by_thread(
+        db, {org.admin_chat_id for org in organizations if org.admin_chat_id}
+    )
+    pending_organizations = [
+        org
+        for org in organizations
+        if org.admin_chat_id
+        and scope_total(totals.get(org.admin_chat_id, {}), daily_pending_scope(org))
+    ]
 
     logger.info(
-        f"Sending daily pending notifications to {len(organizations)} organizations"
+        f"Sending daily pending notifications to {len(pending_organizations)} "
+        f"of {len(organizations)} organizations"
     )
 
-    for organization in organizations:
-        try:
-            await send_daily_pending_notification(db, organization)
-        except Exception as e:
-            logger.error(
-                f"Error sending daily notification for org {organization.id}: {e}"
-            )
+    semaphore = asyncio.Semaphore(settings.DAILY_NOTIFICATION_WORKERS)
+    timings: list[tuple[float, int]] = []
+
+    async def notify(organization: OrganizationSnapshot) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+
+            try:
+                await send_daily_pending_notification(organization)
+            except Exception as e:
+                logger.error(
+                    f"Error sending daily notification for org {organization.id}: {e}"
+                )
+
+            elapsed = time.perf_counter() - started
+            timings.append((elapsed, organization.id))
+
+            if elapsed >= settings.DAILY_NOTIFICATION_SLOW_SECONDS:
+                logger.warning(
+                    f"Daily notification for org {organization.id} took {elapsed:.2f}s"
+                )
+
+    await asyncio.gather(*(notify(org) for org in pending_organizations))
+
+    if timings:
+        slowest = ", ".join(
+            f"{org_id}: {elapsed:.2f}s"
+            for elapsed, org_id in sorted(timings, reverse=True)[:5]
+        )
+        logger.info(f"Daily notifications sent, slowest organizations: {slowest}")
@@ -2,23 +2,25 @@ import html
 from aiogram import Bot
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
 from aiogram.enums import ChatType as TelegramChatType
-from aiogram.utils.keyboard import InlineKeyboardBuilder
-from sqlalchemy import exists, select
-from sqlalchemy.orm import joinedload, selectinload
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logger import logger
-from app.core.enums import ChatType, MessageType, VisibilityLevel
-from app.db.models.chat import Chat
-from app.db.models.chat_thread import ChatThread
-from app.db.models.organization import Organization
-from bot.callback import MainCallback, MessageCallback
+from app.core.enums import ChatType, MessageType
+from app.db.snapshots import OrganizationSnapshot
+from bot.callback import MessageCallback
 from bot.handlers.request.message_handler import put_reaction, send_message
 from bot.middlewares.ban_middleware import BanController
 from bot.middlewares.db_session import LazyDbSession
+from bot.middlewares.idempotency import CallbackIdempotencyStore
 from bot.utils.edit_callback_message import edit_callback_message
 from bot.utils.get_bot import get_organization_bot
 from bot.utils.is_no_status_request import is_no_status_request
+from bot.utils.routing_directory import RoutingDirectory, routing_directory
+from bot.utils.send_menus import (
+    get_org_chats_menu,
+    get_organizations_menu,
+    get_threads_menu,
+)
+from bot.utils.visibility_resolver import get_reachability
 
 
 async def change_callback_or_message(
@@ -41,46 +43,11 @@ async def change_callback_or_message(
     )
 
 
-async def show_available_root_admin_org_chats(
-    db: AsyncSession, tg_object: Message | CallbackQuery, type: MessageType
-) -> None:
-    orgs_admin_stmt = select(Organization).where(
-        Organization.id != 0,
-        Organization.is_verified.is_(True),
-    )
-    orgs_admin_stmt_result = await db.execute(orgs_admin_stmt)
-    orgs_admin = orgs_admin_stmt_result.scalars().all()
-
-    if not orgs_admin:
-        await change_callback_or_message(
-            tg_object, "❌ Верифіковані організації відсутні"
-        )
-        return
-
-    kb = InlineKeyboardBuilder()
-    for org in orgs_admin:
-        kb.button(
-            text=org.title,
-            callback_data=MessageCallback(
-                action="select_org",
-                data=str(org.id),
-                type=type,
-            ),
-        )
-
-    kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
-    kb.adjust(1)
-
-    await change_callback_or_message(
-        tg_object, "Оберіть організацію:", reply_markup=kb.as_markup()
-    )
-
-
 async def show_available_org_chats(
-    db: AsyncSession,
+    directory: RoutingDirectory,
     tg_object: Message | CallbackQuery,
     organization_id: int,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     default_type: MessageType | None = None,
 ) -> None:
     current_type = default_type
@@ -100,315 +67,29 @@ async def show_available_org_chats(
     if current_type is None:
         raise ValueError("Current message type not set")
 
-    available_chats: list[Chat] = []
-
-    if organization.id == 0:
-        if organization.admin_chat_id != message.chat.id:
-            await change_callback_or_message(
-                tg_object, "❌ Не вдалось ідентифікувати ваш чат"
-            )
-            return
-
-        if organization_id == 0:
-            await show_available_root_admin_org_chats(db, tg_object, current_type)
-            return
-    else:
-        chats_stmt = select(Chat).where(
-            Chat.organization_id == organization_id,
-            Chat.type == ChatType.INTERNAL,
-        )
-        chats_result = await db.execute(chats_stmt)
-        chats = chats_result.scalars().all()
-
-        if (
-            organization.id == organization_id
-            and organization.admin_chat_id == message.chat.id
-        ):
-            available_chats = list(chats)
-        else:
-            current_chat: Chat | None = None
-            for chat in chats:
-                if chat.id == message.chat.id:
-                    current_chat = chat
-                elif (chat.visibility_level == VisibilityLevel.PUBLIC) or (
-                    organization.id == organization_id
-                    and chat.visibility_level == VisibilityLevel.INTERNAL
-                ):
-                    available_chats.append(chat)
-
-            if (
-                organization.id == organization_id
-                and not current_chat
-                and not organization.admin_chat_id == message.chat.id
-            ):
-                await change_callback_or_message(
-                    tg_object, "❌ Не вдалось ідентифікувати ваш чат"
-                )
-                return
-
-    if organization.id == 0:
-        admin_chat_stmt = select(Organization.title, Organization.admin_chat_id).where(
-            Organization.id == organization_id
-        )
-        admin_chat_result = await db.execute(admin_chat_stmt)
-        admin_chat = admin_chat_result.tuples().one_or_none()
-
-        if admin_chat is None:
-            await change_callback_or_message(tg_object, "❌ Організація не існує")
-            return
-
-        kb = InlineKeyboardBuilder()
-
-        if admin_chat[1] is not None:
-            kb.button(
-                text=f"Адміністратори {admin_chat[0]}",
-                callback_data=MessageCallback(
-                    action="select_admin_chat",
-                    data=str(organization_id),
-                    type=current_type,
-                ),
-            )
-
-        org_chats_stmt = select(Chat.id, Chat.title).where(
-            Chat.organization_id == organization_id,
-            Chat.type == ChatType.INTERNAL,
-        )
-        org_chats_result = await db.execute(org_chats_stmt)
-        org_chats = org_chats_result.tuples().all()
-
-        for chat_id, chat_title in org_chats:
-            kb.button(
-                text=chat_title,
-                callback_data=MessageCallback(
-                    action="select_chat",
-                    data=str(chat_id),
-                    type=current_type,
-                ),
-            )
-
-        kb.button(
-            text="⬅️ Назад",
-            callback_data=MessageCallback(
-                action="select_org",
-                type=current_type,
-            ),
-        )
-        kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
-        kb.adjust(1)
-
-        await change_callback_or_message(
-            tg_object, "Оберіть чат:", reply_markup=kb.as_markup()
-        )
-
-        return
-
-    public_chat_exists_stmt = (
-        select(Chat.id)
-        .where(
-            Chat.organization_id == Organization.id,
-            Chat.type == ChatType.INTERNAL,
-            Chat.visibility_level == VisibilityLevel.PUBLIC,
-        )
-        .exists()
-    )
-
-    orgs_stmt = select(
-        Organization, public_chat_exists_stmt.label("public_chat_exists")
-    ).where(
-        Organization.id != organization.id,
-        Organization.is_verified.is_(True),
-        Organization.is_private.is_(False),
-    )
-    orgs_result = await db.execute(orgs_stmt)
-    organizations = orgs_result.tuples().all()
-
-    is_organizations_available = False
-    for org, chat_exists in organizations:
-        if (org.is_admins_accept_messages and org.admin_chat_id) or chat_exists:
-            is_organizations_available = True
-            break
-
-    kb = InlineKeyboardBuilder()
-    is_admin_button = False
-
-    if (
-        organization.id != organization_id
-        or organization.admin_chat_id != message.chat.id
-    ):
-        current_org: Organization | None = None
-
-        if organization.id == organization_id:
-            current_org = organization
-        else:
-            for org, _ in organizations:
-                if org.id == organization_id:
-                    current_org = org
-                    break
-
-        if (
-            current_org
-            and current_org.is_admins_accept_messages
-            and current_org.admin_chat_id
-        ):
-            is_admin_button = True
-            kb.button(
-                text=f"Адміністратори {current_org.title}",
-                callback_data=MessageCallback(
-                    action="select_admin_chat",
-                    data=str(organization_id),
-                    type=current_type,
-                ),
-            )
-
-    if not available_chats and not is_organizations_available and not is_admin_button:
-        await change_callback_or_message(tg_object, "❌ Доступні чати відсутні")
-        return
-
-    for chat in available_chats:
-        kb.button(
-            text=chat.title,
-            callback_data=MessageCallback(
-                action="select_chat",
-                data=str(chat.id),
-                type=current_type,
-            ),
-        )
-
-    if is_organizations_available:
-        if available_chats or is_admin_button:
-            kb.button(
-                text=(
-                    "📤 Зовнішнє листування"
-                    if organization.id == organization_id
-                    else "⬅️ Назад"
-                ),
-                callback_data=MessageCallback(
-                    action="select_org",
-                    type=current_type,
-                ),
-            )
-        else:
-            for org, chat_exists in organizations:
-                if (org.is_admins_accept_messages and org.admin_chat_id) or chat_exists:
-                    kb.button(
-                        text=org.title,
-                        callback_data=MessageCallback(
-                            action="select_org",
-                            data=str(org.id),
-                            type=current_type,
-                        ),
-                    )
-
-    kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
-    kb.adjust(1)
-
-    if available_chats or is_admin_button:
-        await change_callback_or_message(
-            tg_object, "Оберіть чат:", reply_markup=kb.as_markup()
-        )
-        return
-
-    await change_callback_or_message(
-        tg_object, "Оберіть організацію:", reply_markup=kb.as_markup()
+    text, reply_markup = get_org_chats_menu(
+        directory, organization, message.chat.id, organization_id, current_type
     )
+    await change_callback_or_message(tg_object, text, reply_markup)
 
 
 async def show_available_organizations(
-    db: AsyncSession,
+    directory: RoutingDirectory,
     callback: CallbackQuery,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     type: MessageType,
 ) -> None:
     if not isinstance(callback.message, Message):
         return
 
-    if organization.id == 0:
-        if callback.message.chat.id == organization.admin_chat_id:
-            await show_available_root_admin_org_chats(db, callback, type)
-            return
-
-        await edit_callback_message(callback, "❌ Не вдалось ідентифікувати ваш чат")
-        return
-
-    public_chat_exists_stmt = (
-        select(Chat.id)
-        .where(
-            Chat.organization_id == Organization.id,
-            Chat.type == ChatType.INTERNAL,
-            Chat.visibility_level == VisibilityLevel.PUBLIC,
-        )
-        .exists()
-    )
-
-    orgs_stmt = (
-        select(Organization, public_chat_exists_stmt.label("public_chat_exists"))
-        .where(
-            Organization.id != organization.id,
-            Organization.is_verified.is_(True),
-            Organization.is_private.is_(False),
-        )
-        .order_by(Organization.title)
-    )
-    orgs_result = await db.execute(orgs_stmt)
-    organizations = orgs_result.tuples().all()
-
-    available_orgs: list[Organization] = []
-    for org, chat_exists in organizations:
-        if (org.is_admins_accept_messages and org.admin_chat_id) or chat_exists:
-            available_orgs.append(org)
-
-    if not available_orgs:
-        await edit_callback_message(callback, "❌ Доступні організації відсутні")
-        return
-
-    kb = InlineKeyboardBuilder()
-
-    for org in available_orgs:
-        kb.button(
-            text=org.title,
-            callback_data=MessageCallback(
-                action="select_org", data=str(org.id), type=type
-            ),
-        )
-
-    is_admin_chat_id = callback.message.chat.id == organization.admin_chat_id
-    if (
-        organization.is_admins_accept_messages
-        and organization.admin_chat_id
-        and not is_admin_chat_id
-    ):
-        is_internal_available = True
-    else:
-        conditions = [
-            Chat.organization_id == organization.id,
-            Chat.type == ChatType.INTERNAL,
-        ]
-
-        if not is_admin_chat_id:
-            conditions.append(Chat.visibility_level == VisibilityLevel.INTERNAL)
-
-        chats_stmt = select(exists().where(*conditions))
-        chats_exist_result = await db.execute(chats_stmt)
-        is_internal_available = bool(chats_exist_result.scalar())
-
-    if is_internal_available:
-        kb.button(
-            text=("📥 Внутрішнє листування"),
-            callback_data=MessageCallback(
-                action="select_org", data=str(organization.id), type=type
-            ),
-        )
-
-    kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
-    kb.adjust(1)
-
-    await edit_callback_message(
-        callback, "Оберіть організацію:", reply_markup=kb.as_markup()
+    text, reply_markup = get_organizations_menu(
+        directory, organization, callback.message.chat.id, type
     )
+    await edit_callback_message(callback, text, reply_markup)
 
 
 async def send_handler(
-    message: Message, lazy_db: LazyDbSession, organization: Organization
+    message: Message, lazy_db: LazyDbSession, organization: OrganizationSnapshot
 ) -> None:
     if not message.from_user:
         return
@@ -421,31 +102,26 @@ async def send_handler(
         await message.answer("❌ Ця команда має бути реплаєм на повідомлення")
         return
 
-    db = await lazy_db.get()
+    directory = await routing_directory.get()
 
     if message.chat.id == organization.admin_chat_id:
         await show_available_org_chats(
-            db, message, organization.id, organization, MessageType.INFO
+            directory, message, organization.id, organization, MessageType.INFO
         )
         return
 
     if organization.admin_chat_id == message.chat.id:
         service_text = f"Адміністратори {html.escape(organization.title)}"
     else:
-        stmt = select(Chat.type, Chat.title).where(
-            Chat.id == message.chat.id, Chat.organization_id == organization.id
-        )
-        result_db = await db.execute(stmt)
-        type_and_title = result_db.tuples().one_or_none()
+        current_chat = directory.get_chat(message.chat.id, organization.id)
 
-        if type_and_title is None:
+        if current_chat is None:
             await message.answer("❌ Не вдалось ідентифікувати ваш чат")
             return
 
-        chat_type, title = type_and_title
-        if chat_type == ChatType.INTERNAL:
+        if current_chat.type == ChatType.INTERNAL:
             await show_available_org_chats(
-                db,
+                directory,
                 message,
                 organization.id,
                 organization,
@@ -453,7 +129,7 @@ async def send_handler(
             )
             return
 
-        service_text = f"Чат групи {html.escape(title)}"
+        service_text = f"Чат групи {html.escape(current_chat.title)}"
 
     if not organization.admin_chat_id or (
         not organization.is_admins_accept_messages
@@ -462,6 +138,7 @@ async def send_handler(
         await message.answer("❌ Адміністратори не приймають повідомлення.")
         return
 
+    db = await lazy_db.get()
     destination_text = f"<b>{html.escape(organization.title)}</b>"
     is_no_status = await is_no_status_request(db, message, organization.admin_chat_id)
 
@@ -481,7 +158,7 @@ async def send_handler(
 
 
 async def send_task_handler(
-    message: Message, lazy_db: LazyDbSession, organization: Organization
+    message: Message, organization: OrganizationSnapshot
 ) -> None:
     if not message.from_user:
         return
@@ -494,33 +171,28 @@ async def send_task_handler(
         await message.answer("❌ Ця команда має бути реплаєм на повідомлення")
         return
 
-    db = await lazy_db.get()
+    directory = await routing_directory.get()
 
     if message.chat.id != organization.admin_chat_id:
-        stmt = select(Chat.type).where(
-            Chat.id == message.chat.id, Chat.organization_id == organization.id
-        )
-        result_db = await db.execute(stmt)
-        chat_type = result_db.scalar_one_or_none()
+        current_chat = directory.get_chat(message.chat.id, organization.id)
 
-        if chat_type is None:
+        if current_chat is None:
             await message.answer("❌ Не вдалось ідентифікувати ваш чат")
             return
 
-        if chat_type == ChatType.EXTERNAL:
+        if current_chat.type == ChatType.EXTERNAL:
             await message.answer("❌ Команда призначена лише для внутрішніх чатів")
             return
 
     await show_available_org_chats(
-        db, message, organization.id, organization, MessageType.TASK
+        directory, message, organization.id, organization, MessageType.TASK
     )
 
 
 async def select_organization_handler(
     callback: CallbackQuery,
     callback_data: MessageCallback,
-    lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     if (
         not isinstance(callback.message, Message)
@@ -532,24 +204,27 @@ async def select_organization_handler(
     if not callback_data.type:
         return
 
-    db = await lazy_db.get()
+    directory = await routing_directory.get()
 
     if callback_data.data:
         organization_id = int(callback_data.data)
         await show_available_org_chats(
-            db, callback, organization_id, organization, callback_data.type
+            directory, callback, organization_id, organization, callback_data.type
         )
         return
 
-    await show_available_organizations(db, callback, organization, callback_data.type)
+    await show_available_organizations(
+        directory, callback, organization, callback_data.type
+    )
 
 
 async def select_admin_chat_handler(
     callback: CallbackQuery,
     callback_data: MessageCallback,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     ban_controller: BanController,
+    callback_idempotency: CallbackIdempotencyStore,
 ) -> None:
     if (
         not isinstance(callback.message, Message)
@@ -562,28 +237,22 @@ async def select_admin_chat_handler(
         return
 
     organization_id = int(callback_data.data)
-    send_organization: Organization | None = None
+    send_organization: OrganizationSnapshot | None = None
 
-    db = await lazy_db.get()
+    directory = await routing_directory.get()
 
     bot: Bot | None = None
 
     if organization_id == organization.id:
         send_organization = organization
     else:
-        organization_stmt = (
-            select(Organization)
-            .options(joinedload(Organization.bot))
-            .where(Organization.id == organization_id)
-        )
-        organization_result = await db.execute(organization_stmt)
-        send_organization = organization_result.scalar_one_or_none()
+        send_organization = directory.organizations.get(organization_id)
 
         if send_organization is None:
             await edit_callback_message(callback, "❌ Організація не знайдена")
             return
 
-        if await ban_controller.get(db, callback.from_user.id, send_organization.id):
+        if ban_controller.is_banned(callback.from_user.id, send_organization.id):
             await callback.answer("❌ Вас було заблоковано")
             return
 
@@ -604,9 +273,7 @@ async def select_admin_chat_handler(
     if organization.admin_chat_id == callback.message.chat.id:
         service_text = f"Адміністратори {html.escape(organization.title)}"
     else:
-        chat_stmt = select(Chat).where(Chat.id == callback.message.chat.id)
-        chat_result = await db.execute(chat_stmt)
-        chat = chat_result.scalar_one_or_none()
+        chat = directory.get_chat(callback.message.chat.id)
 
         if chat is None:
             await edit_callback_message(
@@ -622,6 +289,7 @@ async def select_admin_chat_handler(
         service_text += html.escape(chat.title)
 
     feedback_destination = f"адміністраторам {html.escape(send_organization.title)}"
+    db = await lazy_db.get()
 
     try:
         await send_message(
@@ -636,6 +304,7 @@ async def select_admin_chat_handler(
             callback.from_user,
             bot,
         )
+        callback_idempotency.complete(callback, callback_data.action)
     finally:
         if bot:
             await bot.session.close()
@@ -652,8 +321,9 @@ async def select_chat_handler(
     callback: CallbackQuery,
     callback_data: MessageCallback,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     ban_controller: BanController,
+    callback_idempotency: CallbackIdempotencyStore,
 ) -> None:
     if (
         not isinstance(callback.message, Message)
@@ -667,62 +337,40 @@ async def select_chat_handler(
 
     chat_id = int(callback_data.data)
 
-    db = await lazy_db.get()
+    directory = await routing_directory.get()
 
-    chat_stmt = (
-        select(Chat)
-        .options(
-            selectinload(Chat.threads),
-            joinedload(Chat.organization).joinedload(Organization.bot),
-        )
-        .where(Chat.id == chat_id, Chat.type == ChatType.INTERNAL)
+    chat = directory.get_chat(chat_id)
+    chat_organization = (
+        directory.organizations.get(chat.organization_id) if chat else None
     )
-    chat_result = await db.execute(chat_stmt)
-    chat = chat_result.scalar_one_or_none()
 
-    if chat is None:
+    if chat is None or chat.type != ChatType.INTERNAL or chat_organization is None:
         await edit_callback_message(callback, "❌ Чат не знайдено")
         return
 
-    if await ban_controller.get(db, callback.from_user.id, chat.organization_id):
+    if ban_controller.is_banned(callback.from_user.id, chat.organization_id):
         await callback.answer("❌ Вас було заблоковано")
         return
 
-    available_threads: list[ChatThread] = []
-
-    is_admin = organization.admin_chat_id == callback.message.chat.id
-    if chat.organization_id == organization.id:
-        if not is_admin and chat.visibility_level == VisibilityLevel.PRIVATE:
-            await edit_callback_message(callback, "❌ Чат приватний")
-            return
+    reachability = get_reachability(directory, organization, callback.message.chat.id)
 
-        for thread in chat.threads:
-            if is_admin or thread.visibility_level in (
-                VisibilityLevel.PUBLIC,
-                VisibilityLevel.INTERNAL,
-            ):
-                available_threads.append(thread)
-    else:
-        is_global_admin = is_admin and organization.id == 0
+    if not reachability.can_send_to_chat(chat.id):
+        await edit_callback_message(callback, "❌ Чат приватний")
+        return
 
-        if not is_global_admin and chat.visibility_level != VisibilityLevel.PUBLIC:
-            await edit_callback_message(callback, "❌ Чат приватний")
-            return
+    available_threads = [
+        thread
+        for thread in directory.get_threads(chat.id)
+        if reachability.can_send_to_thread(chat.id, thread.id)
+    ]
 
-        for thread in chat.threads:
-            if is_global_admin or thread.visibility_level == VisibilityLevel.PUBLIC:
-                available_threads.append(thread)
+    is_admin = organization.admin_chat_id == callback.message.chat.id
 
     if len(available_threads) <= 1:
         if is_admin:
             service_text = f"Адміністратори {html.escape(organization.title)}"
         else:
-            current_chat_stmt = select(Chat.title).where(
-                Chat.id == callback.message.chat.id,
-                Chat.organization_id == organization.id,
-            )
-            current_chat_result = await db.execute(current_chat_stmt)
-            current_chat = current_chat_result.scalar_one_or_none()
+            current_chat = directory.get_chat(callback.message.chat.id, organization.id)
 
             if current_chat is None:
                 await edit_callback_message(
@@ -735,16 +383,16 @@ async def select_chat_handler(
             else:
                 service_text = ""
 
-            service_text += html.escape(current_chat)
+            service_text += html.escape(current_chat.title)
 
         bot = callback.bot
         is_callback_bot = True
 
         if organization.id != chat.organization_id:
             service_dest_text = (
-                f"{html.escape(chat.organization.title)}, {html.escape(chat.title)}"
+                f"{html.escape(chat_organization.title)}, {html.escape(chat.title)}"
             )
-            bot = get_organization_bot(chat.organization)
+            bot = get_organization_bot(chat_organization)
             is_callback_bot = False
         else:
             service_dest_text = html.escape(chat.title)
@@ -756,6 +404,8 @@ async def select_chat_handler(
         else:
             thread_id = None
 
+        db = await lazy_db.get()
+
         try:
             sent_message_id = await send_message(
                 db,
@@ -769,6 +419,7 @@ async def select_chat_handler(
                 callback.from_user,
                 bot,
             )
+            callback_idempotency.complete(callback, callback_data.action)
 
             await callback.answer()
 
@@ -800,7 +451,7 @@ async def select_chat_handler(
             if pin_requests:
                 try:
                     await bot.pin_chat_message(
-                        thread.chat.id, sent_message_id, disable_notification=True
+                        chat.id, sent_message_id, disable_notification=True
                     )
                 except Exception as e:
                     logger.error(e)
@@ -816,36 +467,24 @@ async def select_chat_handler(
 
         return
 
-    kb = InlineKeyboardBuilder()
-
-    for thread in available_threads:
-        kb.button(
-            text=thread.title,
-            callback_data=MessageCallback(
-                action="select_thread",
-                data=f"{chat.id}|{thread.id}",
-                type=callback_data.type,
-            ),
-        )
-
-    kb.button(
-        text="⬅️ Назад",
-        callback_data=MessageCallback(
-            action="select_org", data=str(chat.organization_id), type=callback_data.type
-        ),
+    text, reply_markup = get_threads_menu(
+        directory,
+        organization,
+        callback.message.chat.id,
+        chat,
+        available_threads,
+        callback_data.type,
     )
-    kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
-    kb.adjust(1)
-
-    await edit_callback_message(callback, "Оберіть гілку:", reply_markup=kb.as_markup())
+    await edit_callback_message(callback, text, reply_markup)
 
 
 async def select_thread_handler(
     callback: CallbackQuery,
     callback_data: MessageCallback,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     ban_controller: BanController,
+    callback_idempotency: CallbackIdempotencyStore,
 ) -> None:
     if (
         not isinstance(callback.message, Message)
@@ -859,63 +498,43 @@ async def select_thread_handler(
 
     chat_id, thread_id = [int(x) for x in callback_data.data.split("|", 1)]
 
-    db = await lazy_db.get()
+    directory = await routing_directory.get()
 
-    thread_stmt = (
-        select(ChatThread)
-        .options(
-            joinedload(ChatThread.chat)
-            .joinedload(Chat.organization)
-            .joinedload(Organization.bot)
-        )
-        .where(ChatThread.id == thread_id, ChatThread.chat_id == chat_id)
+    thread = directory.get_thread(chat_id, thread_id)
+    chat = directory.get_chat(chat_id)
+    chat_organization = (
+        directory.organizations.get(chat.organization_id) if chat else None
     )
-    thread_result = await db.execute(thread_stmt)
-    thread = thread_result.scalar_one_or_none()
 
-    if thread is None:
+    if thread is None or chat is None or chat_organization is None:
         await edit_callback_message(callback, "❌ Гілку не знайдено")
         return
 
-    if await ban_controller.get(db, callback.from_user.id, thread.chat.organization_id):
+    if ban_controller.is_banned(callback.from_user.id, chat.organization_id):
         await callback.answer("❌ Вас було заблоковано")
         return
 
-    is_admin = organization.admin_chat_id == callback.message.chat.id
-    if thread.chat.organization_id == organization.id:
-        if not is_admin and thread.chat.visibility_level == VisibilityLevel.PRIVATE:
-            await edit_callback_message(callback, "❌ Чат приватний")
-            return
+    reachability = get_reachability(directory, organization, callback.message.chat.id)
 
-        if not is_admin and thread.visibility_level == VisibilityLevel.PRIVATE:
-            await edit_callback_message(callback, "❌ Гілка приватна")
-            return
+    if not reachability.can_send_to_chat(chat.id):
+        await edit_callback_message(callback, "❌ Чат приватний")
+        return
+
+    if not reachability.can_send_to_thread(chat.id, thread.id):
+        await edit_callback_message(callback, "❌ Гілка приватна")
+        return
 
+    if chat.organization_id == organization.id:
         service_text = ""
     else:
-        is_global_admin = is_admin and organization.id == 0
-
-        if (
-            not is_global_admin
-            and thread.chat.visibility_level != VisibilityLevel.PUBLIC
-        ):
-            await edit_callback_message(callback, "❌ Чат приватний")
-            return
-
-        if not is_global_admin and thread.visibility_level != VisibilityLevel.PUBLIC:
-            await edit_callback_message(callback, "❌ Гілка приватна")
-            return
-
         service_text = f"{html.escape(organization.title)}, "
 
+    is_admin = organization.admin_chat_id == callback.message.chat.id
+
     if is_admin:
         service_text = f"Адміністратори {html.escape(organization.title)}"
     else:
-        current_chat_stmt = select(Chat.title).where(
-            Chat.id == callback.message.chat.id, Chat.organization_id == organization.id
-        )
-        current_chat_result = await db.execute(current_chat_stmt)
-        current_chat = current_chat_result.scalar_one_or_none()
+        current_chat = directory.get_chat(callback.message.chat.id, organization.id)
 
         if current_chat is None:
             await edit_callback_message(
@@ -923,19 +542,19 @@ async def select_thread_handler(
             )
             return
 
-        service_text += html.escape(current_chat)
+        service_text += html.escape(current_chat.title)
 
     bot = callback.bot
     is_callback_bot = True
 
-    if organization.id != thread.chat.organization_id:
-        service_dest_text = f"{html.escape(thread.chat.organization.title)}, {html.escape(thread.chat.title)}, {html.escape(thread.title)}"
+    if organization.id != chat.organization_id:
+        service_dest_text = f"{html.escape(chat_organization.title)}, {html.escape(chat.title)}, {html.escape(thread.title)}"
         is_callback_bot = False
-        bot = get_organization_bot(thread.chat.organization)
+        bot = get_organization_bot(chat_organization)
     else:
-        service_dest_text = (
-            f"{html.escape(thread.chat.title)}, {html.escape(thread.title)}"
-        )
+        service_dest_text = f"{html.escape(chat.title)}, {html.escape(thread.title)}"
+
+    db = await lazy_db.get()
 
     try:
         sent_message_id = await send_message(
@@ -950,6 +569,7 @@ async def select_thread_handler(
             callback.from_user,
             bot,
         )
+        callback_idempotency.complete(callback, callback_data.action)
 
         await callback.answer()
 
@@ -976,7 +596,7 @@ async def select_thread_handler(
         if thread.pin_requests:
             try:
                 await bot.pin_chat_message(
-                    thread.chat.id, sent_message_id, disable_notification=True
+                    chat.id, sent_message_id, disable_notification=True
                 )
             except Exception as e:
                 logger.error(e)
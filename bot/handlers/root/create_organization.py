@@ -4,6 +4,8 @@ from aiogram.fsm.context import FSMContext
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy import select
 
+from app.core.invalidation import invalidation_bus
+from app.core.cache import organization_tag
 from app.core.settings import settings
 from app.db.models.organization import Organization
 from app.db.models.telegram_bot import TelegramBot
@@ -200,6 +202,8 @@ async def verify_organization(
 
     await db.commit()
 
+    await invalidation_bus.publish(organization_tag(organization.id))
+
     await edit_callback_message(
         callback,
         f"{callback.message.text}\n\n✅ Підтверджено: {format_user_info(callback.from_user)}",
@@ -4,11 +4,11 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
-from app.core.bot_cache import remove_telegram_bot
+from app.core.invalidation import invalidation_bus
+from app.core.cache import organization_tag
 from app.db.models.organization import Organization
 from bot.callback import MainCallback, OrganizationCallback
 from bot.middlewares.db_session import LazyDbSession
-from bot.middlewares.organization import OrganizationCache
 from bot.utils.confirm_action import confirm_action
 from bot.utils.edit_callback_message import edit_callback_message
 from bot.utils.notify_organization import notify_organization
@@ -75,7 +75,6 @@ async def delete_organization_confirmed(
     callback: CallbackQuery,
     callback_data: OrganizationCallback,
     lazy_db: LazyDbSession,
-    organization_cache: OrganizationCache,
 ) -> None:
     if not isinstance(callback.message, Message):
         return
@@ -99,10 +98,7 @@ async def delete_organization_confirmed(
     await db.delete(organization)
     await db.commit()
 
-    if organization.bot:
-        bot_id = organization.bot.id
-        remove_telegram_bot(bot_id)
-        organization_cache.remove(bot_id)
+    await invalidation_bus.publish(organization_tag(organization.id))
 
     await callback.answer()
     await edit_callback_message(
@@ -2,7 +2,7 @@ from aiogram.types import Message
 from aiogram.enums import ChatType
 from aiogram.fsm.context import FSMContext
 
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.chat_verify import chat_verify
 
@@ -11,7 +11,7 @@ async def bot_added_handler(
     message: Message,
     state: FSMContext,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     if (
         message.from_user is None
@@ -5,7 +5,7 @@ from sqlalchemy import select
 
 from app.core.settings import settings
 from app.db.models.chat import Chat
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.db_session import LazyDbSession
 from bot.middlewares.organization import OrganizationCache
 from bot.root_bot import ROOT_BOT
@@ -17,7 +17,7 @@ async def bot_removed_handler(
     update: ChatMemberUpdated,
     state: FSMContext,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     organization_cache: OrganizationCache,
 ) -> None:
     if (
@@ -48,12 +48,9 @@ async def bot_removed_handler(
         return
 
     if organization.admin_chat_id == update.chat.id:
-        organization.admin_chat_id = None
-        organization.admin_chat_thread_id = None
-        await db.merge(organization)
-        await db.commit()
-
-        organization_cache.update(organization)
+        await organization_cache.save(
+            db, organization, admin_chat_id=None, admin_chat_thread_id=None
+        )
 
         await ROOT_BOT.send_message(
             settings.ROOT_ADMIN_CHAT_ID,
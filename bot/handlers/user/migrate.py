@@ -1,7 +1,7 @@
 from aiogram.types import Message
 from aiogram.enums import ChatType
 
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.migrate_chat import migrate_chat
 
@@ -9,7 +9,7 @@ from bot.utils.migrate_chat import migrate_chat
 async def migrate_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     user = message.from_user
     if user is None or organization.admin_chat_id is None:
@@ -2,7 +2,7 @@ from aiogram.types import Message
 from aiogram.enums import ChatType as TelegramChatType
 
 from app.core.enums import ChatType
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.chat_verify import chat_verify, verify_captain_private_chat
 
@@ -10,7 +10,7 @@ from bot.utils.chat_verify import chat_verify, verify_captain_private_chat
 async def verify_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     if (
         message.from_user is None
@@ -39,7 +39,7 @@ async def verify_handler(
 async def verify_with_type(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     verify_type: ChatType,
 ) -> None:
     if (
@@ -67,7 +67,7 @@ async def verify_with_type(
 async def verify_external_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     await verify_with_type(message, lazy_db, organization, ChatType.EXTERNAL)
 
@@ -75,6 +75,6 @@ async def verify_external_handler(
 async def verify_internal_handler(
     message: Message,
     lazy_db: LazyDbSession,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     await verify_with_type(message, lazy_db, organization, ChatType.INTERNAL)
@@ -1,33 +1,107 @@
+from functools import partial
 from typing import Any, Awaitable, Callable
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, Message, Update, CallbackQuery
-from cachetools import TTLCache
 from sqlalchemy import delete, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import bans_tag
+from app.core.invalidation import invalidation_bus
 from app.db.models.banned_user import BannedUser
 from app.db.models.organization import Organization
-from bot.middlewares.db_session import LazyDbSession
+from app.db.session import async_session
+
+
+BanChange = Callable[[dict[int, set[int]]], None]
+
+
+def set_banned(
+    user_id: int, organization_id: int, banned: bool, bans: dict[int, set[int]]
+) -> None:
+    if banned:
+        bans.setdefault(organization_id, set()).add(user_id)
+    else:
+        bans.get(organization_id, set()).discard(user_id)
+
+
+def set_organization_bans(
+    organization_id: int, user_ids: frozenset[int], bans: dict[int, set[int]]
+) -> None:
+    bans[organization_id] = set(user_ids)
 
 
 class BanController:
-    def __init__(self, ttl_seconds: int = 300, maxsize: int = 1000):
-        self._cache: TTLCache[tuple[int, int], bool] = TTLCache(
-            maxsize=maxsize,
-            ttl=ttl_seconds,
+    def __init__(self) -> None:
+        self._bans: dict[int, set[int]] = {}
+        # Changes made while a load is querying the database, replayed on top
+        # of its result so that they are not lost when it replaces the state
+        self._journals: list[list[BanChange]] = []
+
+    def is_banned(self, user_id: int, organization_id: int) -> bool:
+        banned = self._bans.get(organization_id)
+        return banned is not None and user_id in banned
+
+    async def load(self) -> None:
+        journal: list[BanChange] = []
+        self._journals.append(journal)
+
+        try:
+            async with async_session() as db:
+                result = await db.execute(
+                    select(BannedUser.organization_id, BannedUser.user_id)
+                )
+                rows = result.tuples().all()
+        finally:
+            self._close_journal(journal)
+
+        bans: dict[int, set[int]] = {}
+        for organization_id, user_id in rows:
+            bans.setdefault(organization_id, set()).add(user_id)
+
+        for change in journal:
+            change(bans)
+
+        self._bans = bans
+
+    async def load_organization(self, organization_id: int) -> None:
+        journal: list[BanChange] = []
+        self._journals.append(journal)
+
+        try:
+            async with async_session() as db:
+                result = await db.execute(
+                    select(BannedUser.user_id).where(
+                        BannedUser.organization_id == organization_id
+                    )
+                )
+                user_ids = result.scalars().all()
+        finally:
+            self._close_journal(journal)
+
+        bans = {organization_id: set(user_ids)}
+        for change in journal:
+            change(bans)
+
+        self._change(
+            partial(
+                set_organization_bans,
+                organization_id,
+                frozenset(bans[organization_id]),
+            )
         )
 
-    async def get(
-        self, db: AsyncSession | LazyDbSession, user_id: int, organization_id: int
-    ) -> bool | None:
-        cached = self._cache.get((user_id, organization_id))
-        if cached is not None:
-            return cached
+    def _close_journal(self, journal: list[BanChange]) -> None:
+        self._journals = [item for item in self._journals if item is not journal]
 
-        if isinstance(db, LazyDbSession):
-            db = await db.get()
+    def _change(self, change: BanChange) -> None:
+        change(self._bans)
+        for journal in self._journals:
+            journal.append(change)
 
-        return await self.get_from_database(db, user_id, organization_id)
+    async def apply_invalidation(self, tags: list[str]) -> None:
+        for tag in tags:
+            if tag.startswith("bans:"):
+                await self.load_organization(int(tag.removeprefix("bans:")))
 
     async def get_from_database(
         self, db: AsyncSession, user_id: int, organization_id: int
@@ -41,12 +115,12 @@ class BanController:
         result = await db.execute(stmt)
         is_banned = bool(result.scalar())
 
-        self._set_cache(user_id, organization_id, is_banned)
+        self._set_banned(user_id, organization_id, is_banned)
 
         return is_banned
 
-    def _set_cache(self, user_id: int, organization_id: int, banned: bool) -> None:
-        self._cache[(user_id, organization_id)] = banned
+    def _set_banned(self, user_id: int, organization_id: int, banned: bool) -> None:
+        self._change(partial(set_banned, user_id, organization_id, banned))
 
     async def ban_user(
         self,
@@ -56,7 +130,7 @@ class BanController:
         banned_by: int,
         reason: str | None = None,
     ) -> bool:
-        if await self.get(db, user_id, organization_id):
+        if await self.get_from_database(db, user_id, organization_id):
             return False
 
         banned_user = BannedUser(
@@ -69,14 +143,15 @@ class BanController:
         db.add(banned_user)
         await db.commit()
 
-        self._set_cache(user_id, organization_id, True)
+        self._set_banned(user_id, organization_id, True)
+        await invalidation_bus.publish(bans_tag(organization_id))
 
         return True
 
     async def unban_user(
         self, db: AsyncSession, user_id: int, organization_id: int
     ) -> bool:
-        if not await self.get(db, user_id, organization_id):
+        if not await self.get_from_database(db, user_id, organization_id):
             return False
 
         delete_query = delete(BannedUser).where(
@@ -86,15 +161,19 @@ class BanController:
         await db.execute(delete_query)
         await db.commit()
 
-        self._set_cache(user_id, organization_id, False)
+        self._set_banned(user_id, organization_id, False)
+        await invalidation_bus.publish(bans_tag(organization_id))
 
         return True
 
 
+ban_controller = BanController()
+
+
 class BanMiddleware(BaseMiddleware):
-    def __init__(self, ttl_seconds: int = 300, maxsize: int = 1000):
+    def __init__(self, controller: BanController = ban_controller):
         super().__init__()
-        self._controller = BanController(ttl_seconds, maxsize)
+        self._controller = controller
 
     async def __call__(
         self,
@@ -102,7 +181,6 @@ class BanMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        lazy_db: LazyDbSession = data["lazy_db"]
         organization: Organization = data["organization"]
 
         user_id: int | None = None
@@ -137,7 +215,7 @@ class BanMiddleware(BaseMiddleware):
         if (
             user_id
             and chat_id != organization.admin_chat_id
-            and await self._controller.get(lazy_db, user_id, organization.id)
+            and self._controller.is_banned(user_id, organization.id)
         ):
             if callback:
                 await callback.answer("❌ Вас було заблоковано")
@@ -0,0 +1,89 @@
+from typing import Any, Awaitable, Callable
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from app.core.cache import Cache, cache_registry
+from app.core.settings import settings
+from bot.callback import MessageCallback
+
+
+CallbackKey = tuple[int, int, str]
+
+PENDING_ANSWER = "⏳ Запит вже обробляється"
+COMPLETED_ANSWER = "✅ Повідомлення вже надіслано"
+
+
+class CallbackIdempotencyStore:
+    def __init__(self, name: str, maxsize: int, ttl_seconds: int):
+        self._answers: Cache[CallbackKey, str] = cache_registry.create(
+            name, maxsize, ttl_seconds
+        )
+
+    @staticmethod
+    def get_key(callback: CallbackQuery, action: str) -> CallbackKey | None:
+        if not isinstance(callback.message, Message):
+            return None
+
+        return (callback.message.chat.id, callback.message.message_id, action)
+
+    def get(self, key: CallbackKey) -> str | None:
+        return self._answers.get(key)
+
+    def begin(self, key: CallbackKey) -> None:
+        self._answers.set(key, PENDING_ANSWER)
+
+    def complete(
+        self, callback: CallbackQuery, action: str, answer: str = COMPLETED_ANSWER
+    ) -> None:
+        key = self.get_key(callback, action)
+        if key is not None:
+            self._answers.set(key, answer)
+
+    def release(self, key: CallbackKey) -> None:
+        if self._answers.get(key) == PENDING_ANSWER:
+            self._answers.pop(key)
+
+
+class CallbackIdempotencyMiddleware(BaseMiddleware):
+    def __init__(self, name: str, actions: set[str]):
+        super().__init__()
+        self._actions = actions
+        self._store = CallbackIdempotencyStore(
+            name,
+            settings.CALLBACK_IDEMPOTENCY_CACHE_SIZE,
+            settings.CALLBACK_IDEMPOTENCY_CACHE_TTL,
+        )
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        callback_data = data.get("callback_data")
+
+        if (
+            not isinstance(event, CallbackQuery)
+            or not isinstance(callback_data, MessageCallback)
+            or callback_data.action not in self._actions
+        ):
+            return await handler(event, data)
+
+        # Handlers always receive the store, complete is a no-op without a key
+        data["callback_idempotency"] = self._store
+
+        key = self._store.get_key(event, callback_data.action)
+        if key is None:
+            return await handler(event, data)
+
+        answer = self._store.get(key)
+        if answer is not None:
+            await event.answer(answer)
+            return None
+
+        self._store.begin(key)
+
+        try:
+            return await handler(event, data)
+        finally:
+            self._store.release(key)
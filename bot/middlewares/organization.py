@@ -1,25 +1,32 @@
+from dataclasses import replace
 from typing import Any, Callable, Awaitable
 from aiogram import BaseMiddleware, Bot
 from aiogram.types import TelegramObject, Message, Update
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
-from cachetools import TTLCache
 
+from app.core.cache import Cache, bot_tag, cache_registry, organization_tag
+from app.core.invalidation import invalidation_bus
+from app.core.settings import settings
 from app.db.models.organization import Organization
 from app.db.models.telegram_bot import TelegramBot
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.db_session import LazyDbSession
 
 
 class OrganizationCache:
-    def __init__(self, ttl_seconds: int = 3600, maxsize: int = 100):
-        self._cache: TTLCache[int, Organization] = TTLCache(
-            maxsize=maxsize, ttl=ttl_seconds
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._cache: Cache[int, OrganizationSnapshot] = cache_registry.create(
+            "organizations", maxsize, ttl_seconds
         )
 
-    async def get(self, db: LazyDbSession | AsyncSession, bot_id: int) -> Organization:
-        if bot_id in self._cache:
-            return self._cache[bot_id]
+    async def get(
+        self, db: LazyDbSession | AsyncSession, bot_id: int
+    ) -> OrganizationSnapshot:
+        cached = self._cache.get(bot_id)
+        if cached is not None:
+            return cached
 
         if isinstance(db, LazyDbSession):
             async_session = await db.get()
@@ -27,16 +34,36 @@ class OrganizationCache:
         else:
             organization = await self.get_from_db(db, bot_id)
 
-        self._cache[bot_id] = organization
+        return self.update(organization)
 
-        return organization
+    def update(
+        self, organization: Organization | OrganizationSnapshot
+    ) -> OrganizationSnapshot:
+        if isinstance(organization, Organization):
+            organization = OrganizationSnapshot.from_model(organization)
 
-    def update(self, organization: Organization) -> None:
         if organization.bot:
-            self._cache[organization.bot.id] = organization
+            self._cache.set(
+                organization.bot.id,
+                organization,
+                tags=(organization_tag(organization.id), bot_tag(organization.bot.id)),
+            )
+
+        return organization
+
+    async def save(
+        self, db: AsyncSession, organization: OrganizationSnapshot, **values: Any
+    ) -> OrganizationSnapshot:
+        await db.execute(
+            update(Organization)
+            .where(Organization.id == organization.id)
+            .values(**values)
+        )
+        await db.commit()
+
+        await invalidation_bus.publish(organization_tag(organization.id))
 
-    def remove(self, bot_id: int) -> None:
-        self._cache.pop(bot_id, None)
+        return self.update(replace(organization, **values))
 
     @staticmethod
     async def get_from_db(
@@ -59,10 +86,15 @@ class OrganizationCache:
         return organization
 
 
+organization_cache = OrganizationCache(
+    settings.ORGANIZATION_CACHE_SIZE, settings.ORGANIZATION_CACHE_TTL
+)
+
+
 class OrganizationMiddleware(BaseMiddleware):
-    def __init__(self, ttl_seconds: int = 3600, maxsize: int = 100):
+    def __init__(self, cache: OrganizationCache = organization_cache):
         super().__init__()
-        self._cache = OrganizationCache(ttl_seconds, maxsize)
+        self._cache = cache
 
     async def __call__(
         self,
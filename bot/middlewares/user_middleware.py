@@ -1,45 +1,76 @@
 from typing import Any, Callable, Awaitable
 from aiogram import BaseMiddleware
 from aiogram.enums import ChatMemberStatus, ChatType
-from aiogram.types import TelegramObject, Message, ChatMemberUpdated, Update
-from cachetools import TTLCache
-from sqlalchemy.ext.asyncio import AsyncSession
+from aiogram.types import (
+    TelegramObject,
+    Message,
+    ChatMemberUpdated,
+    Update,
+    User as TelegramUser,
+)
 
+from app.core.cache import Cache, cache_registry, chat_tag
+from app.core.settings import settings
 from bot.middlewares.db_session import LazyDbSession
-from bot.utils.register_user import (
-    delete_user_from_chat,
-    register_chat_user,
-    register_user,
-)
+from bot.utils.register_user import delete_user_from_chat
+from bot.utils.user_buffer import user_buffer
+
+
+def user_fingerprint(user: TelegramUser) -> int:
+    return hash((user.id, user.username, user.first_name, user.last_name))
 
 
 class UserCache:
-    def __init__(self, ttl_seconds: int = 600, maxsize: int = 5000):
-        self._users: TTLCache[int, bool] = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
-        self._chat_users: TTLCache[tuple[int, int], bool] = TTLCache(
-            maxsize=maxsize, ttl=ttl_seconds
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._users: Cache[int, int] = cache_registry.create(
+            "users", maxsize, ttl_seconds
+        )
+        self._chat_users: Cache[tuple[int, int], bool] = cache_registry.create(
+            "chat_users", maxsize, ttl_seconds
         )
+        self.write_skips = 0
 
-    def has_user(self, user_id: int) -> bool:
-        return user_id in self._users
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self._users.hits,
+            "misses": self._users.misses,
+            "write_skips": self.write_skips,
+            "users": len(self._users),
+            "chat_users": len(self._chat_users),
+        }
+
+    def is_user_changed(self, user: TelegramUser) -> bool:
+        fingerprint = self._users.get(user.id)
+        if fingerprint is None:
+            return True
+
+        if fingerprint == user_fingerprint(user):
+            self.write_skips += 1
+            return False
+
+        return True
 
     def has_chat_user(self, user_id: int, chat_id: int) -> bool:
         return (user_id, chat_id) in self._chat_users
 
-    def add_user(self, user_id: int) -> None:
-        self._users[user_id] = True
+    def add_user(self, user: TelegramUser) -> None:
+        self._users.set(user.id, user_fingerprint(user))
 
     def add_chat_user(self, user_id: int, chat_id: int) -> None:
-        self._chat_users[(user_id, chat_id)] = True
+        self._chat_users.set((user_id, chat_id), True, tags=(chat_tag(chat_id),))
 
     def delete_chat_user(self, user_id: int, chat_id: int) -> None:
-        self._chat_users.pop((user_id, chat_id), None)
+        self._chat_users.pop((user_id, chat_id))
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
 
 
 class UserMiddleware(BaseMiddleware):
-    def __init__(self, ttl_seconds: int = 600, maxsize: int = 5000):
+    def __init__(self, cache: UserCache = user_cache):
         super().__init__()
-        self._cache = UserCache(ttl_seconds, maxsize)
+        self._cache = cache
 
     async def __call__(
         self,
@@ -52,53 +83,55 @@ class UserMiddleware(BaseMiddleware):
         if isinstance(event, Update):
             msg = event.message or event.edited_message
             if msg:
-                db = await lazy_db.get()
                 if msg.chat.type == ChatType.PRIVATE:
-                    await self.process_user(msg, db)
+                    self.process_user(msg)
                 else:
-                    await self.process_chat_user(msg, db)
+                    self.process_chat_user(msg)
             elif event.chat_member:
-                db = await lazy_db.get()
-                await self.process_member_update(event.chat_member, db)
+                await self.process_member_update(event.chat_member, lazy_db)
 
         elif isinstance(event, Message):
-            msg = event
-
-            db = await lazy_db.get()
             if event.chat.type == ChatType.PRIVATE:
-                await self.process_user(event, db)
+                self.process_user(event)
             else:
-                await self.process_chat_user(event, db)
+                self.process_chat_user(event)
 
         elif isinstance(event, ChatMemberUpdated):
-            db = await lazy_db.get()
-            await self.process_member_update(event, db)
+            await self.process_member_update(event, lazy_db)
 
         return await handler(event, data)
 
-    async def process_user(self, message: Message, db: AsyncSession) -> None:
+    def process_user(self, message: Message) -> None:
         user = message.from_user
         if not user or user.is_bot:
             return
 
-        if not self._cache.has_user(user.id):
-            await register_user(db, user)
-            self._cache.add_user(user.id)
+        if self._cache.is_user_changed(user):
+            user_buffer.add_user(user)
+            self._cache.add_user(user)
 
-    async def process_chat_user(self, message: Message, db: AsyncSession) -> None:
+    def process_chat_user(self, message: Message) -> None:
         user = message.from_user
         if not user or user.is_bot:
             return
 
         chat_id = message.chat.id
 
+        self.register_chat_user(user, chat_id)
+
+    def register_chat_user(self, user: TelegramUser, chat_id: int) -> None:
+        user_changed = self._cache.is_user_changed(user)
+
         if not self._cache.has_chat_user(user.id, chat_id):
-            await register_chat_user(db, user, chat_id)
+            user_buffer.add_chat_user(user, chat_id)
             self._cache.add_chat_user(user.id, chat_id)
-            self._cache.add_user(user.id)
+            self._cache.add_user(user)
+        elif user_changed:
+            user_buffer.add_user(user)
+            self._cache.add_user(user)
 
     async def process_member_update(
-        self, event: ChatMemberUpdated, db: AsyncSession
+        self, event: ChatMemberUpdated, lazy_db: LazyDbSession
     ) -> None:
         user = event.new_chat_member.user
         chat_id = event.chat.id
@@ -110,15 +143,13 @@ class UserMiddleware(BaseMiddleware):
             ChatMemberStatus.RESTRICTED,
         ):
             if event.chat.type == ChatType.PRIVATE:
-                if not self._cache.has_user(user.id):
-                    await register_user(db, user)
-                    self._cache.add_user(user.id)
+                if self._cache.is_user_changed(user):
+                    user_buffer.add_user(user)
+                    self._cache.add_user(user)
 
                 return
 
-            if not self._cache.has_chat_user(user.id, chat_id):
-                await register_chat_user(db, user, chat_id)
-                self._cache.add_chat_user(user.id, chat_id)
+            self.register_chat_user(user, chat_id)
 
         elif (
             event.new_chat_member.status
@@ -128,5 +159,9 @@ class UserMiddleware(BaseMiddleware):
             )
             and event.chat.type != ChatType.PRIVATE
         ):
+            user_buffer.discard_chat_user(user.id, chat_id)
+
+            db = await lazy_db.get()
             await delete_user_from_chat(db, user.id, chat_id)
+            await db.commit()
             self._cache.delete_chat_user(user.id, chat_id)
@@ -15,6 +15,10 @@ from bot.handlers.admin.greeting_message import (
     delete_greeting_handler,
     set_greeting_handler,
 )
+from bot.handlers.admin.notification_time import (
+    reset_notification_time_handler,
+    set_notification_time_handler,
+)
 from bot.handlers.admin.organization_settings import (
     confirm_delete_handler,
     request_delete_handler,
@@ -64,6 +68,13 @@ admin_router.callback_query.register(
 admin_router.message.register(set_greeting_handler, Command("set_greeting"))
 admin_router.message.register(delete_greeting_handler, Command("delete_greeting"))
 
+admin_router.message.register(
+    set_notification_time_handler, Command("set_notification_time")
+)
+admin_router.message.register(
+    reset_notification_time_handler, Command("reset_notification_time")
+)
+
 admin_router.message.register(
     rename_organization_handler, Command("rename_organization")
 )
@@ -11,12 +11,24 @@ from bot.handlers.request.send_handler import (
     send_task_handler,
 )
 from bot.handlers.request.status_handler import request_status_handler
-from bot.handlers.request.pending_handler import pending_handler, pending_chat_handler
-from bot.callback import MessageCallback
+from bot.handlers.request.pending_handler import (
+    pending_chat_handler,
+    pending_handler,
+    pending_page_handler,
+)
+from bot.callback import MessageCallback, PendingCallback
+from bot.middlewares.idempotency import CallbackIdempotencyMiddleware
 
 
 request_router = Router()
 
+request_router.callback_query.middleware(
+    CallbackIdempotencyMiddleware(
+        "send_callbacks",
+        {"select_admin_chat", "select_chat", "select_thread"},
+    )
+)
+
 request_router.message.register(send_handler, Command("send"))
 request_router.message.register(send_task_handler, Command("send_task"))
 
@@ -40,5 +52,6 @@ request_router.callback_query.register(
 
 request_router.message.register(pending_handler, Command("pending"))
 request_router.message.register(pending_chat_handler, Command("pending_chat"))
+request_router.callback_query.register(pending_page_handler, PendingCallback.filter())
 
 request_router.message.register(message_handler)
@@ -1,6 +1,10 @@
+import asyncio
 from collections import defaultdict
+from dataclasses import dataclass
+import hashlib
 import html
-from io import BytesIO
+import json
+from typing import Any
 from aiogram import Bot
 import pandas as pd
 from sqlalchemy import delete, func, insert, or_, select
@@ -12,13 +16,17 @@ from app.core.settings import settings
 from app.core.logger import logger
 from app.core.constants import USERNAME_REGEX
 from app.core.enums import CryptoInfo
-from app.core.google_drive import download_file
 from app.db.models.captain_spreadsheet import CaptainSpreadsheet
 from app.db.models.chat import Chat
 from app.db.models.chat_captain import ChatCaptain
 from app.db.models.organization import Organization
+from app.db.snapshots import CaptainSpreadsheetSnapshot, OrganizationSnapshot
 from bot.root_bot import ROOT_BOT
-from bot.utils.spreadsheet import excel_cols_to_positions
+from bot.utils.spreadsheet import (
+    excel_cols_to_positions,
+    get_spreadsheet_revision,
+    load_spreadsheet,
+)
 
 
 async def get_captain(
@@ -58,33 +66,19 @@ async def get_captain(
     return result.scalar_one_or_none()
 
 
-async def update_captains_single_spreadhseet(
-    db: AsyncSession,
-    spreadsheet: CaptainSpreadsheet,
-    current_captains: dict[str, ChatCaptain],
-    organization: Organization,
-) -> None:
-    if organization.bot is None:
-        raise ValueError("Organization without bot")
+CaptainRow = tuple[Any, Any]
 
-    if organization.admin_chat_id is None:
-        raise ValueError("Organization without admin_chat_id")
 
-    config_content = BytesIO()
-    download_file(
-        spreadsheet.spreadsheet_id,
-        config_content,
-        export_mime_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
-
-    config_content.seek(0)
-    file = pd.ExcelFile(config_content)
-    df = pd.read_excel(file, spreadsheet.sheet_name, engine="openpyxl")
-    file.close()
+@dataclass(frozen=True, slots=True)
+class CaptainRows:
+    revision: str
+    rows: list[CaptainRow]
+    content_hash: str
 
-    if isinstance(df, dict):
-        df = next(iter(df.values()))
 
+def extract_captain_rows(
+    spreadsheet: CaptainSpreadsheetSnapshot, df: pd.DataFrame
+) -> list[CaptainRow]:
     rows_min = spreadsheet.rows_range_min
     rows_max = spreadsheet.rows_range_max
 
@@ -98,6 +92,84 @@ async def update_captains_single_spreadhseet(
     )
     two_cols = df.iloc[row_slice, col_positions].dropna()
 
+    return list(two_cols.itertuples(index=False, name=None))
+
+
+def captain_rows_hash(rows: list[CaptainRow]) -> str:
+    content = json.dumps(rows, ensure_ascii=False, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+async def load_captain_rows(
+    spreadsheet: CaptainSpreadsheetSnapshot, force: bool = False
+) -> CaptainRows | None:
+    # The metadata call is far cheaper than an export, so an untouched
+    # spreadsheet is skipped before anything is downloaded
+    revision = await get_spreadsheet_revision(spreadsheet.spreadsheet_id)
+    if not force and revision and revision == spreadsheet.revision:
+        return None
+
+    df = await load_spreadsheet(spreadsheet.spreadsheet_id, spreadsheet.sheet_name)
+    rows = extract_captain_rows(spreadsheet, df)
+
+    return CaptainRows(revision, rows, captain_rows_hash(rows))
+
+
+async def sync_captains_spreadsheet(
+    db: AsyncSession,
+    spreadsheet: CaptainSpreadsheet,
+    loaded: CaptainRows | None,
+    current_captains: dict[str, ChatCaptain],
+    organization: Organization | OrganizationSnapshot,
+    force: bool = False,
+) -> None:
+    if loaded is None:
+        return
+
+    spreadsheet.revision = loaded.revision
+
+    # Edits outside the captain columns change the revision but not the rows
+    if force or loaded.content_hash != spreadsheet.content_hash:
+        spreadsheet.content_hash = loaded.content_hash
+        await apply_captains_spreadsheet(
+            db, loaded.rows, current_captains, organization
+        )
+
+
+async def update_captains_single_spreadhseet(
+    db: AsyncSession,
+    spreadsheet: CaptainSpreadsheet,
+    current_captains: dict[str, ChatCaptain],
+    organization: Organization | OrganizationSnapshot,
+    force: bool = True,
+) -> None:
+    if organization.bot is None:
+        raise ValueError("Organization without bot")
+
+    if organization.admin_chat_id is None:
+        raise ValueError("Organization without admin_chat_id")
+
+    loaded = await load_captain_rows(
+        CaptainSpreadsheetSnapshot.from_model(spreadsheet), force
+    )
+    await sync_captains_spreadsheet(
+        db, spreadsheet, loaded, current_captains, organization, force
+    )
+    await db.commit()
+
+
+async def apply_captains_spreadsheet(
+    db: AsyncSession,
+    rows: list[CaptainRow],
+    current_captains: dict[str, ChatCaptain],
+    organization: Organization | OrganizationSnapshot,
+) -> None:
+    if organization.bot is None:
+        raise ValueError("Organization without bot")
+
+    if organization.admin_chat_id is None:
+        raise ValueError("Organization without admin_chat_id")
+
     new_captains: list[ChatCaptain] = []
     removed_captains: list[ChatCaptain] = []
     changed_captains: list[ChatCaptain] = []
@@ -105,7 +177,7 @@ async def update_captains_single_spreadhseet(
     processed_chats: set[str] = set()
     duplicated_chats: list[str] = []
 
-    for title, username in two_cols.itertuples(index=False, name=None):
+    for title, username in rows:
         title = title.strip()
         if len(title) > 32:
             continue
@@ -273,8 +345,6 @@ async def update_captains_single_spreadhseet(
             except Exception:
                 pass
 
-        await db.commit()
-
 
 async def update_captains_spreadsheet_info(db: AsyncSession) -> None:
     q = await db.execute(
@@ -293,30 +363,66 @@ async def update_captains_spreadsheet_info(db: AsyncSession) -> None:
     for captain in captains:
         organization_captains[captain.organization_id][captain.chat_title] = captain
 
-    for spreadsheet in spreadsheets:
-        bot = spreadsheet.organization.bot
-        admin_chat_id = spreadsheet.organization.admin_chat_id
-        if not bot or not admin_chat_id:
-            continue
-
-        try:
-            current_captains = organization_captains.get(
-                spreadsheet.organization_id, {}
-            )
-            await update_captains_single_spreadhseet(
-                db, spreadsheet, current_captains, spreadsheet.organization
-            )
-        except Exception as e:
-            logger.error(e)
-            org_title = spreadsheet.organization.title
-            await db.rollback()
-            await ROOT_BOT.send_message(
-                settings.ROOT_ADMIN_CHAT_ID,
-                f"Не вдалось оновити старост для <b>{html.escape(org_title)}</b>!\n\n<code>{html.escape(str(e))}</code>",
-                message_thread_id=settings.ROOT_ADMIN_ERRORS_THREAD_ID,
-                parse_mode="HTML",
+    # Downloads and parsing run concurrently, while the results are applied one
+    # at a time as they arrive since they share the session. The downloads only
+    # see plain snapshots, so a failure of one organization cannot expire the
+    # attributes that the others are still reading
+    targets = {
+        spreadsheet.organization_id: (
+            spreadsheet,
+            OrganizationSnapshot.from_model(spreadsheet.organization),
+        )
+        for spreadsheet in spreadsheets
+        if spreadsheet.organization.bot and spreadsheet.organization.admin_chat_id
+    }
+    downloads = {
+        asyncio.create_task(
+            load_captain_rows(CaptainSpreadsheetSnapshot.from_model(spreadsheet))
+        ): organization_id
+        for organization_id, (spreadsheet, _) in targets.items()
+    }
+    pending = set(downloads)
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
             )
 
+            for task in done:
+                spreadsheet, organization = targets[downloads[task]]
+
+                try:
+                    current_captains = organization_captains.get(organization.id, {})
+                    # A savepoint undoes only this organization's changes
+                    async with db.begin_nested():
+                        await sync_captains_spreadsheet(
+                            db,
+                            spreadsheet,
+                            task.result(),
+                            current_captains,
+                            organization,
+                        )
+
+                    await db.commit()
+                except Exception as e:
+                    logger.error(e)
+                    if not db.is_active:
+                        await db.rollback()
+
+                    try:
+                        await ROOT_BOT.send_message(
+                            settings.ROOT_ADMIN_CHAT_ID,
+                            f"Не вдалось оновити старост для <b>{html.escape(organization.title)}</b>!\n\n<code>{html.escape(str(e))}</code>",
+                            message_thread_id=settings.ROOT_ADMIN_ERRORS_THREAD_ID,
+                            parse_mode="HTML",
+                        )
+                    except Exception as send_error:
+                        logger.error(send_error)
+    finally:
+        for task in pending:
+            task.cancel()
+
 
 async def update_captains(db: AsyncSession) -> None:
     logger.info("Updating captains")
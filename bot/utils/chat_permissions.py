@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.logger import logger
 from app.core.enums import ChatType
 from app.db.models.chat import Chat
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 
 
 async def is_chat_admin(bot: Bot, chat_id: int, user_id: int) -> bool:
@@ -51,7 +51,9 @@ async def check_chat_admin_permission(
     return True
 
 
-async def check_org_admin_chat(message: Message, organization: Organization) -> bool:
+async def check_org_admin_chat(
+    message: Message, organization: OrganizationSnapshot
+) -> bool:
     if message.chat.id != organization.admin_chat_id:
         await message.answer(
             "❌ Ця команда доступна лише з чату адміністраторів організації"
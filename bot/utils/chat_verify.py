@@ -7,19 +7,20 @@ from app.core.enums import ChatType, VisibilityLevel
 from app.db.models.chat import Chat
 from app.db.models.chat_captain import ChatCaptain
 from app.db.models.chat_thread import ChatThread
-from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.utils.captains import get_captain
 from bot.utils.format_user import format_user_info
 from bot.utils.set_bot_commands import (
     set_bot_commands_for_external_chat,
     set_bot_commands_for_internal_chat,
 )
+from bot.utils.user_buffer import user_buffer
 
 
 async def chat_verify(
     db: AsyncSession,
     message: Message,
-    organization: Organization,
+    organization: OrganizationSnapshot,
     is_bot_added: bool = False,
     verify_type: ChatType | None = None,
 ) -> None:
@@ -296,7 +297,7 @@ async def chat_verify(
 
 
 async def verify_captain_private_chat(
-    db: AsyncSession, message: Message, organization: Organization
+    db: AsyncSession, message: Message, organization: OrganizationSnapshot
 ) -> bool:
     user = message.from_user
     if (
@@ -309,6 +310,8 @@ async def verify_captain_private_chat(
 
     captain = await get_captain(db, organization.id, username=user.username)
     if captain and captain.connected_user_id is None:
+        # The users row may still be buffered and the captain references it
+        await user_buffer.flush_if_pending(user_id=user.id)
         captain.connected_user_id = user.id
         captain.is_bot_blocked = False
 
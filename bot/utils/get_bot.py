@@ -4,16 +4,17 @@ from app.core.crypto import crypto
 from app.core.enums import CryptoInfo
 from app.db.models.organization import Organization
 from app.db.models.telegram_bot import TelegramBot
+from app.db.snapshots import OrganizationSnapshot, TelegramBotSnapshot
 
 
-def get_bot(bot: TelegramBot) -> Bot:
+def get_bot(bot: TelegramBot | TelegramBotSnapshot) -> Bot:
     token_stripped = crypto.decrypt_data(bot.token, CryptoInfo.BOT_TOKEN)
     token = f"{bot.id}:{token_stripped}"
 
     return Bot(token)
 
 
-def get_organization_bot(organization: Organization) -> Bot:
+def get_organization_bot(organization: Organization | OrganizationSnapshot) -> Bot:
     if not organization.bot:
         raise ValueError("Organization without bot")
 
@@ -1,18 +1,48 @@
 from aiogram.types import Message
-from sqlalchemy import select
+from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.enums import MessageStatus, MessageType
 from app.db.models.message import Message as MessageDB
+from app.db.models.request_state import RequestState
+from app.db.upsert import dialect_insert
 
 
-async def is_no_status_request(
-    db: AsyncSession, message: Message, destination_chat_id: int
-) -> bool:
-    last_request_stmt = (
-        select(MessageDB.status)
+async def save_request_state(
+    db: AsyncSession,
+    chat_id: int,
+    destination_chat_id: int,
+    last_message_id: int | None,
+) -> None:
+    stmt = dialect_insert(RequestState).values(
+        chat_id=chat_id,
+        destination_chat_id=destination_chat_id,
+        last_message_id=last_message_id,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RequestState.chat_id, RequestState.destination_chat_id],
+        set_={
+            "last_message_id": stmt.excluded.last_message_id,
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def record_request_states(db: AsyncSession, messages: list[MessageDB]) -> None:
+    await db.flush(messages)
+
+    for message in messages:
+        await save_request_state(
+            db, message.chat_id, message.destination_chat_id, message.id
+        )
+
+
+def last_request_id_query(chat_id: int, destination_chat_id: int) -> Select[int]:
+    return (
+        select(MessageDB.id)
         .where(
-            MessageDB.chat_id == message.chat.id,
+            MessageDB.chat_id == chat_id,
             MessageDB.destination_chat_id == destination_chat_id,
             MessageDB.type == MessageType.SERVICE,
             MessageDB.status.is_not(None),
@@ -20,7 +50,51 @@ async def is_no_status_request(
         .order_by(MessageDB.created_at.desc())
         .limit(1)
     )
-    last_request_result = await db.execute(last_request_stmt)
-    last_request_status = last_request_result.scalar_one_or_none()
 
-    return last_request_status == MessageStatus.NEW
+
+async def backfill_request_state(
+    db: AsyncSession, chat_id: int, destination_chat_id: int
+) -> None:
+    # Pairs without a recorded state are backfilled from the message history
+    # once, while an existing state is left alone
+    stmt = dialect_insert(RequestState).values(
+        chat_id=chat_id,
+        destination_chat_id=destination_chat_id,
+        last_message_id=last_request_id_query(
+            chat_id, destination_chat_id
+        ).scalar_subquery(),
+    )
+    await db.execute(
+        stmt.on_conflict_do_nothing(
+            index_elements=[RequestState.chat_id, RequestState.destination_chat_id]
+        )
+    )
+
+
+async def is_no_status_request(
+    db: AsyncSession, message: Message, destination_chat_id: int
+) -> bool:
+    state_result = await db.execute(
+        select(RequestState.last_message_id).where(
+            RequestState.chat_id == message.chat.id,
+            RequestState.destination_chat_id == destination_chat_id,
+        )
+    )
+    state = state_result.one_or_none()
+
+    if state is None:
+        last_request_result = await db.execute(
+            last_request_id_query(message.chat.id, destination_chat_id)
+        )
+        last_message_id = last_request_result.scalar_one_or_none()
+    else:
+        last_message_id = state.last_message_id
+
+    if last_message_id is None:
+        return False
+
+    status_result = await db.execute(
+        select(MessageDB.status).where(MessageDB.id == last_message_id)
+    )
+
+    return status_result.scalar_one_or_none() == MessageStatus.NEW
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import ColumnElement, and_, delete, exists, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.cache import REPLY_ROUTES_TAG
+from app.core.enums import MessageStatus, MessageType
+from app.core.settings import settings
+from app.core.shutdown import shutdown_manager
+from app.db.change_tracking import mark_changed
+from app.db.models.message import OPEN_REQUEST_STATUSES, Message as MessageDB
+from app.db.models.message_archive import MessageArchive
+from app.db.session import async_session
+
+
+RETENTION_DAYS = {
+    MessageType.SERVICE: settings.MESSAGE_RETENTION_SERVICE_DAYS,
+    MessageType.REQUEST: settings.MESSAGE_RETENTION_REQUEST_DAYS,
+    MessageType.TASK: settings.MESSAGE_RETENTION_TASK_DAYS,
+    MessageType.INFO: settings.MESSAGE_RETENTION_INFO_DAYS,
+    MessageType.INFO_REPLY: settings.MESSAGE_RETENTION_INFO_REPLY_DAYS,
+    MessageType.SPAM: settings.MESSAGE_RETENTION_SPAM_DAYS,
+}
+
+ARCHIVED_COLUMNS = (
+    "id",
+    "user_id",
+    "chat_id",
+    "thread_id",
+    "message_id",
+    "destination_chat_id",
+    "destination_thread_id",
+    "destination_message_id",
+    "type",
+    "status",
+    "created_at",
+)
+
+
+def has_open_request() -> ColumnElement[bool]:
+    # A request is one source message forwarded to a destination chat: the
+    # forwarded copy and its service message share the source key, and the
+    # status reference sent back points at the service message. Any row tied
+    # to an open service row is kept so routing and status changes still work.
+    open_service = aliased(MessageDB)
+
+    return exists().where(
+        open_service.type == MessageType.SERVICE,
+        open_service.status.in_(OPEN_REQUEST_STATUSES),
+        or_(
+            and_(
+                open_service.chat_id == MessageDB.chat_id,
+                open_service.message_id == MessageDB.message_id,
+                open_service.destination_chat_id == MessageDB.destination_chat_id,
+            ),
+            and_(
+                open_service.chat_id == MessageDB.destination_chat_id,
+                open_service.message_id == MessageDB.destination_message_id,
+            ),
+            and_(
+                open_service.destination_chat_id == MessageDB.chat_id,
+                open_service.destination_message_id == MessageDB.message_id,
+            ),
+        ),
+    )
+
+
+def expired_condition(type: MessageType, now: datetime) -> ColumnElement[bool] | None:
+    days = RETENTION_DAYS[type]
+    if days <= 0:
+        return None
+
+    condition = (MessageDB.type == type) & (
+        MessageDB.created_at < now - timedelta(days=days)
+    )
+
+    if type == MessageType.SERVICE:
+        # Open requests stay live for pending lists and status buttons
+        condition &= or_(
+            MessageDB.status.is_(None),
+            MessageDB.status == MessageStatus.COMPLETED,
+        )
+
+    return condition & ~has_open_request()
+
+
+async def archive_batch(
+    db: AsyncSession, condition: ColumnElement[bool], batch_size: int
+) -> int:
+    ids_result = await db.execute(
+        select(MessageDB.id).where(condition).order_by(MessageDB.id).limit(batch_size)
+    )
+    ids = ids_result.scalars().all()
+
+    if not ids:
+        return 0
+
+    await db.execute(
+        insert(MessageArchive).from_select(
+            ARCHIVED_COLUMNS,
+            select(*(getattr(MessageDB, column) for column in ARCHIVED_COLUMNS)).where(
+                MessageDB.id.in_(ids)
+            ),
+        )
+    )
+    await db.execute(delete(MessageDB).where(MessageDB.id.in_(ids)))
+
+    # Cached reply routes may point at the deleted rows
+    mark_changed(db, REPLY_ROUTES_TAG)
+
+    return len(ids)
+
+
+async def archive_expired_messages(
+    batch_size: int = settings.MESSAGE_RETENTION_BATCH_SIZE,
+) -> dict[MessageType, int]:
+    now = datetime.now(timezone.utc)
+    archived: dict[MessageType, int] = {}
+
+    for type in MessageType:
+        condition = expired_condition(type, now)
+        if condition is None:
+            continue
+
+        # Every batch is its own transaction so locks stay short and a
+        # shutdown only waits for the batch in flight
+        while shutdown_manager.is_accepting:
+            async with shutdown_manager.track():
+                async with async_session() as db:
+                    async with db.begin():
+                        count = await archive_batch(db, condition, batch_size)
+
+            if count:
+                archived[type] = archived.get(type, 0) + count
+
+            if count < batch_size:
+                break
+
+    return archived
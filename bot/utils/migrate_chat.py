@@ -1,11 +1,16 @@
 from aiogram.types import Message as TelegramMessage
 from aiogram.enums import ChatType
-from sqlalchemy import update
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import chat_tag, organization_tag
+from app.core.invalidation import invalidation_bus
 from app.db.models.chat import Chat
 from app.db.models.message import Message
 from app.db.models.organization import Organization
+from app.db.models.pending_counter import PendingCounter
+from app.db.models.request_state import RequestState
+from app.db.snapshots import OrganizationSnapshot
 from bot.middlewares.db_session import LazyDbSession
 from bot.utils.captains import get_captain
 from bot.utils.set_bot_commands import (
@@ -17,7 +22,7 @@ from bot.utils.set_bot_commands import (
 async def migrate_chat(
     db: AsyncSession,
     message: TelegramMessage,
-    organization: Organization,
+    organization: OrganizationSnapshot,
 ) -> None:
     user = message.from_user
     if user is None or message.bot is None:
@@ -106,6 +111,13 @@ async def auto_migrate(message: TelegramMessage, lazy_db: LazyDbSession) -> None
         db = await lazy_db.get()
 
         await db.execute(update(Chat).where(Chat.id == chat_id).values(id=migrate_id))
+
+        # Cached organizations are tagged by id only, so the ones whose admin
+        # chat moves are invalidated explicitly
+        result = await db.execute(
+            select(Organization.id).where(Organization.admin_chat_id == chat_id)
+        )
+        organization_ids = result.scalars().all()
         await db.execute(
             update(Organization)
             .where(Organization.admin_chat_id == chat_id)
@@ -119,4 +131,26 @@ async def auto_migrate(message: TelegramMessage, lazy_db: LazyDbSession) -> None
             .where(Message.destination_chat_id == chat_id)
             .values(destination_chat_id=migrate_id)
         )
+        await db.execute(
+            update(PendingCounter)
+            .where(PendingCounter.destination_chat_id == chat_id)
+            .values(destination_chat_id=migrate_id)
+        )
+        await db.execute(
+            update(RequestState)
+            .where(RequestState.chat_id == chat_id)
+            .values(chat_id=migrate_id)
+        )
+        await db.execute(
+            update(RequestState)
+            .where(RequestState.destination_chat_id == chat_id)
+            .values(destination_chat_id=migrate_id)
+        )
         await db.commit()
+        await invalidation_bus.publish(
+            chat_tag(chat_id),
+            *(
+                organization_tag(organization_id)
+                for organization_id in organization_ids
+            ),
+        )
@@ -0,0 +1,160 @@
+import heapq
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.core.logger import logger
+from app.core.settings import settings
+from app.db.snapshots import OrganizationSnapshot
+
+
+ScheduleKey = tuple[time | None, str | None]
+
+
+def get_timezone(name: str | None) -> ZoneInfo | None:
+    if not name:
+        return None
+
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def notification_timezone(organization: OrganizationSnapshot) -> ZoneInfo:
+    zone = get_timezone(organization.daily_notification_timezone)
+    if zone is not None:
+        return zone
+
+    if organization.daily_notification_timezone:
+        logger.warning(
+            f"Unknown timezone {organization.daily_notification_timezone} "
+            f"for org {organization.id}, using the default"
+        )
+
+    return ZoneInfo(settings.DAILY_PENDING_NOTIFICATION_TIMEZONE)
+
+
+def notification_time(organization: OrganizationSnapshot) -> tuple[time, timedelta]:
+    if organization.daily_notification_time is not None:
+        return organization.daily_notification_time, timedelta()
+
+    # Organizations on the default time are spread over a window instead of
+    # all firing in the same second
+    spread = max(settings.DAILY_NOTIFICATION_SPREAD, 1)
+    return (
+        time(settings.DAILY_PENDING_NOTIFICATION_HOUR),
+        timedelta(seconds=organization.id % spread),
+    )
+
+
+def next_notification_time(
+    organization: OrganizationSnapshot, now: datetime
+) -> datetime:
+    zone = notification_timezone(organization)
+    at, offset = notification_time(organization)
+    day = now.astimezone(zone).date()
+
+    # Calendar arithmetic on the local date, so month ends and DST changes
+    # land on the right wall-clock time
+    while True:
+        run = datetime.combine(day, at, tzinfo=zone) + offset
+        run_utc = run.astimezone(timezone.utc)
+        if run_utc > now:
+            return run_utc
+
+        day += timedelta(days=1)
+
+
+def schedule_key(organization: OrganizationSnapshot) -> ScheduleKey:
+    return (
+        organization.daily_notification_time,
+        organization.daily_notification_timezone,
+    )
+
+
+class DailyNotificationScheduler:
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int]] = []
+        self._runs: dict[int, tuple[datetime, ScheduleKey]] = {}
+        self._organizations: dict[int, OrganizationSnapshot] = {}
+        self.refreshed_at: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def _schedule(self, organization: OrganizationSnapshot, run: datetime) -> None:
+        self._runs[organization.id] = (run, schedule_key(organization))
+        self._organizations[organization.id] = organization
+        heapq.heappush(self._heap, (run, organization.id))
+
+    def reset(self) -> None:
+        self._heap = []
+        self._runs = {}
+        self._organizations = {}
+        self.refreshed_at = None
+
+    def is_stale(self, now: datetime) -> bool:
+        return self.refreshed_at is None or now - self.refreshed_at >= timedelta(
+            seconds=settings.DAILY_NOTIFICATION_SCHEDULE_REFRESH
+        )
+
+    def refresh(self, organizations: list[OrganizationSnapshot], now: datetime) -> None:
+        # Organizations keep their pending run unless their schedule changed,
+        # so a run that came due during a slow batch is not pushed to tomorrow
+        previous = self._runs
+        self._heap = []
+        self._runs = {}
+        self._organizations = {}
+
+        for organization in organizations:
+            scheduled = previous.get(organization.id)
+            if scheduled is not None and scheduled[1] == schedule_key(organization):
+                run = scheduled[0]
+            else:
+                run = next_notification_time(organization, now)
+
+            self._schedule(organization, run)
+
+        self.refreshed_at = now
+
+    def next_run(self) -> datetime | None:
+        while self._heap:
+            run, organization_id = self._heap[0]
+            scheduled = self._runs.get(organization_id)
+            if scheduled is not None and scheduled[0] == run:
+                return run
+
+            heapq.heappop(self._heap)
+
+        return None
+
+    def pop_due(self, now: datetime) -> list[OrganizationSnapshot]:
+        due: list[OrganizationSnapshot] = []
+
+        while (run := self.next_run()) is not None and run <= now:
+            _, organization_id = heapq.heappop(self._heap)
+            organization = self._organizations[organization_id]
+            due.append(organization)
+
+            # Scheduling from now rather than from the missed run means a late
+            # wake-up fires once instead of catching up day by day
+            self._schedule(organization, next_notification_time(organization, now))
+
+        return due
+
+
+def format_notification_time(organization: OrganizationSnapshot) -> str:
+    if organization.daily_notification_time is None:
+        return (
+            f"{settings.DAILY_PENDING_NOTIFICATION_HOUR:02}:00 "
+            f"({settings.DAILY_PENDING_NOTIFICATION_TIMEZONE}, за замовчуванням)"
+        )
+
+    zone = (
+        organization.daily_notification_timezone
+        or settings.DAILY_PENDING_NOTIFICATION_TIMEZONE
+    )
+    return f"{organization.daily_notification_time:%H:%M} ({zone})"
+
+
+daily_notification_scheduler = DailyNotificationScheduler()
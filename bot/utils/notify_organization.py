@@ -2,11 +2,12 @@ from aiogram import Bot
 from app.core.crypto import crypto
 from app.core.enums import CryptoInfo
 from app.db.models.organization import Organization
+from app.db.snapshots import OrganizationSnapshot
 from bot.root_bot import ROOT_BOT
 
 
 async def notify_organization(
-    organization: Organization,
+    organization: Organization | OrganizationSnapshot,
     text: str,
     delete_webhook: bool = False,
     parse_mode: str | None = None,
@@ -0,0 +1,411 @@
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Collection, Mapping, Sequence
+from sqlalchemy import Row, Select, delete, event, func, inspect, or_, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.enums import MessageStatus, MessageType
+from app.core.settings import settings
+from app.db.models.message import (
+    OPEN_REQUEST_STATUSES,
+    Message as MessageDB,
+    is_open_request,
+)
+from app.db.models.pending_counter import PendingCounter
+from app.db.session import engine
+from app.db.upsert import dialect_insert
+
+
+CounterKey = tuple[int, int, MessageStatus, bool]
+PendingCounts = dict[tuple[MessageStatus, bool], int]
+
+
+def select_open_requests(
+    destination_chat_id: int,
+    destination_thread_id: int | None = None,
+    *,
+    include_unthreaded: bool = False,
+    status: MessageStatus | None = None,
+    is_outgoing: bool | None = None,
+    after_id: int | None = None,
+    before_id: int | None = None,
+    descending: bool = False,
+) -> Select[int, int, int | None, int, datetime]:
+    conditions = [MessageDB.destination_chat_id == destination_chat_id, is_open_request]
+
+    if destination_thread_id:
+        if include_unthreaded:
+            conditions.append(
+                or_(
+                    MessageDB.destination_thread_id == destination_thread_id,
+                    MessageDB.destination_thread_id.is_(None),
+                )
+            )
+        else:
+            conditions.append(MessageDB.destination_thread_id == destination_thread_id)
+
+    if status is not None:
+        conditions.append(MessageDB.status == status)
+
+    if is_outgoing is not None:
+        conditions.append(MessageDB.is_status_reference.is_(is_outgoing))
+
+    if after_id is not None:
+        conditions.append(MessageDB.id > after_id)
+
+    if before_id is not None:
+        conditions.append(MessageDB.id < before_id)
+
+    # Only the columns needed to link the request, so rows can be streamed
+    return (
+        select(
+            MessageDB.id,
+            MessageDB.destination_chat_id,
+            MessageDB.destination_thread_id,
+            MessageDB.destination_message_id,
+            MessageDB.created_at,
+        )
+        .where(*conditions)
+        .order_by(MessageDB.id.desc() if descending else MessageDB.id)
+    )
+
+
+PendingSection = tuple[MessageStatus, bool]
+PendingRow = Row[int, int, int | None, int, datetime]
+
+
+@dataclass(frozen=True, slots=True)
+class PendingScope:
+    destination_chat_id: int
+    destination_thread_id: int | None = None
+    include_unthreaded: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class PendingPage:
+    rows: list[tuple[int, PendingRow]]
+    has_prev: bool
+    has_next: bool
+    # Position of the first row within its section, for continuous numbering
+    first_number: int
+
+
+async def scan_sections(
+    db: AsyncSession,
+    scope: PendingScope,
+    sections: Sequence[PendingSection],
+    section: int,
+    bound_id: int | None,
+    forward: bool,
+    limit: int,
+) -> list[tuple[int, PendingRow]]:
+    # Keyset walk over sections in display order; the bound only applies to
+    # the section the cursor is in, later sections are read from their edge
+    indexes = range(section, len(sections)) if forward else range(section, -1, -1)
+    rows: list[tuple[int, PendingRow]] = []
+
+    for index in indexes:
+        status, is_outgoing = sections[index]
+        bound = bound_id if index == section else None
+        stmt = select_open_requests(
+            scope.destination_chat_id,
+            scope.destination_thread_id,
+            include_unthreaded=scope.include_unthreaded,
+            status=status,
+            is_outgoing=is_outgoing,
+            after_id=bound if forward else None,
+            before_id=None if forward else bound,
+            descending=not forward,
+        ).limit(limit - len(rows))
+
+        result = await db.execute(stmt)
+        rows.extend((index, row) for row in result.all())
+
+        if len(rows) >= limit:
+            break
+
+    return rows
+
+
+async def fetch_pending_page(
+    db: AsyncSession,
+    scope: PendingScope,
+    sections: Sequence[PendingSection],
+    section: int = 0,
+    bound_id: int | None = None,
+    forward: bool = True,
+    page_size: int = settings.PENDING_PAGE_SIZE,
+) -> PendingPage:
+    rows = await scan_sections(
+        db, scope, sections, section, bound_id, forward, page_size
+    )
+
+    if not forward:
+        rows.reverse()
+
+    # Requests resolved since the page was shown can leave a short or empty
+    # page behind the cursor, so start over from the first one
+    if (not forward and len(rows) < page_size) or (not rows and bound_id):
+        rows = await scan_sections(db, scope, sections, 0, None, True, page_size)
+
+    if not rows:
+        return PendingPage(rows=[], has_prev=False, has_next=False, first_number=1)
+
+    first_section, first_row = rows[0]
+    last_section, last_row = rows[-1]
+
+    has_prev = bool(
+        await scan_sections(db, scope, sections, first_section, first_row.id, False, 1)
+    )
+    has_next = bool(
+        await scan_sections(db, scope, sections, last_section, last_row.id, True, 1)
+    )
+
+    status, is_outgoing = sections[first_section]
+    preceding = select_open_requests(
+        scope.destination_chat_id,
+        scope.destination_thread_id,
+        include_unthreaded=scope.include_unthreaded,
+        status=status,
+        is_outgoing=is_outgoing,
+        before_id=first_row.id,
+    ).subquery()
+    preceding_result = await db.execute(select(func.count()).select_from(preceding))
+
+    return PendingPage(
+        rows=rows,
+        has_prev=has_prev,
+        has_next=has_next,
+        first_number=preceding_result.scalar_one() + 1,
+    )
+
+
+async def count_open_requests(
+    db: AsyncSession,
+    destination_chat_id: int,
+    destination_thread_id: int | None = None,
+    *,
+    include_unthreaded: bool = False,
+) -> PendingCounts:
+    conditions = [PendingCounter.destination_chat_id == destination_chat_id]
+
+    if destination_thread_id:
+        threads = (
+            [destination_thread_id, 0]
+            if include_unthreaded
+            else [destination_thread_id]
+        )
+        conditions.append(PendingCounter.destination_thread_id.in_(threads))
+
+    result = await db.execute(
+        select(
+            PendingCounter.status,
+            PendingCounter.is_outgoing,
+            func.sum(PendingCounter.count),
+        )
+        .where(*conditions)
+        .group_by(PendingCounter.status, PendingCounter.is_outgoing)
+    )
+
+    return {
+        (status, is_outgoing): count
+        for status, is_outgoing, count in result.tuples()
+        if count > 0
+    }
+
+
+async def count_open_requests_by_thread(
+    db: AsyncSession, destination_chat_ids: Collection[int]
+) -> dict[int, dict[int, int]]:
+    result = await db.execute(
+        select(
+            PendingCounter.destination_chat_id,
+            PendingCounter.destination_thread_id,
+            func.sum(PendingCounter.count),
+        )
+        .where(PendingCounter.destination_chat_id.in_(destination_chat_ids))
+        .group_by(
+            PendingCounter.destination_chat_id, PendingCounter.destination_thread_id
+        )
+    )
+
+    totals: dict[int, dict[int, int]] = {}
+    for chat_id, thread_id, count in result.tuples():
+        if count > 0:
+            totals.setdefault(chat_id, {})[thread_id] = count
+
+    return totals
+
+
+def scope_total(thread_totals: Mapping[int, int], scope: PendingScope) -> int:
+    if not scope.destination_thread_id:
+        return sum(thread_totals.values())
+
+    total = thread_totals.get(scope.destination_thread_id, 0)
+    if scope.include_unthreaded:
+        total += thread_totals.get(0, 0)
+
+    return total
+
+
+def counter_key(
+    destination_chat_id: int,
+    destination_thread_id: int | None,
+    type: MessageType,
+    status: MessageStatus | None,
+    is_status_reference: bool | None,
+) -> CounterKey | None:
+    if type != MessageType.SERVICE or status not in OPEN_REQUEST_STATUSES:
+        return None
+
+    return (
+        destination_chat_id,
+        destination_thread_id or 0,
+        status,
+        bool(is_status_reference),
+    )
+
+
+COUNTER_FIELDS = (
+    "destination_chat_id",
+    "destination_thread_id",
+    "type",
+    "status",
+    "is_status_reference",
+)
+
+
+def current_key(message: MessageDB) -> CounterKey | None:
+    return counter_key(*(getattr(message, field) for field in COUNTER_FIELDS))
+
+
+def previous_key(message: MessageDB) -> CounterKey | None:
+    state = inspect(message)
+    values = []
+
+    for field in COUNTER_FIELDS:
+        history = state.attrs[field].history
+        values.append(
+            history.deleted[0] if history.deleted else getattr(message, field)
+        )
+
+    return counter_key(*values)
+
+
+def upsert_counter(key: CounterKey, delta: int) -> postgresql.Insert | sqlite.Insert:
+    stmt = dialect_insert(PendingCounter).values(
+        destination_chat_id=key[0],
+        destination_thread_id=key[1],
+        status=key[2],
+        is_outgoing=key[3],
+        count=delta,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            PendingCounter.destination_chat_id,
+            PendingCounter.destination_thread_id,
+            PendingCounter.status,
+            PendingCounter.is_outgoing,
+        ],
+        set_={"count": PendingCounter.count + stmt.excluded.count},
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _track_pending_counters(session: Session, flush_context: Any) -> None:
+    # Counters are updated in the flushing transaction, so they commit or roll
+    # back together with the status change
+    deltas: Counter[CounterKey] = Counter()
+
+    for obj in session.new:
+        if isinstance(obj, MessageDB) and (key := current_key(obj)):
+            deltas[key] += 1
+
+    for obj in session.dirty:
+        if isinstance(obj, MessageDB):
+            old_key, new_key = previous_key(obj), current_key(obj)
+            if old_key != new_key:
+                if old_key:
+                    deltas[old_key] -= 1
+                if new_key:
+                    deltas[new_key] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, MessageDB) and (key := previous_key(obj)):
+            deltas[key] -= 1
+
+    if not deltas:
+        return
+
+    connection = session.connection()
+    for key, delta in sorted(deltas.items()):
+        if delta:
+            connection.execute(upsert_counter(key, delta))
+
+
+async def reconcile_pending_counters(db: AsyncSession) -> int:
+    if engine.dialect.name == "postgresql":
+        # Waits for in-flight counter updates and holds new ones back until the
+        # corrected values are committed
+        await db.execute(
+            text("LOCK TABLE pending_counters IN SHARE ROW EXCLUSIVE MODE")
+        )
+
+    thread_id = func.coalesce(MessageDB.destination_thread_id, 0)
+    is_outgoing = func.coalesce(MessageDB.is_status_reference, False)
+    actual_result = await db.execute(
+        select(
+            MessageDB.destination_chat_id,
+            thread_id,
+            MessageDB.status,
+            is_outgoing,
+            func.count(),
+        )
+        .where(is_open_request)
+        .group_by(
+            MessageDB.destination_chat_id, thread_id, MessageDB.status, is_outgoing
+        )
+    )
+    actual: dict[CounterKey, int] = {
+        (chat_id, thread, status, bool(outgoing)): count
+        for chat_id, thread, status, outgoing, count in actual_result.tuples()
+        if status is not None
+    }
+
+    stored_result = await db.execute(
+        select(
+            PendingCounter.destination_chat_id,
+            PendingCounter.destination_thread_id,
+            PendingCounter.status,
+            PendingCounter.is_outgoing,
+            PendingCounter.count,
+        )
+    )
+    stored: dict[CounterKey, int] = {
+        (chat_id, thread, status, outgoing): count
+        for chat_id, thread, status, outgoing, count in stored_result.tuples()
+    }
+
+    stale = [
+        key
+        for key in sorted(actual.keys() | stored.keys())
+        if stored.get(key) != actual.get(key)
+    ]
+
+    for key in stale:
+        await db.execute(
+            delete(PendingCounter).where(
+                PendingCounter.destination_chat_id == key[0],
+                PendingCounter.destination_thread_id == key[1],
+                PendingCounter.status == key[2],
+                PendingCounter.is_outgoing == key[3],
+            )
+        )
+
+        if key in actual:
+            await db.execute(upsert_counter(key, actual[key]))
+
+    return sum(1 for key in stale if stored.get(key, 0) != actual.get(key, 0))
@@ -1,50 +1,139 @@
-import asyncio
 from datetime import datetime, timezone
 from app.db.session import async_session
+from app.core.enums import MissedRunPolicy
 from app.core.logger import logger
+from app.core.scheduler import (
+    CronTrigger,
+    IntervalTrigger,
+    Job,
+    JobScheduler,
+    prune_job_history,
+)
 from app.core.settings import settings
 
-from bot.handlers.request.pending_handler import send_all_daily_pending_notifications
+from bot.middlewares.ban_middleware import ban_controller
+from bot.handlers.request.pending_handler import (
+    load_daily_notification_organizations,
+    send_daily_pending_notifications,
+)
 from bot.utils.captains import update_captains
+from bot.utils.message_retention import archive_expired_messages
+from bot.utils.notification_schedule import daily_notification_scheduler
+from bot.utils.pending_requests import reconcile_pending_counters
+from bot.utils.user_buffer import user_buffer
 
 
-async def periodic_data_update(interval_seconds: int = 43200) -> None:
-    while True:
-        try:
-            async with async_session() as db:
-                async with db.begin():
-                    await update_captains(db)
-        except Exception as e:
-            logger.error(e)
+async def captains_update_job() -> None:
+    async with async_session() as db:
+        async with db.begin():
+            await update_captains(db)
 
-        await asyncio.sleep(interval_seconds)
 
+async def message_retention_job() -> None:
+    archived = await archive_expired_messages()
+    if archived:
+        summary = ", ".join(
+            f"{type.value}: {count}" for type, count in archived.items()
+        )
+        logger.info(f"Archived expired messages ({summary})")
 
-async def daily_pending_notifications_task() -> None:
-    while True:
-        try:
-            now = datetime.now(timezone.utc)
-            target_hour = settings.DAILY_PENDING_NOTIFICATION_HOUR
 
-            next_run = now.replace(hour=target_hour, minute=0, second=0, microsecond=0)
+async def pending_counters_reconciliation_job() -> None:
+    async with async_session() as db:
+        async with db.begin():
+            corrected = await reconcile_pending_counters(db)
 
-            if now >= next_run:
-                next_run = next_run.replace(day=next_run.day + 1)
+    if corrected:
+        logger.warning(f"Corrected {corrected} drifted pending counters")
 
-            seconds_until_run = (next_run - now).total_seconds()
 
-            logger.info(
-                f"Next daily pending notification scheduled at {next_run} UTC ({seconds_until_run:.0f} seconds)"
+async def daily_pending_notifications_job() -> None:
+    now = datetime.now(timezone.utc)
+
+    if daily_notification_scheduler.is_stale(now):
+        async with async_session() as db:
+            organizations = await load_daily_notification_organizations(db)
+
+        daily_notification_scheduler.refresh(organizations, now)
+
+    due = daily_notification_scheduler.pop_due(now)
+    if not due:
+        return
+
+    logger.info(f"Daily pending notifications due for {len(due)} organizations")
+
+    async with async_session() as db:
+        async with db.begin():
+            # Settings may have changed since the last refresh
+            organizations = await load_daily_notification_organizations(
+                db, [org.id for org in due]
             )
+            await send_daily_pending_notifications(db, organizations)
 
-            await asyncio.sleep(seconds_until_run)
 
-            logger.info("Sending daily pending notifications")
-            async with async_session() as db:
-                async with db.begin():
-                    await send_all_daily_pending_notifications(db)
-            logger.info("Daily pending notifications sent successfully")
+def register_periodic_jobs(scheduler: JobScheduler) -> None:
+    scheduler.add_job(
+        Job(
+            name="captains_update",
+            func=captains_update_job,
+            trigger=IntervalTrigger(settings.CAPTAINS_UPDATE_INTERVAL),
+            jitter=settings.CAPTAINS_UPDATE_JITTER,
+            missed_run_policy=MissedRunPolicy.RUN_ONCE,
+        )
+    )
+    scheduler.add_job(
+        Job(
+            name="daily_pending_notifications",
+            func=daily_pending_notifications_job,
+            trigger=IntervalTrigger(settings.DAILY_NOTIFICATION_CHECK_INTERVAL),
+            history=False,
+            # A new leader builds its schedule from scratch instead of trusting
+            # runs it computed before another instance took over
+            on_start=daily_notification_scheduler.reset,
+        )
+    )
+    scheduler.add_job(
+        Job(
+            name="message_retention",
+            func=message_retention_job,
+            trigger=IntervalTrigger(settings.MESSAGE_RETENTION_INTERVAL),
+            missed_run_policy=MissedRunPolicy.RUN_ONCE,
+        )
+    )
+    # Runs on startup when overdue, so counters exist before the first /pending
+    scheduler.add_job(
+        Job(
+            name="pending_counters_reconciliation",
+            func=pending_counters_reconciliation_job,
+            trigger=IntervalTrigger(settings.PENDING_COUNTERS_RECONCILE_INTERVAL),
+            missed_run_policy=MissedRunPolicy.RUN_ONCE,
+        )
+    )
+    scheduler.add_job(
+        Job(
+            name="job_history_cleanup",
+            func=prune_job_history,
+            trigger=CronTrigger(settings.SCHEDULER_HISTORY_CLEANUP_CRON),
+            history=False,
+        )
+    )
 
-        except Exception as e:
-            logger.error(f"Error in daily pending notifications task: {e}")
-            await asyncio.sleep(3600)
+    # Buffers and ban lists are kept in memory, so every instance runs these
+    scheduler.add_job(
+        Job(
+            name="user_buffer_flush",
+            func=user_buffer.flush,
+            trigger=IntervalTrigger(settings.USER_BUFFER_FLUSH_INTERVAL),
+            leader_only=False,
+            history=False,
+        )
+    )
+    scheduler.add_job(
+        Job(
+            name="ban_reconciliation",
+            func=ban_controller.load,
+            trigger=IntervalTrigger(settings.BAN_RECONCILE_INTERVAL),
+            leader_only=False,
+            history=False,
+        )
+    )
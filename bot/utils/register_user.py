@@ -1,77 +1,59 @@
-from aiogram.types import User as TelegramUser
+from typing import Any, Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete, literal_column, select
+from sqlalchemy import delete, func, select
 
+from app.core.cache import user_tag
+from app.db.change_tracking import mark_changed
 from app.db.models.chat import Chat
 from app.db.models.chat_user import ChatUser
 from app.db.models.user import User
+from app.db.upsert import dialect_insert
 
 
-async def get_user_chat_info(
-    db: AsyncSession, user_id: int, chat_id: int
-) -> tuple[User | None, Chat | None, ChatUser | None]:
-    base = select(literal_column("1")).subquery()
-    stmt = (
-        select(User, Chat, ChatUser)
-        .select_from(base)
-        .join(User, User.id == user_id, isouter=True)
-        .join(
-            ChatUser,
-            (ChatUser.user_id == user_id) & (ChatUser.chat_id == chat_id),
-            isouter=True,
-        )
-        .join(Chat, Chat.id == chat_id, isouter=True)
-    )
-
-    result = await db.execute(stmt)
-    (user, chat, chat_user) = result.one()
+UPSERT_CHUNK_SIZE = 500
 
-    return user, chat, chat_user
 
+def chunked(rows: list[Any], size: int = UPSERT_CHUNK_SIZE) -> Iterable[list[Any]]:
+    for i in range(0, len(rows), size):
+        yield rows[i : i + size]
 
-async def register_user(db: AsyncSession, tg_user: TelegramUser) -> None:
-    stmt = select(User).where(User.id == tg_user.id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
 
-    if user:
-        user.username = tg_user.username
-        user.first_name = tg_user.first_name
-        user.last_name = tg_user.last_name
-    else:
-        user = User(
-            id=tg_user.id,
-            username=tg_user.username,
-            first_name=tg_user.first_name,
-            last_name=tg_user.last_name,
+async def upsert_users(db: AsyncSession, users: list[dict[str, Any]]) -> None:
+    for chunk in chunked(users):
+        stmt = dialect_insert(User).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={
+                "username": stmt.excluded.username,
+                "first_name": stmt.excluded.first_name,
+                "last_name": stmt.excluded.last_name,
+                "updated_at": func.now(),
+            },
+            where=(
+                User.username.is_distinct_from(stmt.excluded.username)
+                | User.first_name.is_distinct_from(stmt.excluded.first_name)
+                | User.last_name.is_distinct_from(stmt.excluded.last_name)
+            ),
         )
-        db.add(user)
+        await db.execute(stmt)
 
-    await db.commit()
 
+async def insert_chat_users(db: AsyncSession, pairs: list[tuple[int, int]]) -> None:
+    chat_ids = {chat_id for _, chat_id in pairs}
+    result = await db.execute(select(Chat.id).where(Chat.id.in_(chat_ids)))
+    existing_chats = set(result.scalars().all())
 
-async def register_chat_user(
-    db: AsyncSession, tg_user: TelegramUser, chat_id: int
-) -> None:
-    user, chat, chat_user = await get_user_chat_info(db, tg_user.id, chat_id)
-
-    if user is None:
-        user = User(
-            id=tg_user.id,
-            username=tg_user.username,
-            first_name=tg_user.first_name,
-            last_name=tg_user.last_name,
-        )
-        db.add(user)
-    else:
-        user.username = tg_user.username
-        user.first_name = tg_user.first_name
-        user.last_name = tg_user.last_name
+    rows = [
+        {"user_id": user_id, "chat_id": chat_id}
+        for user_id, chat_id in pairs
+        if chat_id in existing_chats
+    ]
 
-    if chat and chat_user is None:
-        db.add(ChatUser(user_id=tg_user.id, chat_id=chat_id))
+    for chunk in chunked(rows):
+        stmt = dialect_insert(ChatUser).values(chunk)
+        await db.execute(stmt.on_conflict_do_nothing())
 
-    await db.commit()
+    mark_changed(db, *(user_tag(row["user_id"]) for row in rows))
 
 
 async def delete_user_from_chat(db: AsyncSession, user_id: int, chat_id: int) -> None:
@@ -81,3 +63,4 @@ async def delete_user_from_chat(db: AsyncSession, user_id: int, chat_id: int) ->
             ChatUser.chat_id == chat_id,
         )
     )
+    mark_changed(db, user_tag(user_id))
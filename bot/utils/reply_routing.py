@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from sqlalchemy import func, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import REPLY_ROUTES_TAG, Cache, cache_registry, chat_tag
+from app.core.enums import MessageType
+from app.core.settings import settings
+from app.db.models.message import Message as MessageDB
+
+
+@dataclass(frozen=True, slots=True)
+class ReplyRoute:
+    id: int
+    user_id: int
+    chat_id: int
+    thread_id: int | None
+    message_id: int
+    destination_chat_id: int
+    destination_thread_id: int | None
+    destination_message_id: int
+    is_within_organization: bool
+    type: MessageType
+
+
+ROUTE_COLUMNS = (
+    MessageDB.id,
+    MessageDB.user_id,
+    MessageDB.chat_id,
+    MessageDB.thread_id,
+    MessageDB.message_id,
+    MessageDB.destination_chat_id,
+    MessageDB.destination_thread_id,
+    MessageDB.destination_message_id,
+    MessageDB.is_within_organization,
+    MessageDB.type,
+)
+
+RouteKey = tuple[int, int] | tuple[int, int, int]
+
+reply_route_cache: Cache[RouteKey, ReplyRoute] = cache_registry.create(
+    "reply_routes", settings.REPLY_ROUTE_CACHE_SIZE, settings.REPLY_ROUTE_CACHE_TTL
+)
+
+
+def remember_reply_route(key: RouteKey, route: ReplyRoute) -> None:
+    reply_route_cache.set(
+        key,
+        route,
+        (
+            chat_tag(route.chat_id),
+            chat_tag(route.destination_chat_id),
+            REPLY_ROUTES_TAG,
+        ),
+    )
+
+
+def remember_sent_message(message: MessageDB) -> None:
+    # The destination message was just sent, so no older row can share its key.
+    # The source key may belong to an earlier send of the same message, so it is
+    # left to be resolved by the database.
+    if message.type == MessageType.SERVICE:
+        return
+
+    route = ReplyRoute(
+        **{column.key: getattr(message, column.key) for column in ROUTE_COLUMNS}
+    )
+    remember_reply_route(
+        (route.destination_chat_id, route.destination_message_id), route
+    )
+
+
+async def find_reply_route(
+    db: AsyncSession, chat_id: int, reply_message_id: int, user_id: int
+) -> ReplyRoute | None:
+    # A destination row always predates any row that forwards the same message
+    # again, so a cached destination match is the lowest id for both keys
+    destination_key = (chat_id, reply_message_id)
+    source_key = (chat_id, reply_message_id, user_id)
+
+    cached = reply_route_cache.get(destination_key) or reply_route_cache.get(source_key)
+    if cached is not None:
+        return cached
+
+    # Each branch is served by its own composite index instead of an OR scan
+    first_id = union_all(
+        select(MessageDB.id).where(
+            MessageDB.destination_chat_id == chat_id,
+            MessageDB.destination_message_id == reply_message_id,
+            MessageDB.type != MessageType.SERVICE,
+        ),
+        select(MessageDB.id).where(
+            MessageDB.chat_id == chat_id,
+            MessageDB.message_id == reply_message_id,
+            MessageDB.user_id == user_id,
+            MessageDB.type.not_in((MessageType.SPAM, MessageType.SERVICE)),
+        ),
+    ).subquery()
+
+    result = await db.execute(
+        select(*ROUTE_COLUMNS).where(
+            MessageDB.id == select(func.min(first_id.c.id)).scalar_subquery()
+        )
+    )
+    row = result.mappings().one_or_none()
+
+    if row is None:
+        return None
+
+    route = ReplyRoute(**row)
+    if (
+        route.destination_chat_id == chat_id
+        and route.destination_message_id == reply_message_id
+    ):
+        remember_reply_route(destination_key, route)
+    else:
+        remember_reply_route(source_key, route)
+
+    return route
@@ -0,0 +1,87 @@
+import html
+from dataclasses import dataclass
+from typing import Iterable
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import CAPTAINS_TAG, ROUTING_TAG, Cache, cache_registry, user_tag
+from app.core.enums import ChatType
+from app.core.settings import settings
+from app.db.change_tracking import track_model_changes
+from app.db.models.chat import Chat
+from app.db.models.chat_captain import ChatCaptain
+from app.db.models.chat_user import ChatUser
+
+
+@dataclass(frozen=True, slots=True)
+class RequesterContext:
+    info: str | None
+
+
+requester_context_cache: Cache[int, RequesterContext] = cache_registry.create(
+    "requester_contexts",
+    settings.REQUESTER_CONTEXT_CACHE_SIZE,
+    settings.REQUESTER_CONTEXT_CACHE_TTL,
+)
+
+track_model_changes(CAPTAINS_TAG, ChatCaptain)
+
+
+async def prefetch_requester_contexts(
+    db: AsyncSession, user_ids: Iterable[int]
+) -> dict[int, str | None]:
+    contexts: dict[int, str | None] = {}
+    missing: set[int] = set()
+
+    for user_id in user_ids:
+        context = requester_context_cache.get(user_id)
+        if context is None:
+            missing.add(user_id)
+        else:
+            contexts[user_id] = context.info
+
+    if not missing:
+        return contexts
+
+    generation = requester_context_cache.generation
+    loaded: dict[int, str] = {}
+
+    captains_result = await db.execute(
+        select(ChatCaptain.connected_user_id, ChatCaptain.chat_title).where(
+            ChatCaptain.connected_user_id.in_(missing)
+        )
+    )
+    for captain_user_id, chat_title in captains_result.tuples().all():
+        if captain_user_id is not None:
+            loaded.setdefault(captain_user_id, f"Староста {html.escape(chat_title)}")
+
+    students = missing - loaded.keys()
+    if students:
+        chats_result = await db.execute(
+            select(ChatUser.user_id, Chat.title)
+            .join(Chat, ChatUser.chat_id == Chat.id)
+            .where(ChatUser.user_id.in_(students), Chat.type == ChatType.EXTERNAL)
+        )
+        for user_id, chat_title in chats_result.tuples().all():
+            loaded.setdefault(user_id, f"Студент {html.escape(chat_title)}")
+
+    # Skip caching if captains, chats or memberships changed during the queries
+    is_fresh = requester_context_cache.generation == generation
+
+    for user_id in missing:
+        info = loaded.get(user_id)
+        contexts[user_id] = info
+
+        if is_fresh:
+            requester_context_cache.set(
+                user_id,
+                RequesterContext(info),
+                tags=(user_tag(user_id), CAPTAINS_TAG, ROUTING_TAG),
+            )
+
+    return contexts
+
+
+async def get_requester_context(db: AsyncSession, user_id: int) -> str | None:
+    contexts = await prefetch_requester_contexts(db, (user_id,))
+    return contexts[user_id]
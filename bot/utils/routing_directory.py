@@ -0,0 +1,178 @@
+import asyncio
+from dataclasses import dataclass
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.core.cache import ROUTING_TAG, Cache, cache_registry
+from app.core.enums import ChatType, VisibilityLevel
+from app.core.settings import settings
+from app.db.models.chat import Chat
+from app.db.models.chat_thread import ChatThread
+from app.db.models.organization import Organization
+from app.db.models.telegram_bot import TelegramBot
+from app.db.change_tracking import track_model_changes
+from app.db.session import async_session
+from app.db.snapshots import ChatSnapshot, ChatThreadSnapshot, OrganizationSnapshot
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingDirectory:
+    organizations: dict[int, OrganizationSnapshot]
+    chats: dict[int, ChatSnapshot]
+    internal_chats: dict[int, tuple[ChatSnapshot, ...]]
+    threads: dict[int, tuple[ChatThreadSnapshot, ...]]
+    public_chat_organizations: frozenset[int]
+    admin_chats: dict[int, int]
+
+    def get_chat(
+        self, chat_id: int, organization_id: int | None = None
+    ) -> ChatSnapshot | None:
+        chat = self.chats.get(chat_id)
+        if chat is None:
+            return None
+
+        if organization_id is not None and chat.organization_id != organization_id:
+            return None
+
+        return chat
+
+    def organization_for_chat(self, chat_id: int) -> OrganizationSnapshot | None:
+        chat = self.chats.get(chat_id)
+        organization_id = (
+            chat.organization_id if chat else self.admin_chats.get(chat_id)
+        )
+
+        if organization_id is None:
+            return None
+
+        return self.organizations.get(organization_id)
+
+    def get_thread(self, chat_id: int, thread_id: int) -> ChatThreadSnapshot | None:
+        for thread in self.threads.get(chat_id, ()):
+            if thread.id == thread_id:
+                return thread
+
+        return None
+
+    def get_internal_chats(self, organization_id: int) -> tuple[ChatSnapshot, ...]:
+        return self.internal_chats.get(organization_id, ())
+
+    def get_threads(self, chat_id: int) -> tuple[ChatThreadSnapshot, ...]:
+        return self.threads.get(chat_id, ())
+
+    def verified_organizations(self) -> list[OrganizationSnapshot]:
+        return [
+            org
+            for org in self.organizations.values()
+            if org.id != 0 and org.is_verified
+        ]
+
+    def is_reachable(self, organization: OrganizationSnapshot) -> bool:
+        return bool(
+            organization.is_admins_accept_messages and organization.admin_chat_id
+        ) or (organization.id in self.public_chat_organizations)
+
+    def external_organizations(
+        self, organization_id: int
+    ) -> list[OrganizationSnapshot]:
+        return [
+            org
+            for org in self.organizations.values()
+            if org.id != organization_id and org.is_verified and not org.is_private
+        ]
+
+
+async def load_routing_directory() -> RoutingDirectory:
+    async with async_session() as db:
+        organizations_result = await db.execute(
+            select(Organization)
+            .options(joinedload(Organization.bot))
+            .order_by(Organization.title)
+        )
+        organizations = organizations_result.scalars().all()
+
+        chats_result = await db.execute(select(Chat).order_by(Chat.id))
+        chats = chats_result.scalars().all()
+
+        threads_result = await db.execute(
+            select(ChatThread).order_by(ChatThread.chat_id, ChatThread.id)
+        )
+        threads = threads_result.scalars().all()
+
+    internal_chats: dict[int, list[ChatSnapshot]] = {}
+    public_chat_organizations: set[int] = set()
+    chat_snapshots: dict[int, ChatSnapshot] = {}
+
+    for chat in chats:
+        snapshot = ChatSnapshot.from_model(chat)
+        chat_snapshots[chat.id] = snapshot
+
+        if snapshot.type != ChatType.INTERNAL:
+            continue
+
+        internal_chats.setdefault(snapshot.organization_id, []).append(snapshot)
+        if snapshot.visibility_level == VisibilityLevel.PUBLIC:
+            public_chat_organizations.add(snapshot.organization_id)
+
+    chat_threads: dict[int, list[ChatThreadSnapshot]] = {}
+    for thread in threads:
+        chat_threads.setdefault(thread.chat_id, []).append(
+            ChatThreadSnapshot.from_model(thread)
+        )
+
+    return RoutingDirectory(
+        organizations={
+            org.id: OrganizationSnapshot.from_model(org) for org in organizations
+        },
+        chats=chat_snapshots,
+        internal_chats={
+            org_id: tuple(org_chats) for org_id, org_chats in internal_chats.items()
+        },
+        threads={
+            chat_id: tuple(thread_list) for chat_id, thread_list in chat_threads.items()
+        },
+        public_chat_organizations=frozenset(public_chat_organizations),
+        admin_chats={
+            org.admin_chat_id: org.id
+            for org in organizations
+            if org.admin_chat_id is not None
+        },
+    )
+
+
+class RoutingDirectoryCache:
+    def __init__(self, ttl: int) -> None:
+        self._cache: Cache[int, RoutingDirectory] = cache_registry.create(
+            "routing_directory", 1, ttl
+        )
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> RoutingDirectory:
+        directory = self._cache.get(0)
+        if directory is not None:
+            return directory
+
+        async with self._lock:
+            directory = self._cache.get(0)
+            if directory is not None:
+                return directory
+
+            generation = self._cache.generation
+            directory = await load_routing_directory()
+
+            # Do not cache a directory that was loaded concurrently with a change
+            if self._cache.generation == generation:
+                self.set(directory)
+
+        return directory
+
+    def set(self, directory: RoutingDirectory) -> None:
+        self._cache.set(0, directory, tags=(ROUTING_TAG,))
+
+    def is_current(self, directory: RoutingDirectory) -> bool:
+        return self._cache.peek(0) is directory
+
+
+routing_directory = RoutingDirectoryCache(settings.ROUTING_DIRECTORY_TTL)
+
+track_model_changes(ROUTING_TAG, Organization, TelegramBot, Chat, ChatThread)
@@ -0,0 +1,358 @@
+from typing import Callable, Hashable
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from app.core.cache import ROUTING_TAG, Cache, cache_registry
+from app.core.enums import MessageType, VisibilityLevel
+from app.core.settings import settings
+from app.db.snapshots import ChatSnapshot, ChatThreadSnapshot, OrganizationSnapshot
+from bot.callback import MainCallback, MessageCallback
+from bot.utils.routing_directory import RoutingDirectory, routing_directory
+from bot.utils.visibility_resolver import get_reachability
+
+
+Menu = tuple[str, InlineKeyboardMarkup | None]
+
+keyboard_cache: Cache[Hashable, Menu] = cache_registry.create(
+    "send_keyboards", settings.KEYBOARD_CACHE_SIZE, settings.KEYBOARD_CACHE_TTL
+)
+
+
+class ColumnKeyboardBuilder:
+    # InlineKeyboardBuilder deep-copies its markup on every button, which is
+    # quadratic for menus listing every organization
+    def __init__(self) -> None:
+        self._rows: list[list[InlineKeyboardButton]] = []
+
+    def button(self, text: str, callback_data: CallbackData) -> None:
+        self._rows.append(
+            [InlineKeyboardButton(text=text, callback_data=callback_data.pack())]
+        )
+
+    def as_markup(self) -> InlineKeyboardMarkup:
+        return InlineKeyboardMarkup(inline_keyboard=self._rows)
+
+
+def viewer_role(organization: OrganizationSnapshot, chat_id: int) -> int | str:
+    return "admin" if organization.admin_chat_id == chat_id else chat_id
+
+
+def cached_menu(
+    directory: RoutingDirectory, key: Hashable, build: Callable[[], Menu]
+) -> Menu:
+    menu = keyboard_cache.get(key)
+    if menu is not None:
+        return menu
+
+    menu = build()
+
+    if routing_directory.is_current(directory):
+        keyboard_cache.set(key, menu, tags=(ROUTING_TAG,))
+
+    return menu
+
+
+def build_root_admin_menu(directory: RoutingDirectory, type: MessageType) -> Menu:
+    orgs_admin = directory.verified_organizations()
+
+    if not orgs_admin:
+        return "❌ Верифіковані організації відсутні", None
+
+    kb = ColumnKeyboardBuilder()
+    for org in orgs_admin:
+        kb.button(
+            text=org.title,
+            callback_data=MessageCallback(
+                action="select_org",
+                data=str(org.id),
+                type=type,
+            ),
+        )
+
+    kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
+
+    return "Оберіть організацію:", kb.as_markup()
+
+
+def build_org_chats_menu(
+    directory: RoutingDirectory,
+    organization: OrganizationSnapshot,
+    chat_id: int,
+    organization_id: int,
+    type: MessageType,
+) -> Menu:
+    available_chats: list[ChatSnapshot] = []
+
+    if organization.id == 0:
+        if organization.admin_chat_id != chat_id:
+            return "❌ Не вдалось ідентифікувати ваш чат", None
+
+        if organization_id == 0:
+            return build_root_admin_menu(directory, type)
+    else:
+        chats = directory.get_internal_chats(organization_id)
+
+        if organization.id == organization_id and organization.admin_chat_id == chat_id:
+            available_chats = list(chats)
+        else:
+            reachability = get_reachability(directory, organization, chat_id)
+            current_chat: ChatSnapshot | None = None
+            for chat in chats:
+                if chat.id == chat_id:
+                    current_chat = chat
+                elif reachability.can_send_to_chat(chat.id):
+                    available_chats.append(chat)
+
+            if (
+                organization.id == organization_id
+                and not current_chat
+                and not organization.admin_chat_id == chat_id
+            ):
+                return "❌ Не вдалось ідентифікувати ваш чат", None
+
+    if organization.id == 0:
+        target_org = directory.organizations.get(organization_id)
+
+        if target_org is None:
+            return "❌ Організація не існує", None
+
+        kb = ColumnKeyboardBuilder()
+
+        if target_org.admin_chat_id is not None:
+            kb.button(
+                text=f"Адміністратори {target_org.title}",
+                callback_data=MessageCallback(
+                    action="select_admin_chat",
+                    data=str(organization_id),
+                    type=type,
+                ),
+            )
+
+        for chat in directory.get_internal_chats(organization_id):
+            kb.button(
+                text=chat.title,
+                callback_data=MessageCallback(
+                    action="select_chat",
+                    data=str(chat.id),
+                    type=type,
+                ),
+            )
+
+        kb.button(
+            text="⬅️ Назад",
+            callback_data=MessageCallback(action="select_org", type=type),
+        )
+        kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
+
+        return "Оберіть чат:", kb.as_markup()
+
+    organizations = directory.external_organizations(organization.id)
+    reachable_orgs = [org for org in organizations if directory.is_reachable(org)]
+
+    kb = ColumnKeyboardBuilder()
+    is_admin_button = False
+
+    if organization.id != organization_id or organization.admin_chat_id != chat_id:
+        current_org: OrganizationSnapshot | None = None
+
+        if organization.id == organization_id:
+            current_org = organization
+        else:
+            for org in organizations:
+                if org.id == organization_id:
+                    current_org = org
+                    break
+
+        if (
+            current_org
+            and current_org.is_admins_accept_messages
+            and current_org.admin_chat_id
+        ):
+            is_admin_button = True
+            kb.button(
+                text=f"Адміністратори {current_org.title}",
+                callback_data=MessageCallback(
+                    action="select_admin_chat",
+                    data=str(organization_id),
+                    type=type,
+                ),
+            )
+
+    if not available_chats and not reachable_orgs and not is_admin_button:
+        return "❌ Доступні чати відсутні", None
+
+    for chat in available_chats:
+        kb.button(
+            text=chat.title,
+            callback_data=MessageCallback(
+                action="select_chat",
+                data=str(chat.id),
+                type=type,
+            ),
+        )
+
+    if reachable_orgs:
+        if available_chats or is_admin_button:
+            kb.button(
+                text=(
+                    "📤 Зовнішнє листування"
+                    if organization.id == organization_id
+                    else "⬅️ Назад"
+                ),
+                callback_data=MessageCallback(action="select_org", type=type),
+            )
+        else:
+            for org in reachable_orgs:
+                kb.button(
+                    text=org.title,
+                    callback_data=MessageCallback(
+                        action="select_org",
+                        data=str(org.id),
+                        type=type,
+                    ),
+                )
+
+    kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
+
+    if available_chats or is_admin_button:
+        return "Оберіть чат:", kb.as_markup()
+
+    return "Оберіть організацію:", kb.as_markup()
+
+
+def build_organizations_menu(
+    directory: RoutingDirectory,
+    organization: OrganizationSnapshot,
+    chat_id: int,
+    type: MessageType,
+) -> Menu:
+    if organization.id == 0:
+        if chat_id == organization.admin_chat_id:
+            return build_root_admin_menu(directory, type)
+
+        return "❌ Не вдалось ідентифікувати ваш чат", None
+
+    available_orgs = [
+        org
+        for org in directory.external_organizations(organization.id)
+        if directory.is_reachable(org)
+    ]
+
+    if not available_orgs:
+        return "❌ Доступні організації відсутні", None
+
+    kb = ColumnKeyboardBuilder()
+
+    for org in available_orgs:
+        kb.button(
+            text=org.title,
+            callback_data=MessageCallback(
+                action="select_org", data=str(org.id), type=type
+            ),
+        )
+
+    is_admin_chat_id = chat_id == organization.admin_chat_id
+    if (
+        organization.is_admins_accept_messages
+        and organization.admin_chat_id
+        and not is_admin_chat_id
+    ):
+        is_internal_available = True
+    else:
+        is_internal_available = any(
+            is_admin_chat_id or chat.visibility_level == VisibilityLevel.INTERNAL
+            for chat in directory.get_internal_chats(organization.id)
+        )
+
+    if is_internal_available:
+        kb.button(
+            text=("📥 Внутрішнє листування"),
+            callback_data=MessageCallback(
+                action="select_org", data=str(organization.id), type=type
+            ),
+        )
+
+    kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
+
+    return "Оберіть організацію:", kb.as_markup()
+
+
+def build_threads_menu(
+    chat: ChatSnapshot, threads: list[ChatThreadSnapshot], type: MessageType
+) -> Menu:
+    kb = ColumnKeyboardBuilder()
+
+    for thread in threads:
+        kb.button(
+            text=thread.title,
+            callback_data=MessageCallback(
+                action="select_thread",
+                data=f"{chat.id}|{thread.id}",
+                type=type,
+            ),
+        )
+
+    kb.button(
+        text="⬅️ Назад",
+        callback_data=MessageCallback(
+            action="select_org", data=str(chat.organization_id), type=type
+        ),
+    )
+    kb.button(text="❌ Скасувати", callback_data=MainCallback(action="cancel"))
+
+    return "Оберіть гілку:", kb.as_markup()
+
+
+def get_org_chats_menu(
+    directory: RoutingDirectory,
+    organization: OrganizationSnapshot,
+    chat_id: int,
+    organization_id: int,
+    type: MessageType,
+) -> Menu:
+    key = (
+        "chats",
+        organization.id,
+        viewer_role(organization, chat_id),
+        type,
+        organization_id,
+    )
+    return cached_menu(
+        directory,
+        key,
+        lambda: build_org_chats_menu(
+            directory, organization, chat_id, organization_id, type
+        ),
+    )
+
+
+def get_organizations_menu(
+    directory: RoutingDirectory,
+    organization: OrganizationSnapshot,
+    chat_id: int,
+    type: MessageType,
+) -> Menu:
+    key = ("organizations", organization.id, viewer_role(organization, chat_id), type)
+    return cached_menu(
+        directory,
+        key,
+        lambda: build_organizations_menu(directory, organization, chat_id, type),
+    )
+
+
+def get_threads_menu(
+    directory: RoutingDirectory,
+    organization: OrganizationSnapshot,
+    chat_id: int,
+    chat: ChatSnapshot,
+    threads: list[ChatThreadSnapshot],
+    type: MessageType,
+) -> Menu:
+    key = (
+        "threads",
+        organization.id,
+        viewer_role(organization, chat_id),
+        type,
+        chat.id,
+    )
+    return cached_menu(directory, key, lambda: build_threads_menu(chat, threads, type))
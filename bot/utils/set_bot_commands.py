@@ -40,6 +40,14 @@ async def set_bot_commands_for_admin_chat(
             command="delete_greeting",
             description="Видалити вітальне повідомлення",
         ),
+        BotCommand(
+            command="set_notification_time",
+            description="Встановити час щоденних нагадувань",
+        ),
+        BotCommand(
+            command="reset_notification_time",
+            description="Скинути час щоденних нагадувань",
+        ),
         # Chat management
         BotCommand(command="delete_selected_chat", description="Видалити обраний чат"),
         # Ban management
@@ -1,28 +1,19 @@
+import asyncio
 from io import BytesIO
 import pandas as pd
 from openpyxl.utils import column_index_from_string
 
-from app.core.google_drive import download_file
+from app.core.google_drive import drive_client
+
+XLSX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 
 def excel_cols_to_positions(cols: list[str]) -> list[int]:
     return [column_index_from_string(c) - 1 for c in cols]
 
 
-def load_spreadsheet(
-    spreadsheet_id: str, sheet_name: str | None = None
-) -> pd.DataFrame:
-    buf = BytesIO()
-    download_file(
-        spreadsheet_id,
-        buf,
-        export_mime_type=(
-            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        ),
-    )
-
-    buf.seek(0)
-    file = pd.ExcelFile(buf)
+def parse_spreadsheet(content: bytes, sheet_name: str | None = None) -> pd.DataFrame:
+    file = pd.ExcelFile(BytesIO(content))
     df = pd.read_excel(file, sheet_name, engine="openpyxl")
     file.close()
 
@@ -30,3 +21,22 @@ def load_spreadsheet(
         df = next(iter(df.values()))
 
     return df
+
+
+async def get_spreadsheet_revision(spreadsheet_id: str) -> str:
+    metadata = await drive_client.get_metadata(spreadsheet_id, "version,modifiedTime")
+
+    # version grows with every change to the file, modifiedTime is the fallback
+    return str(metadata.get("version") or metadata.get("modifiedTime") or "")
+
+
+async def load_spreadsheet(
+    spreadsheet_id: str, sheet_name: str | None = None
+) -> pd.DataFrame:
+    content = await drive_client.download(
+        spreadsheet_id, export_mime_type=XLSX_MIME_TYPE
+    )
+
+    # openpyxl parsing is CPU bound and takes long enough on large sheets to
+    # stall every bot sharing the event loop
+    return await asyncio.to_thread(parse_spreadsheet, content, sheet_name)
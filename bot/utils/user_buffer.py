@@ -0,0 +1,95 @@
+import asyncio
+from typing import Any
+from aiogram.types import User as TelegramUser
+
+from app.core.logger import logger
+from app.db.session import async_session
+from bot.utils.register_user import (
+    delete_user_from_chat,
+    insert_chat_users,
+    upsert_users,
+)
+
+
+class UserWriteBuffer:
+    def __init__(self) -> None:
+        self._users: dict[int, dict[str, Any]] = {}
+        self._chat_users: set[tuple[int, int]] = set()
+        # Memberships removed while a flush holds its snapshot, so the snapshot
+        # cannot bring them back after the leave handler deleted them
+        self._removed: set[tuple[int, int]] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._users) + len(self._chat_users)
+
+    def add_user(self, tg_user: TelegramUser) -> None:
+        self._users[tg_user.id] = {
+            "id": tg_user.id,
+            "username": tg_user.username,
+            "first_name": tg_user.first_name,
+            "last_name": tg_user.last_name,
+        }
+
+    def add_chat_user(self, tg_user: TelegramUser, chat_id: int) -> None:
+        self.add_user(tg_user)
+        self._chat_users.add((tg_user.id, chat_id))
+
+        if self._removed is not None:
+            self._removed.discard((tg_user.id, chat_id))
+
+    def discard_chat_user(self, user_id: int, chat_id: int) -> None:
+        self._chat_users.discard((user_id, chat_id))
+
+        if self._removed is not None:
+            self._removed.add((user_id, chat_id))
+
+    def has_user(self, user_id: int | None = None, username: str | None = None) -> bool:
+        if user_id is not None:
+            return user_id in self._users
+
+        return any(row["username"] == username for row in self._users.values())
+
+    async def flush_if_pending(
+        self, user_id: int | None = None, username: str | None = None
+    ) -> None:
+        if self.has_user(user_id, username):
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            if not self._users and not self._chat_users:
+                return
+
+            users, self._users = self._users, {}
+            chat_users, self._chat_users = self._chat_users, set()
+            removed = self._removed = set()
+
+            try:
+                async with async_session() as db:
+                    async with db.begin():
+                        if users:
+                            await upsert_users(db, list(users.values()))
+
+                        chat_users -= removed
+                        if chat_users:
+                            await insert_chat_users(db, list(chat_users))
+
+                        # Leaves that arrived during the insert may have run
+                        # their delete before it, so repeat it in this transaction
+                        for user_id, chat_id in chat_users & removed:
+                            await delete_user_from_chat(db, user_id, chat_id)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(users)} users: {e}")
+
+                for user_id, row in users.items():
+                    self._users.setdefault(user_id, row)
+
+                self._chat_users |= chat_users - removed
+                raise
+            finally:
+                self._removed = None
+
+
+user_buffer = UserWriteBuffer()
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+
+from app.core.cache import ROUTING_TAG, Cache, cache_registry
+from app.core.enums import VisibilityLevel
+from app.core.settings import settings
+from app.db.snapshots import ChatSnapshot, ChatThreadSnapshot, OrganizationSnapshot
+from bot.utils.routing_directory import RoutingDirectory, routing_directory
+
+
+@dataclass(frozen=True, slots=True)
+class Reachability:
+    chats: frozenset[int]
+    threads: frozenset[tuple[int, int]]
+
+    def can_send_to_chat(self, chat_id: int) -> bool:
+        return chat_id in self.chats
+
+    def can_send_to_thread(self, chat_id: int, thread_id: int) -> bool:
+        return (chat_id, thread_id) in self.threads
+
+
+reachability_cache: Cache[tuple[int, bool], Reachability] = cache_registry.create(
+    "reachability", settings.REACHABILITY_CACHE_SIZE, settings.ROUTING_DIRECTORY_TTL
+)
+
+
+def is_chat_visible(chat: ChatSnapshot, organization_id: int, is_admin: bool) -> bool:
+    if chat.organization_id == organization_id:
+        return is_admin or chat.visibility_level != VisibilityLevel.PRIVATE
+
+    is_global_admin = is_admin and organization_id == 0
+    return is_global_admin or chat.visibility_level == VisibilityLevel.PUBLIC
+
+
+def is_thread_visible(
+    chat: ChatSnapshot, thread: ChatThreadSnapshot, organization_id: int, is_admin: bool
+) -> bool:
+    if chat.organization_id == organization_id:
+        return is_admin or thread.visibility_level != VisibilityLevel.PRIVATE
+
+    is_global_admin = is_admin and organization_id == 0
+    return is_global_admin or thread.visibility_level == VisibilityLevel.PUBLIC
+
+
+def resolve_reachability(
+    directory: RoutingDirectory, organization_id: int, is_admin: bool
+) -> Reachability:
+    chats: set[int] = set()
+    threads: set[tuple[int, int]] = set()
+
+    for internal_chats in directory.internal_chats.values():
+        for chat in internal_chats:
+            if not is_chat_visible(chat, organization_id, is_admin):
+                continue
+
+            chats.add(chat.id)
+
+            for thread in directory.get_threads(chat.id):
+                if is_thread_visible(chat, thread, organization_id, is_admin):
+                    threads.add((chat.id, thread.id))
+
+    return Reachability(chats=frozenset(chats), threads=frozenset(threads))
+
+
+def get_reachability(
+    directory: RoutingDirectory, organization: OrganizationSnapshot, chat_id: int
+) -> Reachability:
+    key = (organization.id, organization.admin_chat_id == chat_id)
+
+    reachability = reachability_cache.get(key)
+    if reachability is not None:
+        return reachability
+
+    reachability = resolve_reachability(directory, *key)
+
+    if routing_directory.is_current(directory):
+        reachability_cache.set(key, reachability, tags=(ROUTING_TAG,))
+
+    return reachability
@@ -0,0 +1,38 @@
+import time
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.core.bot_cache import cache_bot_credentials
+from app.core.logger import logger
+from app.db.models.organization import Organization
+from app.db.session import async_session
+from bot.middlewares.organization import organization_cache
+from bot.utils.routing_directory import routing_directory
+
+
+async def warm_up_caches() -> None:
+    started = time.perf_counter()
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(Organization)
+            .options(joinedload(Organization.bot))
+            .join(Organization.bot)
+        )
+        organizations = result.scalars().all()
+
+    for organization in organizations:
+        organization_cache.update(organization)
+
+        if organization.bot:
+            try:
+                cache_bot_credentials(organization.bot)
+            except Exception as e:
+                logger.error(f"Failed to decrypt bot {organization.bot.id}: {e}")
+
+    await routing_directory.get()
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Warmed up caches for {len(organizations)} organizations in {elapsed:.2f}s"
+    )